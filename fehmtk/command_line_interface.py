@@ -2,18 +2,26 @@ import argparse
 import logging
 from pathlib import Path
 
-from .config import RunConfig
+from .config import NUMERIC_MODES, RunConfig
 from .fehm_runs import create_config_for_legacy_run, create_run_from_mesh, create_run_from_run
 from .preprocessors import (
+    DEPTH_EVALUATIONS,
+    compare_numeric_modes,
     generate_flow_boundaries,
     generate_hydrostatic_pressure,
     generate_heat_flux_boundaries,
     generate_rock_properties,
 )
 from .postprocessors import (
+    COMPARE_FIELDS,
+    DOWNSAMPLE_METHODS,
+    check_convergence,
     check_history,
+    compare_many_runs,
     compare_runs,
+    summarize_boundary_output,
     summarize_run,
+    summarize_velocities,
 )
 from .file_manipulation import append_zones
 
@@ -159,8 +167,65 @@ def add_fehmtk_subparsers(parser):
         ),
     )
     rock_properties.add_argument('config_file', type=Path, help='Run configuration (config.yaml) file')
+    rock_properties.add_argument(
+        '--incremental',
+        action='store_true',
+        help=(
+            'Flag to reuse property values cached next to the rock_properties file by a previous run, recomputing only '
+            'zone properties whose model configs or assigned nodes changed, and skipping unchanged output files'
+        ),
+    )
+    rock_properties.add_argument(
+        '--n_workers',
+        type=int,
+        help='Number of workers evaluating zones concurrently (processes in exact numeric_mode, threads in fast)',
+    )
+    rock_properties.add_argument(
+        '--numeric_mode',
+        choices=NUMERIC_MODES,
+        help=(
+            'Arithmetic used by rock property models only: exact (Decimal, default; per-element and slow on large '
+            'grids) or fast (float64 with NumPy); hydrostat and heat flux/flow boundary models are unaffected. Use '
+            '`compare_numeric_modes` to check the difference for a config before adopting fast, e.g. in '
+            'command_defaults: {rock_properties: {numeric_mode: fast}}'
+        ),
+    )
+    rock_properties.add_argument(
+        '--depth_evaluation',
+        choices=DEPTH_EVALUATIONS,
+        help=(
+            'Depths at which each zone\'s models are evaluated: at every node (nodes, default), once per distinct '
+            'depth (unique), or on an interpolated depth table (table, requires `--numeric_mode fast`); models using '
+            'node coordinates are always evaluated at every node'
+        ),
+    )
+    rock_properties.add_argument(
+        '--depth_table_tolerance',
+        type=float,
+        help='Relative interpolation error allowed in depth tables (default: 1E-6)',
+    )
     rock_properties.set_defaults(_func=generate_rock_properties, _name='rock_properties')
 
+    # --------------------
+    # compare_numeric_modes
+    # --------------------
+
+    numeric_modes = subparsers.add_parser(
+        'compare_numeric_modes',
+        help='Report differences between rock properties computed in exact and fast numeric modes',
+        description=(
+            'Compute rock properties from configuration in both exact (Decimal) and fast (float64) numeric modes, '
+            'without writing files, and report the maximum relative difference between them for each property.'
+        ),
+    )
+    numeric_modes.add_argument('config_file', type=Path, help='Run configuration (config.yaml) file')
+    numeric_modes.add_argument(
+        '--tolerance',
+        type=float,
+        help='Maximum relative difference for fast mode to be reported as acceptable (default: 1E-9)',
+    )
+    numeric_modes.set_defaults(_func=compare_numeric_modes, _name='compare_numeric_modes')
+
     # --------------------
     # heat_flux
     # --------------------
@@ -180,6 +245,16 @@ def add_fehmtk_subparsers(parser):
         action='store_true',
         help='Flag to plot 2D heat flux maps for outside zones; only supported when a single outside zone is used'
     )
+    heat_flux.add_argument(
+        '--plot_file',
+        type=Path,
+        help='Image file (e.g. .png, .pdf) to save the heat flux plot to instead of displaying it; implies `--plot`',
+    )
+    heat_flux.add_argument(
+        '--plot_max_points',
+        type=int,
+        help='Plot a reproducible random subset of this many boundary nodes, for very large boundaries',
+    )
     heat_flux.set_defaults(_func=generate_heat_flux_boundaries, _name='heat_flux')
 
     # --------------------
@@ -233,8 +308,77 @@ def add_fehmtk_subparsers(parser):
         action='store_true',
         help='Flag to open an interactive session with data in memory'
     )
+    history.add_argument(
+        '--downsample',
+        choices=DOWNSAMPLE_METHODS,
+        help=(
+            'Downsampling of each plotted series: largest-triangle-three-buckets (lttb), or the min/max envelope '
+            'of equal time buckets (minmax); rates of change are computed before downsampling (default: lttb)'
+        ),
+    )
+    history.add_argument(
+        '--max_points',
+        type=int,
+        help='Maximum number of points plotted per node and field when downsampling (default: 2000)',
+    )
+    history.add_argument(
+        '--follow',
+        action='store_true',
+        help=(
+            'Flag to follow a history file while FEHM writes it, parsing only newly appended timesteps and updating '
+            'plots and summary statistics live until the run finishes (last_fraction is ignored)'
+        ),
+    )
+    history.add_argument(
+        '--poll_seconds',
+        type=float,
+        help='Seconds between checks for new timesteps when following (default: 10)',
+    )
     history.set_defaults(_func=check_history, _name='history')
 
+    # --------------------
+    # converged
+    # --------------------
+
+    converged = subparsers.add_parser(
+        'converged',
+        help='Check whether a run has reached steady state, from its history file',
+        description=(
+            'Stream the history file one timestep at a time, tracking rates of change of fields at monitored nodes '
+            'over a trailing window. Exits with status 0 if all rates at the last timestep are below their '
+            'thresholds, and 1 otherwise.'
+        ),
+    )
+    converged.add_argument('config_file', type=Path, help='Run configuration (config.yaml) file')
+    converged.add_argument(
+        '--nodes',
+        type=int,
+        nargs='+',
+        help='Space-separated list of node numbers, only check these; defaults to all nodes found in the history file',
+    )
+    converged.add_argument(
+        '--fields',
+        type=str,
+        nargs='+',
+        help='Space-separated list of fields, only check these (default: all fields with thresholds)',
+    )
+    converged.add_argument(
+        '--thresholds',
+        type=field_threshold,
+        nargs='+',
+        help=(
+            'Space-separated list of field=rate pairs, the maximum absolute rate of change per thousand years '
+            '(default: "temperature(deg C)=0.01" "total pressure(Mpa)=0.001"); wrap pairs with spaces in double-quotes'
+        ),
+    )
+    converged.add_argument(
+        '--window_years',
+        type=float,
+        help='Span of the trailing window over which rates of change are measured (default: 1000)',
+    )
+    converged.add_argument('--report_file', type=Path, help='JSON output of the convergence report')
+    converged.set_defaults(_func=check_convergence, _name='converged')
+
     # --------------------
     # summary
     # --------------------
@@ -242,16 +386,32 @@ def add_fehmtk_subparsers(parser):
     summary = subparsers.add_parser(
         'summary',
         help="Summarize run's final output as CSV",
-        description="Produce a summary of a run's final output, formatted as CSV with details for specified nodes.",
+        description=(
+            "Produce a summary of a run's final output, with details for specified nodes and zones. Written as CSV, or "
+            'as columnar binary if output_file ends in .npz or .parquet (with float values and a boolean column per '
+            'zone).'
+        ),
     )
     summary.add_argument('config_file', type=Path, help='Run configuration (config.yaml) file')
-    summary.add_argument('output_file', type=Path, help='CSV output of properties at nodes to be written')
+    summary.add_argument('output_file', type=Path, help='CSV (or .npz, .parquet) output of properties at nodes')
     summary.add_argument(
         '--nodes',
         type=int,
         nargs='+',
         help='Space-separated list of node numbers to inspect (default: nodes in "node" macros in FEHM input file)',
     )
+    summary.add_argument(
+        '--material_zones',
+        type=int_or_string,
+        nargs='+',
+        help='Space-separated list of material zone names or numbers, all of whose nodes are included',
+    )
+    summary.add_argument(
+        '--outside_zones',
+        type=int_or_string,
+        nargs='+',
+        help='Space-separated list of outside zone names or numbers, all of whose nodes are included',
+    )
     summary.add_argument(
         '--interact',
         action='store_true',
@@ -267,18 +427,31 @@ def add_fehmtk_subparsers(parser):
         'compare',
         help="Compare two run's final outputs as CSV",
         description=(
-            "Produce a comparison of two run's final outputs, formatted as CSV with details for specified nodes."
+            "Produce a comparison of two run's final outputs, with details for specified nodes and zones. Written as "
+            'CSV, or as columnar binary if output_file ends in .npz or .parquet.'
         ),
     )
     compare.add_argument('config_file', type=Path, help='Run configuration (config.yaml) file')
     compare.add_argument('compare_config_file', type=Path, help='Run configuration file for run to compare')
-    compare.add_argument('output_file', type=Path, help='CSV output of node and state details to be written')
+    compare.add_argument('output_file', type=Path, help='CSV (or .npz, .parquet) output of node and state details')
     compare.add_argument(
         '--nodes',
         type=int,
         nargs='+',
         help='Space-separated list of node numbers to inspect (default: nodes in "node" macros in FEHM input file)',
     )
+    compare.add_argument(
+        '--material_zones',
+        type=int_or_string,
+        nargs='+',
+        help='Space-separated list of material zone names or numbers, all of whose nodes are included',
+    )
+    compare.add_argument(
+        '--outside_zones',
+        type=int_or_string,
+        nargs='+',
+        help='Space-separated list of outside zone names or numbers, all of whose nodes are included',
+    )
     compare.add_argument(
         '--interact',
         action='store_true',
@@ -286,6 +459,113 @@ def add_fehmtk_subparsers(parser):
     )
     compare.set_defaults(_func=compare_runs, _name='compare')
 
+    # --------------------
+    # compare_many
+    # --------------------
+
+    compare_many = subparsers.add_parser(
+        'compare_many',
+        help="Compare several runs' final outputs by field and zone as CSV",
+        description=(
+            "Compare the final outputs of several runs on the same grid (e.g. a parameter sweep), each against a "
+            'reference run or pairwise. Restart files are loaded in parallel worker processes and grids are checked '
+            'by fingerprint. Writes the max absolute difference (with its location) and the RMS difference per '
+            'comparison, field and material zone.'
+        ),
+    )
+    compare_many.add_argument('config_files', type=Path, nargs='+', help='Run configuration (config.yaml) files')
+    compare_many.add_argument(
+        '--output_file',
+        type=Path,
+        required=True,
+        help='CSV output of difference statistics to be written',
+    )
+    compare_many.add_argument(
+        '--reference',
+        type=Path,
+        help='Run configuration file of the reference run (default: the first config file)',
+    )
+    compare_many.add_argument(
+        '--pairwise',
+        action='store_true',
+        help='Flag to compare every pair of runs, rather than each run with the reference',
+    )
+    compare_many.add_argument(
+        '--fields',
+        choices=COMPARE_FIELDS,
+        nargs='+',
+        help='Space-separated list of restart fields to compare (default: temperature pressure)',
+    )
+    compare_many.add_argument(
+        '--zones',
+        type=int_or_string,
+        nargs='+',
+        help='Space-separated list of material zone names or numbers (default: all material zones)',
+    )
+    compare_many.add_argument(
+        '--n_workers',
+        type=int,
+        help='Number of worker processes loading runs (default: one per run, up to the number of CPUs)',
+    )
+    compare_many.set_defaults(_func=compare_many_runs, _name='compare_many')
+
+    # --------------------
+    # boundary_output
+    # --------------------
+
+    boundary_output = subparsers.add_parser(
+        'boundary_output',
+        help='Summarize heat and fluid output across boundary zones as CSV',
+        description=(
+            'Integrate conductive heat output (from storage coefficients, conductivity and temperatures) and fluid '
+            'output (from sources) over outside zones, for the final conditions or a series of AVS snapshots. Writes '
+            'a CSV row per snapshot and zone, plus a "total" row for the union of the zones.'
+        ),
+    )
+    boundary_output.add_argument('config_file', type=Path, help='Run configuration (config.yaml) file')
+    boundary_output.add_argument('output_file', type=Path, help='CSV output of boundary heat and fluid output')
+    boundary_output.add_argument(
+        '--state_files',
+        type=Path,
+        nargs='+',
+        help='Space-separated list of restart or AVS scalar (.avs) files to summarize (default: final conditions)',
+    )
+    boundary_output.add_argument(
+        '--zones',
+        type=int_or_string,
+        nargs='+',
+        help='Space-separated list of outside zone names or numbers (default: all outside zones)',
+    )
+    boundary_output.set_defaults(_func=summarize_boundary_output, _name='boundary_output')
+
+    # --------------------
+    # velocity
+    # --------------------
+
+    velocity = subparsers.add_parser(
+        'velocity',
+        help='Summarize pore water velocities by material zone as CSV',
+        description=(
+            'Compute pore water velocities (liquid volume flux over porosity) from AVS vector output, and summarize '
+            'their maxima and volume-weighted distributions by material zone for each snapshot, in m/yr.'
+        ),
+    )
+    velocity.add_argument('config_file', type=Path, help='Run configuration (config.yaml) file')
+    velocity.add_argument('output_file', type=Path, help='CSV output of velocity statistics to be written')
+    velocity.add_argument(
+        '--state_files',
+        type=Path,
+        nargs='+',
+        help='Space-separated list of AVS vector (_vec_node.avs) files (default: all for the run, in order)',
+    )
+    velocity.add_argument(
+        '--zones',
+        type=int_or_string,
+        nargs='+',
+        help='Space-separated list of material zone names or numbers (default: all material zones)',
+    )
+    velocity.set_defaults(_func=summarize_velocities, _name='velocity')
+
     # --------------------
     # append_zones
     # --------------------
@@ -324,6 +604,23 @@ def add_fehmtk_subparsers(parser):
     )
     hydrostat.add_argument('config_file', type=Path, help='Run configuration (config.yaml) file')
     hydrostat.add_argument('output_file', type=Path, help='Pressure output (.iap/.icp) to be written')
+    hydrostat.add_argument(
+        '--warm_start',
+        action='store_true',
+        help=(
+            'Flag to reuse column pressures cached next to the output file by a previous run, re-solving only columns '
+            'whose temperatures, pressure model params, water properties or density interpolation changed, and to '
+            'update the cache'
+        ),
+    )
+    hydrostat.add_argument(
+        '--chunk_size',
+        type=int,
+        help=(
+            'Stream nodes through memory in chunks of this many nodes, holding coordinates in memory-mapped scratch '
+            'files and writing pressures as they are calculated; requires sequentially numbered nodes'
+        ),
+    )
     hydrostat.set_defaults(_func=generate_hydrostatic_pressure, _name='hydrostat')
 
     # --------------------
@@ -369,6 +666,13 @@ def add_fehmtk_subparsers(parser):
     return subparsers
 
 
+def field_threshold(arg):
+    field, separator, threshold = arg.rpartition('=')
+    if not separator:
+        raise argparse.ArgumentTypeError(f'Expected field=rate, got {arg}')
+    return field, float(threshold)
+
+
 def int_or_string(arg):
     try:
         return int(arg)  # try convert to int
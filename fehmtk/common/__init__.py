@@ -1 +1,2 @@
+from .array_math import get_max_relative_difference, round_significant_figures_array
 from .decimal_math import round_significant_figures
@@ -0,0 +1,30 @@
+import numpy as np
+
+
+def round_significant_figures_array(x: np.ndarray, n: int) -> np.ndarray:
+    """Round each element of a float array to a given number of significant figures
+    >>> round_significant_figures_array(np.array([1234., 33.990001, -0.00123456, 0.]), 4)
+    array([ 1.234e+03,  3.399e+01, -1.235e-03,  0.000e+00])
+    >>> round_significant_figures_array(np.array([np.nan, 12.5]), 2)
+    array([nan, 12.])
+    """
+    if not n or n <= 0:
+        raise ValueError(f'Invalid number of significant figures ({n}).')
+
+    x = np.asarray(x, dtype=float)
+    is_finite_nonzero = np.isfinite(x) & (x != 0)
+    magnitude = np.floor(np.log10(np.abs(x), where=is_finite_nonzero, out=np.zeros_like(x)))
+    scale = 10.0 ** (n - 1 - magnitude)
+    return np.where(is_finite_nonzero, np.round(x * scale) / scale, x)
+
+
+def get_max_relative_difference(reference: np.ndarray, values: np.ndarray) -> float:
+    """Largest difference of values from reference, relative to reference or absolute where reference is 0.
+    >>> get_max_relative_difference(np.array([1., 0., 200.]), np.array([1.5, 1e-3, 200.]))
+    0.5
+    >>> get_max_relative_difference(np.array([]), np.array([]))
+    0.0
+    """
+    scale = np.abs(reference)
+    difference = np.abs(values - reference) / np.where(scale > 0, scale, 1)
+    return float(difference.max(initial=0))
@@ -1,6 +1,6 @@
 from .boundary_config import BoundaryConfig, FlowConfig, HeatFluxConfig
 from .files_config import FilesConfig
-from .model_config import ModelConfig
+from .model_config import NUMERIC_MODES, ModelConfig
 from .hydrostat_config import HydrostatConfig
 from .rock_properties_config import PropertyConfig, RockPropertiesConfig
 from .run_config import RunConfig
@@ -4,6 +4,7 @@ from decimal import Decimal
 from fehmtk.common import round_significant_figures
 
 MODEL_PARAMS_SIGNIFICANT_FIGURES = 10
+NUMERIC_MODES = ('exact', 'fast')
 
 
 @dataclass
@@ -12,9 +13,20 @@ class ModelConfig:
     params: dict
 
     @classmethod
-    def from_dict(cls, dct):
+    def from_dict(cls, dct, numeric_mode: str = 'exact'):
+        """Read a model config, converting float params to Decimal unless numeric_mode is fast (float params are kept).
+        Only rock property configs are read in fast numeric_mode; hydrostat and boundary models always use Decimal.
+        >>> ModelConfig.from_dict({'kind': 'constant', 'params': {'constant': 0.1}})
+        ModelConfig(kind='constant', params={'constant': Decimal('0.1000000000')})
+        >>> ModelConfig.from_dict({'kind': 'constant', 'params': {'constant': 0.1}}, numeric_mode='fast')
+        ModelConfig(kind='constant', params={'constant': 0.1})
+        """
+        if numeric_mode not in NUMERIC_MODES:
+            raise ValueError(f'Unknown numeric_mode {numeric_mode!r}, expected one of {NUMERIC_MODES}')
+
         dct = dct.copy()
+        dct['params'] = dct['params'].copy()
         for k, p in dct['params'].items():
-            if isinstance(p, float):
+            if isinstance(p, float) and numeric_mode == 'exact':
                 dct['params'][k] = round_significant_figures(Decimal(p), n=MODEL_PARAMS_SIGNIFICANT_FIGURES)
         return cls(**dct)
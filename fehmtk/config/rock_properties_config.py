@@ -11,9 +11,9 @@ class PropertyConfig:
     zones: list[Union[int, str]]
 
     @classmethod
-    def from_dict(cls, dct):
+    def from_dict(cls, dct, numeric_mode: str = 'exact'):
         return cls(
-            property_model=ModelConfig.from_dict(dct['property_model']),
+            property_model=ModelConfig.from_dict(dct['property_model'], numeric_mode=numeric_mode),
             zones=dct['zones'],
         )
 
@@ -44,13 +44,14 @@ class RockPropertiesConfig:
         return lookup
 
     @classmethod
-    def from_dict(cls, dct):
+    def from_dict(cls, dct, numeric_mode: str = 'exact'):
+        """Read rock properties config, with model params as Decimal or, if numeric_mode is fast, float."""
         return cls(
             zone_assignment_order=dct['zone_assignment_order'],
-            compressibility_configs=[PropertyConfig.from_dict(c) for c in dct['compressibility_configs']],
-            conductivity_configs=[PropertyConfig.from_dict(c) for c in dct['conductivity_configs']],
-            permeability_configs=[PropertyConfig.from_dict(c) for c in dct['permeability_configs']],
-            grain_density_configs=[PropertyConfig.from_dict(c) for c in dct['grain_density_configs']],
-            specific_heat_configs=[PropertyConfig.from_dict(c) for c in dct['specific_heat_configs']],
-            porosity_configs=[PropertyConfig.from_dict(c) for c in dct['porosity_configs']],
+            compressibility_configs=[PropertyConfig.from_dict(c, numeric_mode) for c in dct['compressibility_configs']],
+            conductivity_configs=[PropertyConfig.from_dict(c, numeric_mode) for c in dct['conductivity_configs']],
+            permeability_configs=[PropertyConfig.from_dict(c, numeric_mode) for c in dct['permeability_configs']],
+            grain_density_configs=[PropertyConfig.from_dict(c, numeric_mode) for c in dct['grain_density_configs']],
+            specific_heat_configs=[PropertyConfig.from_dict(c, numeric_mode) for c in dct['specific_heat_configs']],
+            porosity_configs=[PropertyConfig.from_dict(c, numeric_mode) for c in dct['porosity_configs']],
         )
@@ -12,7 +12,9 @@ from .rock_properties_config import RockPropertiesConfig
 
 @dataclasses.dataclass
 class RunConfig:
-    """Configuration defining a run and its components."""
+    """Configuration defining a run and its components. command_defaults holds default command line options by
+    command name, e.g. {'rock_properties': {'numeric_mode': 'fast'}}; numeric_mode is only an option of
+    rock_properties (and compare_numeric_modes runs both modes), since it only affects rock property models."""
     files_config: FilesConfig
     rock_properties_config: RockPropertiesConfig
     command_defaults: Optional[dict] = None
@@ -21,10 +23,20 @@ class RunConfig:
     hydrostat_config: Optional[HydrostatConfig] = None
 
     @classmethod
-    def from_dict(cls, dct: dict, files_relative_to: Optional[Path] = None):
+    def from_dict(
+        cls,
+        dct: dict,
+        files_relative_to: Optional[Path] = None,
+        rock_properties_numeric_mode: str = 'exact',
+    ):
+        """Read run config. Rock property model params are read as Decimal, or as float if rock_properties_numeric_mode
+        is fast. Hydrostat and boundary model params are always read as Decimal."""
         return cls(
             files_config=FilesConfig.from_dict(dct['files_config'], files_relative_to),
-            rock_properties_config=RockPropertiesConfig.from_dict(dct['rock_properties_config']),
+            rock_properties_config=RockPropertiesConfig.from_dict(
+                dct['rock_properties_config'],
+                rock_properties_numeric_mode,
+            ),
             command_defaults=dct.get('command_defaults'),
             heat_flux_config=(
                 HeatFluxConfig.from_dict(dct['heat_flux_config']) if dct.get('heat_flux_config') else None
@@ -36,10 +48,14 @@ class RunConfig:
         )
 
     @classmethod
-    def from_yaml(cls, config_file: Path):
+    def from_yaml(cls, config_file: Path, rock_properties_numeric_mode: str = 'exact'):
         with open(config_file) as f:
             raw_config = yaml.load(f, Loader=yaml.Loader)
-        return cls.from_dict(raw_config, files_relative_to=config_file)
+        return cls.from_dict(
+            raw_config,
+            files_relative_to=config_file,
+            rock_properties_numeric_mode=rock_properties_numeric_mode,
+        )
 
     def to_yaml(self, config_file: Path):
         files_config_relative_to_output = self.files_config.relative_to(config_file.parent)
@@ -1,6 +1,8 @@
 import logging
 from typing import Optional, Iterable, Union
 
+import numpy as np
+
 from .element import Element
 from .node import Node
 from .zone import Zone
@@ -97,3 +99,9 @@ class Grid:
     def get_nodes_in_outside_zone(self, zone_key: Union[int, str]) -> tuple[Node]:
         zone = self.get_outside_zone(zone_key)
         return tuple(self._nodes_by_number[node_number] for node_number in zone.data)
+
+    def get_node_numbers_in_material_zone(self, zone_key: Union[int, str]) -> np.ndarray:
+        return np.asarray(self.get_material_zone(zone_key).data, dtype=int)
+
+    def get_node_numbers_in_outside_zone(self, zone_key: Union[int, str]) -> np.ndarray:
+        return np.asarray(self.get_outside_zone(zone_key).data, dtype=int)
@@ -1,12 +1,19 @@
-from .avs import read_avs
-from .compact_node_data import write_compact_node_data
-from .fehm import read_fehm
+from .avs import read_avs, read_avs_columns
+from .compact_node_data import read_compact_node_array, write_compact_node_array, write_compact_node_data
+from .fehm import iterate_fehm_coordinates, read_fehm, read_fehm_node_count
 from .file_discovery import get_unique_file
 from .files_index import write_files_index
-from .fluid_properties import read_nist_lookup_table
+from .fluid_properties import DensityTable, get_file_checksum, read_nist_density_table, read_nist_lookup_table
 from .grid import read_grid
-from .history import read_history
-from .pressure import read_pressure, write_pressure
-from .restart import read_restart, write_restart
-from .storage import read_volume_from_storage
+from .history import (
+    HistoryHeader,
+    HistoryTail,
+    HistoryTimestep,
+    iterate_history,
+    read_history,
+    read_history_header,
+)
+from .pressure import read_pressure, write_pressure, write_pressure_chunks
+from .restart import iterate_restart_block, read_restart, write_restart
+from .storage import StorageCoefficients, read_storage_coefficients, read_volume_from_storage
 from .zone import read_zones, write_zones
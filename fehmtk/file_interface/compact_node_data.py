@@ -1,8 +1,8 @@
-from collections import defaultdict
 from decimal import Decimal
-from itertools import groupby
 from pathlib import Path
-from typing import Iterable, Union
+from typing import Iterable, Sequence, Union
+
+import numpy as np
 
 from ..fehm_objects import Vector
 
@@ -24,6 +24,33 @@ def read_compact_node_data(compact_node_data_file: Path) -> dict[int, Decimal]:
     return data_by_node
 
 
+def read_compact_node_array(compact_node_data_file: Path, n_nodes: int) -> np.ndarray:
+    """Read compact node data as a float array, with a row per node (number - 1) and a column per value on each line,
+    e.g. three for Vector data such as conductivity. Nodes without data are NaN.
+    """
+    values = None
+    with open(compact_node_data_file) as f:
+        file_header = next(f).strip().split()
+        if len(file_header) > 1:
+            raise ValueError(f'Unrecognised file header {file_header}')
+
+        for line in f:
+            tokens = line.split()
+            if not tokens or tokens == ['0']:
+                break
+            if len(tokens) < 4:
+                raise ValueError(f'Could not parse compact node data line: {line.strip()}')
+
+            min_node, max_node, spacing = (int(v) for v in tokens[:3])
+            if values is None:
+                values = np.full((n_nodes, len(tokens) - 3), np.nan)
+            values[min_node - 1:max_node:spacing] = [float(v) for v in tokens[3:]]
+
+    if values is None:
+        raise ValueError(f'No compact node data found in {compact_node_data_file}')
+    return values
+
+
 def _parse_compact_node_data_line(line: str) -> dict[int, Decimal]:
     r""" Parse compact node data string into a lookup of values by node.
     >>> _parse_compact_node_data_line('80   81  1   -3.92330E-04    0.')
@@ -56,9 +83,23 @@ def write_compact_node_data(
     header: str = None,
     footer: str = None,
 ):
-    nodes_by_value = _group_nodes_by_formatted_output(value_by_node)
-    ordered_entries = _get_grouped_entries(nodes_by_value)
-    _write_compact_node_file(ordered_entries, output_file, header=header, footer=footer)
+    node_numbers = np.fromiter(value_by_node, dtype=int, count=len(value_by_node))
+    write_compact_node_array(node_numbers, list(value_by_node.values()), output_file, header=header, footer=footer)
+
+
+def write_compact_node_array(
+    node_numbers: np.ndarray,
+    values: Sequence[Union[float, Decimal, Vector, Sequence]],
+    output_file: Path,
+    header: str = None,
+    footer: str = None,
+):
+    """Write compact node data for an array of node numbers and a value (or row of values, e.g. an (n, k) array) per
+    node, merging consecutive nodes with the same formatted value into one entry."""
+    order = np.argsort(node_numbers, kind='stable')
+    formatted_values = np.array([_format_for_output(value) for value in values], dtype=object)[order]
+    entries = _get_compact_entries(np.asarray(node_numbers)[order], formatted_values)
+    _write_compact_node_file(entries, output_file, header=header, footer=footer)
 
 
 def _write_compact_node_file(
@@ -76,22 +117,20 @@ def _write_compact_node_file(
             f.write(footer)
 
 
-def _group_nodes_by_formatted_output(
-    value_by_node: dict[int, Union[float, Decimal, Vector, tuple[Decimal]]],
-) -> dict[str, list[int]]:
-    nodes_by_formatted_value = defaultdict(list)
-    for node, value in value_by_node.items():
-        formatted_value = _format_for_output(value)
-        nodes_by_formatted_value[formatted_value].append(node)
-    return nodes_by_formatted_value
-
-
-def _get_grouped_entries(nodes_by_value: dict[str, list[int]]) -> list[tuple[int, int, str]]:
-    entries = []
-    for value, nodes in nodes_by_value.items():
-        for min_node, max_node in _consecutive_groups(sorted(nodes)):
-            entries.append((min_node, max_node, value))
-    return sorted(entries, key=lambda entry: entry[0])  # sort by min_node
+def _get_compact_entries(node_numbers: np.ndarray, formatted_values: np.ndarray) -> list[tuple[int, int, str]]:
+    """(min node, max node, value) entries for runs of consecutive sorted node numbers with equal formatted values.
+    >>> _get_compact_entries(np.array([1, 2, 3, 5, 6]), np.array(['a', 'a', 'b', 'b', 'b'], dtype=object))
+    [(1, 2, 'a'), (3, 3, 'b'), (5, 6, 'b')]
+    >>> _get_compact_entries(np.array([], dtype=int), np.array([], dtype=object))
+    []
+    """
+    if not len(node_numbers):
+        return []
+    is_start = np.ones(len(node_numbers), dtype=bool)
+    is_start[1:] = (np.diff(node_numbers) != 1) | (formatted_values[1:] != formatted_values[:-1])
+    starts = np.flatnonzero(is_start)
+    ends = np.append(starts[1:], len(node_numbers)) - 1
+    return list(zip(node_numbers[starts].tolist(), node_numbers[ends].tolist(), formatted_values[starts].tolist()))
 
 
 def _format_compact_entry(min_node: int, max_node: int, value: str) -> str:
@@ -108,25 +147,6 @@ def _format_compact_entry(min_node: int, max_node: int, value: str) -> str:
     return f'{min_node:7d} {max_node:7d} 1 {value}\n'
 
 
-def _consecutive_groups(x: list[int]) -> list[tuple[int]]:
-    """ Iterate over consecutive groups found in list of integers.
-    >>> list(_consecutive_groups([1, 2, 4]))
-    [(1, 2), (4, 4)]
-    >>> list(_consecutive_groups([4, 5, 6, 9, 10, 15, 16]))
-    [(4, 6), (9, 10), (15, 16)]
-    """
-    def _value_minus_index(enum: tuple[int, int]) -> int:
-        index = enum[0]
-        value = enum[1]
-        return index - value
-
-    for k, g in groupby(enumerate(x), key=_value_minus_index):
-        g = list(g)
-        group_start = g[0][1]
-        group_end = g[-1][1]
-        yield group_start, group_end
-
-
 def _format_for_output(value: Union[float, Decimal, Vector, Iterable]) -> str:
     """ Format values for compact node data output.
     >>> _format_for_output('hello')
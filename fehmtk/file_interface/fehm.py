@@ -1,6 +1,6 @@
 from decimal import Decimal
 from pathlib import Path
-from typing import Optional, TextIO
+from typing import Iterator, Optional, TextIO
 
 from ..fehm_objects import Element, Node, Vector
 
@@ -59,3 +59,24 @@ def _read_elem(open_file: TextIO, should_read: Optional[bool] = True) -> dict[in
         element = Element.from_fehm_line(line)
         elements_by_number[element.number] = element
     return elements_by_number
+
+
+def iterate_fehm_coordinates(fehm_file: Path) -> Iterator[tuple[int, float, float, float]]:
+    """Iterate over node numbers and coordinates in a FEHM-formatted file (.fehm) without holding them in memory."""
+    with open(fehm_file) as f:
+        block_name = next(f).strip()
+        if block_name != 'coor':
+            raise ValueError(f'Invalid fehm_file ({fehm_file}), expected "coor" block first, found "{block_name}"')
+
+        n_nodes = int(next(f))
+        for i in range(n_nodes):
+            number, x, y, z = next(f).strip().split()
+            yield int(number), float(x), float(y), float(z)
+
+
+def read_fehm_node_count(fehm_file: Path) -> int:
+    with open(fehm_file) as f:
+        block_name = next(f).strip()
+        if block_name != 'coor':
+            raise ValueError(f'Invalid fehm_file ({fehm_file}), expected "coor" block first, found "{block_name}"')
+        return int(next(f))
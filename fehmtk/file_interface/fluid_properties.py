@@ -1,4 +1,25 @@
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import os
 from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DENSITY_CACHE_SUFFIX = '.density_cache.npy'
+DENSITY_CACHE_METADATA_SUFFIX = '.density_cache.json'
+DENSITY_CACHE_VERSION = 1
+
+
+@dataclass
+class DensityTable:
+    pressures_MPa: np.ndarray
+    temperatures_degC: np.ndarray
+    density_kg_m3: np.ndarray  # indexed [pressure, temperature]
 
 
 def read_nist_lookup_table(nist_file: Path) -> dict[tuple[float, float], dict[str, float]]:
@@ -16,3 +37,98 @@ def read_nist_lookup_table(nist_file: Path) -> dict[tuple[float, float], dict[st
                 'density_kg_m3': density,
             }
     return properties_lookup_MPa_degC
+
+
+def read_nist_density_table(nist_file: Path) -> DensityTable:
+    """Reads densities from a NIST lookup table on a regular pressure/temperature grid, using a binary cache.
+
+    The cache is stored beside the resolved (i.e. symlink target) lookup file, so runs sharing one file share one
+    cache. It is validated against a checksum of the lookup file and memory-mapped on load. Raises ValueError if the
+    table does not cover a full pressure/temperature grid.
+    """
+    source_file = nist_file.resolve()
+    cache_file = source_file.with_name(source_file.name + DENSITY_CACHE_SUFFIX)
+    metadata_file = source_file.with_name(source_file.name + DENSITY_CACHE_METADATA_SUFFIX)
+    checksum = get_file_checksum(source_file)
+
+    cached_table = _read_density_cache(cache_file, metadata_file, checksum=checksum)
+    if cached_table is not None:
+        logger.debug(f'Read cached density table from {cache_file}')
+        return cached_table
+
+    table = _parse_nist_density_table(source_file)
+    try:
+        _write_density_cache(table, cache_file, metadata_file, checksum=checksum)
+        logger.info(f'Wrote density table cache to {cache_file}')
+    except OSError as e:
+        logger.warning(f'Could not write density table cache beside {source_file} ({e}), continuing without cache.')
+    return table
+
+
+def _parse_nist_density_table(nist_file: Path) -> DensityTable:
+    pressure, temperature, density = np.loadtxt(nist_file, usecols=(0, 1, 2), ndmin=2, unpack=True)
+    pressures_MPa, pressure_index = np.unique(pressure, return_inverse=True)
+    temperatures_degC, temperature_index = np.unique(temperature, return_inverse=True)
+
+    density_kg_m3 = np.full((len(pressures_MPa), len(temperatures_degC)), np.nan)
+    density_kg_m3[pressure_index, temperature_index] = density
+    if len(density) != density_kg_m3.size or np.isnan(density_kg_m3).any():
+        raise ValueError(f'Lookup table {nist_file} does not cover a regular pressure/temperature grid.')
+
+    return DensityTable(
+        pressures_MPa=pressures_MPa,
+        temperatures_degC=temperatures_degC,
+        density_kg_m3=density_kg_m3,
+    )
+
+
+def _read_density_cache(cache_file: Path, metadata_file: Path, checksum: str) -> Optional[DensityTable]:
+    if not cache_file.exists() or not metadata_file.exists():
+        return None
+
+    try:
+        metadata = json.loads(metadata_file.read_text())
+        if metadata.get('version') != DENSITY_CACHE_VERSION or metadata.get('checksum') != checksum:
+            logger.info(f'Density table cache {cache_file} is stale, rebuilding.')
+            return None
+
+        density_kg_m3 = np.load(cache_file, mmap_mode='r')
+    except (OSError, ValueError) as e:
+        logger.warning(f'Could not read density table cache {cache_file} ({e}), rebuilding.')
+        return None
+
+    table = DensityTable(
+        pressures_MPa=np.array(metadata['pressures_MPa']),
+        temperatures_degC=np.array(metadata['temperatures_degC']),
+        density_kg_m3=density_kg_m3,
+    )
+    if table.density_kg_m3.shape != (len(table.pressures_MPa), len(table.temperatures_degC)):
+        logger.warning(f'Density table cache {cache_file} has inconsistent shape, rebuilding.')
+        return None
+    return table
+
+
+def _write_density_cache(table: DensityTable, cache_file: Path, metadata_file: Path, checksum: str):
+    """Write the cache through temporary files, so that concurrent runs never read a partially written cache."""
+    tmp_suffix = f'.{os.getpid()}.tmp'
+    tmp_cache_file = cache_file.with_name(cache_file.name + tmp_suffix)
+    with open(tmp_cache_file, 'wb') as f:
+        np.save(f, table.density_kg_m3)
+    os.replace(tmp_cache_file, cache_file)
+
+    tmp_metadata_file = metadata_file.with_name(metadata_file.name + tmp_suffix)
+    tmp_metadata_file.write_text(json.dumps({
+        'version': DENSITY_CACHE_VERSION,
+        'checksum': checksum,
+        'pressures_MPa': table.pressures_MPa.tolist(),
+        'temperatures_degC': table.temperatures_degC.tolist(),
+    }))
+    os.replace(tmp_metadata_file, metadata_file)
+
+
+def get_file_checksum(file: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(file, 'rb') as f:
+        for block in iter(lambda: f.read(2 ** 20), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
@@ -1,12 +1,30 @@
+from dataclasses import dataclass, field
 from decimal import Decimal, InvalidOperation
+import os
 from pathlib import Path
 import math
-from typing import Optional, Sequence, TextIO
+from typing import Iterator, Optional, Sequence, TextIO
 
+import numpy as np
 import pandas as pd
 
 
 TIME_HEADING = 'time_days'
+TAIL_CHUNK_BYTES = 2 ** 24
+
+
+@dataclass(frozen=True)
+class HistoryHeader:
+    """Monitored nodes and the fields recorded for each, in file order."""
+    nodes: tuple[int, ...]
+    fields: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class HistoryTimestep:
+    """Values recorded at one time, with a row per monitored node and a column per field."""
+    time_days: float
+    values: np.ndarray
 
 
 def read_history(
@@ -77,6 +95,137 @@ def read_history_times(history_file) -> tuple[Decimal]:
         return tuple(times)
 
 
+def read_history_header(history_file: Path) -> HistoryHeader:
+    with open(history_file) as f:
+        _skip_lines(f, 5)  # throw away headers
+        n_nodes = int(next(f).strip())
+        nodes = _read_node_numbers(f, n_nodes=n_nodes)
+        headings, _ = _read_headings_and_first_time(f, read_fields=None)
+    return HistoryHeader(nodes=tuple(nodes), fields=tuple(h for h in headings if h != 'node'))
+
+
+def iterate_history(
+    history_file: Path,
+    read_nodes: Optional[Sequence[int]] = None,
+    read_fields: Optional[Sequence[str]] = None,
+) -> Iterator[HistoryTimestep]:
+    """Iterate over the timesteps of a history file as float arrays, holding only one timestep in memory.
+
+    Values are ordered as the nodes and fields of read_history_header, filtered to read_nodes and read_fields if given.
+    Iteration stops at the end-of-run marker, or before a timestep that is not completely written.
+    """
+    with open(history_file) as f:
+        _skip_lines(f, 5)  # throw away headers
+        n_nodes = int(next(f).strip())
+        nodes = _read_node_numbers(f, n_nodes=n_nodes)
+        headings, time = _read_headings_and_first_time(f, read_fields)
+        fields = [h for h in headings if h != 'node']
+
+        node_indexes = [i for i, node in enumerate(nodes) if not read_nodes or node in read_nodes]
+        field_indexes = [i + 1 for i, field in enumerate(fields) if not read_fields or field in read_fields]
+        while time >= 0:  # FEHM writes the final time twice, once negative to signal end of run
+            lines = [line for _, line in zip(range(n_nodes), f)]
+            if len(lines) < n_nodes or (lines and not lines[-1].endswith('\n')):
+                return  # partially written timestep
+            values = np.array([line.split() for line in lines], dtype=float).reshape(n_nodes, len(fields) + 1)
+            yield HistoryTimestep(time_days=float(time), values=values[np.ix_(node_indexes, field_indexes)])
+
+            try:
+                time = Decimal(next(f, '').strip())
+            except InvalidOperation:
+                return  # end of file, or partially written time
+
+
+@dataclass
+class HistoryTail:
+    """Incremental reader for a history file that is still being written, e.g. by a running FEHM process.
+
+    Each call to read_new_timesteps parses only the bytes appended since the last complete timestep (at offset), so
+    polling an unchanged file costs a single stat. A partially written header or timestep is left for a later call.
+    Reading restarts from the beginning if the file is truncated or replaced, as when a run is restarted.
+    """
+    history_file: Path
+    read_nodes: Optional[Sequence[int]] = None
+    read_fields: Optional[Sequence[str]] = None
+    header: Optional[HistoryHeader] = None
+    offset: int = 0
+    finished: bool = False  # the end-of-run marker has been read
+    _inode: Optional[int] = field(default=None, repr=False)
+    _node_indexes: list[int] = field(default_factory=list, repr=False)
+    _field_indexes: list[int] = field(default_factory=list, repr=False)
+
+    def read_new_timesteps(self) -> list[HistoryTimestep]:
+        stat = os.stat(self.history_file)
+        if stat.st_size < self.offset or (self._inode is not None and stat.st_ino != self._inode):
+            self.header, self.offset, self.finished = None, 0, False
+        self._inode = stat.st_ino
+        if self.finished or stat.st_size == self.offset:
+            return []
+
+        timesteps = []
+        with open(self.history_file, 'rb') as f:
+            f.seek(self.offset)
+            buffer = b''
+            for chunk in iter(lambda: f.read(TAIL_CHUNK_BYTES), b''):
+                buffer += chunk
+                n_bytes_read = self._read_complete_timesteps(buffer, timesteps)
+                buffer = buffer[n_bytes_read:]
+                self.offset += n_bytes_read
+                if self.finished:
+                    break
+        return timesteps
+
+    def _read_complete_timesteps(self, buffer: bytes, timesteps: list[HistoryTimestep]) -> int:
+        """Parse the complete timesteps (and header, if not yet read) in buffer, returning the number of bytes used."""
+        lines = buffer.split(b'\n')[:-1]  # the last line is incomplete, or empty after a final newline
+        i = 0
+        if self.header is None:
+            i = self._read_header(lines)
+            if i is None:
+                return 0
+
+        n_nodes = len(self.header.nodes)
+        while i + n_nodes < len(lines):
+            time = float(lines[i])
+            if time < 0:  # FEHM writes the final time twice, once negative to signal end of run
+                self.finished = True
+                i += n_nodes + 1
+                break
+            values = np.array([line.split() for line in lines[i + 1:i + n_nodes + 1]], dtype=float)
+            values = values.reshape(n_nodes, len(self.header.fields) + 1)
+            values = values[np.ix_(self._node_indexes, self._field_indexes)]
+            timesteps.append(HistoryTimestep(time_days=time, values=values))
+            i += n_nodes + 1
+        return sum(len(line) + 1 for line in lines[:i])
+
+    def _read_header(self, lines: list[bytes]) -> Optional[int]:
+        """Read the header from complete lines, returning the index of the first time line, or None if incomplete."""
+        if len(lines) < 6:
+            return None
+        n_nodes = int(lines[5])
+        first_heading = 5 + n_nodes + 2  # skip node lines and "headings"
+        for i in range(first_heading + 1, len(lines)):
+            try:
+                float(lines[i])
+            except ValueError:
+                continue
+
+            nodes = [int(line.split()[0]) for line in lines[6:6 + n_nodes]]
+            headings = _parse_heading_lines([line.decode() for line in lines[first_heading:i]])
+            fields = [h for h in headings if h != 'node']
+            missing_fields = set(self.read_fields or []) - set(fields)
+            if missing_fields:
+                raise ValueError(f'Specified field names {missing_fields} not found in history file: {headings}')
+
+            self.header = HistoryHeader(nodes=tuple(nodes), fields=tuple(fields))
+            self._node_indexes = [j for j, node in enumerate(nodes) if not self.read_nodes or node in self.read_nodes]
+            self._field_indexes = [
+                j + 1 for j, field_name in enumerate(fields) if not self.read_fields or field_name in self.read_fields
+            ]
+            return i
+        return None
+
+
 def _skip_lines(open_file: TextIO, lines: int):
     for i in range(lines):
         next(open_file)
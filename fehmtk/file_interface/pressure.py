@@ -1,6 +1,6 @@
 from decimal import Decimal
 from pathlib import Path
-from typing import Optional, TextIO
+from typing import Iterable, Optional, Sequence, TextIO
 
 from .helpers import grouper
 
@@ -32,6 +32,13 @@ def write_pressure(
         _write_node_data(f, pressure_by_node, final_newline=False)
 
 
+def write_pressure_chunks(pressure_chunks: Iterable[Sequence[Decimal]], output_file: Path, n_nodes: int):
+    """Write pressures in node order as they are generated, chunk by chunk."""
+    with open(output_file, 'w') as f:
+        _write_default_saturation(f, n_nodes=n_nodes)
+        _write_values(f, (value for chunk in pressure_chunks for value in chunk), n_values=n_nodes, final_newline=False)
+
+
 def _write_default_saturation(open_file: TextIO, n_nodes: int):
     for chunk in grouper(range(n_nodes), chunksize=4):
         saturations = len(chunk) * ['        1.0000000']
@@ -39,11 +46,15 @@ def _write_default_saturation(open_file: TextIO, n_nodes: int):
 
 
 def _write_node_data(open_file: TextIO, values_by_node: dict[int, Decimal], final_newline=True):
-    chunksize = 4
     sorted_values = [v for node, v in sorted(values_by_node.items())]
-    for i, chunk in enumerate(grouper(sorted_values, chunksize=chunksize), start=1):
+    _write_values(open_file, sorted_values, n_values=len(values_by_node), final_newline=final_newline)
+
+
+def _write_values(open_file: TextIO, values: Iterable[Decimal], n_values: int, final_newline=True):
+    chunksize = 4
+    for i, chunk in enumerate(grouper(values, chunksize=chunksize), start=1):
         open_file.write('    '.join([f'{v:17.7f}' for v in chunk]))
 
         # TODO(dustin): remove this when not trying to match legacy file formats
-        if final_newline or i * chunksize < len(values_by_node):
+        if final_newline or i * chunksize < n_values:
             open_file.write('\n')
@@ -1,6 +1,6 @@
 from decimal import Decimal
 from pathlib import Path
-from typing import Sequence, TextIO
+from typing import Iterator, Sequence, TextIO
 
 from fehmtk.fehm_objects import RestartMetadata, State
 from .helpers import grouper
@@ -43,6 +43,27 @@ def read_restart(restart_file: Path) -> tuple[State, RestartMetadata]:
     return state, metadata
 
 
+def iterate_restart_block(restart_file: Path, block_name: str) -> Iterator[float]:
+    """Iterate over the values of a single block in a restart file (.ini, .fin) without holding them in memory."""
+    with open(restart_file) as f:
+        for _ in range(3):
+            next(f)
+        n_nodes, _ = _parse_nodes_header(next(f))
+
+        for line in f:
+            if line.strip() != block_name:
+                continue
+
+            n_values = 0
+            while n_values < n_nodes:
+                for value in next(f).strip().split():
+                    n_values += 1
+                    yield float(value)
+            return
+
+    raise KeyError(f'Required block "{block_name}" not found in restart file {restart_file}.')
+
+
 def _parse_nodes_header(nodes_header: str) -> int:
     header_items = nodes_header.strip().split()
     keyword = header_items[1] if len(header_items) > 1 else ''
@@ -1,6 +1,21 @@
+from dataclasses import dataclass
 from decimal import Decimal
 from pathlib import Path
 
+import numpy as np
+from scipy import sparse
+
+
+@dataclass(frozen=True)
+class StorageCoefficients:
+    """Volumes and connection coefficients read from a FEHM storage coefficient file (.stor).
+
+    The geometric coefficient of each connection is its Voronoi face area over the distance between the nodes (A/d,
+    in m), with rows and columns indexed by node number - 1. The diagonal is not stored.
+    """
+    volumes: np.ndarray
+    geometric_coefficients: sparse.csr_matrix
+
 
 def read_volume_from_storage(storage_file: Path) -> tuple[Decimal]:
     """Read FEHM storage coefficient files (.stor), extracting node volume data"""
@@ -19,3 +34,43 @@ def read_volume_from_storage(storage_file: Path) -> tuple[Decimal]:
         raise ValueError(f'Got more volumes ({len(volume)}) than n_nodes ({n_nodes})')
 
     return tuple(volume)
+
+
+def read_storage_coefficients(storage_file: Path) -> StorageCoefficients:
+    """Read FEHM storage coefficient files (.stor) as float arrays, including the sparse matrix of connections.
+
+    The body holds, in order: volumes, row pointers followed by (1-based) column indexes, pointers into the
+    coefficient list, padding zeros, diagonal pointers, then the coefficients themselves (written as -A/d).
+    """
+    with open(storage_file) as f:
+        next(f)  # skip title header
+        next(f)  # skip model header
+        n_written_coefficients, n_nodes, n_row_entries, n_area_coefficients, _ = [
+            int(v) for v in next(f).strip().split()
+        ]
+        values = np.array(f.read().split(), dtype=float)
+
+    if n_area_coefficients != 1:
+        raise NotImplementedError(f'Only scalar area coefficients supported, got NUM_AREA_COEF={n_area_coefficients}')
+
+    n_connections = n_row_entries - n_nodes - 1
+    section_lengths = (n_nodes, n_nodes + 1, n_connections, n_connections, n_nodes + 1, n_nodes, n_written_coefficients)
+    if values.size != sum(section_lengths):
+        raise ValueError(f'Expected {sum(section_lengths)} values in {storage_file}, got {values.size}')
+
+    volumes, row_pointers, columns, coefficient_pointers, _, _, coefficients = np.split(
+        values,
+        np.cumsum(section_lengths)[:-1],
+    )
+    row_pointers = row_pointers.astype(int)
+    geometric_coefficients = sparse.csr_matrix(
+        (
+            -coefficients[coefficient_pointers.astype(int) - 1],
+            columns.astype(int) - 1,
+            row_pointers - row_pointers[0],
+        ),
+        shape=(n_nodes, n_nodes),
+    )
+    geometric_coefficients.setdiag(0)
+    geometric_coefficients.eliminate_zeros()
+    return StorageCoefficients(volumes=volumes, geometric_coefficients=geometric_coefficients)
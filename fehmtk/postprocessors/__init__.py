@@ -1,2 +1,7 @@
+from .boundary_output import summarize_boundary_output
 from .check_history import check_history
+from .convergence import check_convergence
+from .downsampling import DOWNSAMPLE_METHODS
+from .run_comparison import COMPARE_FIELDS, compare_many_runs
 from .run_summary import compare_runs, summarize_run
+from .velocity import summarize_velocities
@@ -0,0 +1,204 @@
+from dataclasses import dataclass
+import logging
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from fehmtk.config import RunConfig
+from fehmtk.fehm_objects import Grid
+from fehmtk.file_interface import (
+    iterate_restart_block,
+    read_avs_columns,
+    read_compact_node_array,
+    read_grid,
+    read_storage_coefficients,
+)
+
+logger = logging.getLogger(__name__)
+
+TOTAL_ZONE = 'total'
+W_PER_MW = 1e6
+MW_PER_W_PER_M2 = 1e3  # mW/m2 per W/m2
+
+
+@dataclass(frozen=True)
+class BoundaryConnections:
+    """Thermal conductances (W/degC) from the nodes of each boundary zone to the nodes outside that zone.
+
+    Rows are (zone, node) pairs, so the conductive heat flowing into every boundary node from the rest of the model,
+    and so the heat output of every zone, is one sparse product per snapshot however many zones are summarized.
+    """
+    zones: tuple[str, ...]
+    row_zone_indexes: np.ndarray
+    row_node_indexes: np.ndarray
+    conductances: sparse.csr_matrix
+    total_conductances: np.ndarray
+    area_by_zone: np.ndarray
+
+    def get_heat_out_W(self, temperature: np.ndarray) -> np.ndarray:
+        """Conductive heat (W) leaving the model through each zone: the heat flowing into its nodes from the rest of
+        the model, which is negative where heat enters (e.g. at a heated base)."""
+        heat_into_nodes = self.conductances @ temperature - self.total_conductances * temperature[self.row_node_indexes]
+        return self._sum_by_zone(heat_into_nodes)
+
+    def get_fluid_out_kg_per_s(self, source: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Fluid leaving (positive sources) and entering (negative sources) the model through each zone, in kg/s."""
+        zone_source = source[self.row_node_indexes]
+        return self._sum_by_zone(np.maximum(zone_source, 0)), self._sum_by_zone(np.maximum(-zone_source, 0))
+
+    def _sum_by_zone(self, values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.row_zone_indexes, weights=values, minlength=len(self.zones))
+
+
+def summarize_boundary_output(
+    config_file: Path,
+    output_file: Path,
+    state_files: Optional[Sequence[Path]] = None,
+    zones: Optional[Sequence[Union[int, str]]] = None,
+) -> pd.DataFrame:
+    """Integrate conductive heat output and fluid output over boundary zones, for one or more model snapshots.
+
+    Snapshots are restart files (default: final_conditions) or AVS scalar files; only AVS files hold sources, so fluid
+    output is left empty for restart files. Zones default to all outside zones; a "total" row treats their union as a
+    single boundary. Heat flux is per horizontally projected outside area (empty where that area is zero).
+    """
+    logger.info('Reading configuration file: %s', config_file)
+    config = RunConfig.from_yaml(config_file)
+    files_config = config.files_config
+
+    logger.info('Parsing grid into memory')
+    grid = read_grid(
+        files_config.grid,
+        outside_zone_file=files_config.outside_zone,
+        area_file=files_config.area,
+        read_elements=False,
+    )
+    if not zones:
+        zones = [zone.name or zone.number for zone in sorted(grid.outside_zones, key=lambda zone: zone.number)]
+
+    logger.info('Reading storage coefficients from %s', files_config.storage)
+    storage_coefficients = read_storage_coefficients(files_config.storage)
+    logger.info('Reading conductivity from %s', files_config.conductivity)
+    conductivity = read_compact_node_array(files_config.conductivity, grid.n_nodes)
+
+    connections = get_boundary_connections(grid, storage_coefficients.geometric_coefficients, conductivity, zones)
+
+    rows = []
+    for state_file in state_files or [files_config.final_conditions]:
+        logger.info('Reading state from %s', state_file)
+        temperature, source = _read_snapshot(state_file)
+        if temperature.size != grid.n_nodes:
+            raise ValueError(f'Number of temperatures ({temperature.size}) does not match grid nodes ({grid.n_nodes})')
+
+        heat_out_MW = connections.get_heat_out_W(temperature) / W_PER_MW
+        if source is None:
+            fluid_out, fluid_in = np.full((2, len(connections.zones)), np.nan)
+        else:
+            fluid_out, fluid_in = connections.get_fluid_out_kg_per_s(source)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            heat_flux = np.where(
+                connections.area_by_zone > 0,
+                heat_out_MW * W_PER_MW * MW_PER_W_PER_M2 / connections.area_by_zone,
+                np.nan,
+            )
+        for i, zone in enumerate(connections.zones):
+            rows.append({
+                'state_file': Path(state_file).name,
+                'zone': zone,
+                'area_m2': connections.area_by_zone[i],
+                'heat_out_MW': heat_out_MW[i],
+                'heat_flux_mW_per_m2': heat_flux[i],
+                'fluid_out_kg_per_s': fluid_out[i],
+                'fluid_in_kg_per_s': fluid_in[i],
+            })
+            logger.info('%s: heat out %.6G MW through %s', Path(state_file).name, heat_out_MW[i], zone)
+
+    summary = pd.DataFrame(rows)
+    logger.info('Writing output to: %s', output_file)
+    summary.to_csv(output_file, index=False)
+    return summary
+
+
+def get_boundary_connections(
+    grid: Grid,
+    geometric_coefficients: sparse.csr_matrix,
+    conductivity: np.ndarray,
+    zones: Sequence[Union[int, str]],
+) -> BoundaryConnections:
+    """Conductances between the nodes of each zone (and their union, as "total") and the nodes outside it.
+
+    Each connection's conductance is its geometric coefficient (A/d) times the harmonic mean of the two nodes'
+    conductivities, each projected onto the direction between the nodes.
+    """
+    coordinates = np.zeros((grid.n_nodes, 3))
+    area_z = np.zeros(grid.n_nodes)
+    for node in grid.nodes:
+        coordinates[node.number - 1] = node.coordinates.value
+        if node.outside_area is not None:
+            area_z[node.number - 1] = abs(node.outside_area.z)
+    conductivity = np.broadcast_to(conductivity, (grid.n_nodes, 3))
+
+    node_indexes_by_zone = {str(zone): grid.get_node_numbers_in_outside_zone(zone) - 1 for zone in zones}
+    node_indexes_by_zone[TOTAL_ZONE] = np.unique(np.concatenate(list(node_indexes_by_zone.values())))
+
+    row_zone_indexes, row_node_indexes = [], []
+    connection_rows, connection_columns, geometric_coefficients_by_connection = [], [], []
+    in_zone = np.zeros(grid.n_nodes, dtype=bool)
+    n_rows = 0
+    for zone_index, node_indexes in enumerate(node_indexes_by_zone.values()):
+        in_zone[node_indexes] = True
+        zone_connections = geometric_coefficients[node_indexes].tocoo()
+        outside = ~in_zone[zone_connections.col]
+        connection_rows.append(zone_connections.row[outside] + n_rows)
+        connection_columns.append(zone_connections.col[outside])
+        geometric_coefficients_by_connection.append(zone_connections.data[outside])
+        row_zone_indexes.append(np.full(node_indexes.size, zone_index))
+        row_node_indexes.append(node_indexes)
+        in_zone[node_indexes] = False
+        n_rows += node_indexes.size
+
+    row_node_indexes = np.concatenate(row_node_indexes)
+    connection_rows = np.concatenate(connection_rows)
+    connection_columns = np.concatenate(connection_columns)
+    from_nodes = row_node_indexes[connection_rows]
+
+    direction = coordinates[connection_columns] - coordinates[from_nodes]
+    direction_squared = direction ** 2 / (direction ** 2).sum(axis=1, keepdims=True)
+    from_conductivity = (conductivity[from_nodes] * direction_squared).sum(axis=1)
+    to_conductivity = (conductivity[connection_columns] * direction_squared).sum(axis=1)
+    harmonic_conductivity = 2 * from_conductivity * to_conductivity / (from_conductivity + to_conductivity)
+
+    conductances = sparse.csr_matrix(
+        (
+            harmonic_conductivity * np.concatenate(geometric_coefficients_by_connection),
+            (connection_rows, connection_columns),
+        ),
+        shape=(n_rows, grid.n_nodes),
+    )
+    row_zone_indexes = np.concatenate(row_zone_indexes)
+    return BoundaryConnections(
+        zones=tuple(node_indexes_by_zone),
+        row_zone_indexes=row_zone_indexes,
+        row_node_indexes=row_node_indexes,
+        conductances=conductances,
+        total_conductances=np.asarray(conductances.sum(axis=1)).ravel(),
+        area_by_zone=np.bincount(
+            row_zone_indexes,
+            weights=area_z[row_node_indexes],
+            minlength=len(node_indexes_by_zone),
+        ),
+    )
+
+
+def _read_snapshot(state_file: Path) -> tuple[np.ndarray, Optional[np.ndarray]]:
+    """Temperature and (for AVS files) source arrays from a snapshot, read as floats without building a State."""
+    if Path(state_file).suffix == '.avs':
+        columns = read_avs_columns(state_file)
+        if 'temperature' not in columns:
+            raise KeyError(f'No temperature column in AVS file {state_file}')
+        return columns['temperature'], columns.get('source')
+    return np.fromiter(iterate_restart_block(state_file, 'temperature'), dtype=float), None
@@ -1,17 +1,24 @@
 import logging
 from pathlib import Path
-from typing import Optional
+import time
+from typing import Optional, Sequence
 
 from IPython import embed
 from matplotlib import pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
 
 from fehmtk.config import RunConfig
-from fehmtk.file_interface import read_history
+from fehmtk.file_interface import HistoryHeader, HistoryTail, HistoryTimestep, read_history
+from .downsampling import get_downsampled_indexes
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POLL_SECONDS = 10.
+DEFAULT_DOWNSAMPLE_METHOD = 'lttb'
+DEFAULT_MAX_POINTS = 2000  # per series, about the width of a figure in pixels
+
 PLOT_AXES_MAPPING = {
     'flow enthalpy(Mj/kg)': r'$H\:(\frac{Mj}{kg})$',
     'flow(kg/s)': r'$Q\:(\frac{kg}{s})$',
@@ -28,10 +35,26 @@ def check_history(
     nodes: Optional[list[int]] = None,
     fields: Optional[list[str]] = None,
     interact: bool = False,
+    follow: bool = False,
+    poll_seconds: Optional[float] = None,
+    downsample: Optional[str] = None,
+    max_points: Optional[int] = None,
 ):
     logger.info(f'Reading configuration file: {config_file}')
     config = RunConfig.from_yaml(config_file)
 
+    if follow:
+        follow_history(
+            config.files_config.history,
+            nodes=nodes,
+            fields=fields,
+            run_root=config.files_config.run_root,
+            poll_seconds=poll_seconds,
+            downsample=downsample,
+            max_points=max_points,
+        )
+        return
+
     history = read_history(
         config.files_config.history,
         last_fraction=last_fraction,
@@ -43,12 +66,28 @@ def check_history(
     if fields is None:
         fields = [field for field in history.columns if field not in ('time_days', 'node')]
 
-    plot_history(history, fields, run_root=config.files_config.run_root)
+    plot_history(
+        history,
+        fields,
+        run_root=config.files_config.run_root,
+        downsample=downsample,
+        max_points=max_points,
+    )
     if interact:
         embed()
 
 
-def plot_history(history: pd.DataFrame, fields: list[str], run_root=None):
+def plot_history(
+    history: pd.DataFrame,
+    fields: list[str],
+    run_root=None,
+    downsample: Optional[str] = None,
+    max_points: Optional[int] = None,
+):
+    """Plot fields, and their rates of change, over time at each node. Rates are computed from every timestep, then
+    each series of values and rates is downsampled to at most max_points points (see get_downsampled_indexes)."""
+    downsample = downsample or DEFAULT_DOWNSAMPLE_METHOD
+    max_points = max_points or DEFAULT_MAX_POINTS
     n_nodes = history.node.nunique()
     marker = 'o' if history.time_days.nunique() < 75 else None
     markersize = 4
@@ -62,7 +101,7 @@ def plot_history(history: pd.DataFrame, fields: list[str], run_root=None):
     fig.suptitle(run_root or 'Run history')
     for i, (field, ax) in enumerate(zip(fields, axs)):
         sns.lineplot(
-            data=history,
+            data=downsample_history(history, 'time_years', field, method=downsample, max_points=max_points),
             x='time_years',
             y=field,
             hue='node',
@@ -84,7 +123,7 @@ def plot_history(history: pd.DataFrame, fields: list[str], run_root=None):
     fig.suptitle(run_root or 'Run history')
     for i, (field, ax) in enumerate(zip(fields, axs)):
         sns.lineplot(
-            data=delta_history,
+            data=downsample_history(delta_history, 'time_years', field, method=downsample, max_points=max_points),
             x='time_years',
             y=field,
             hue='node',
@@ -96,8 +135,9 @@ def plot_history(history: pd.DataFrame, fields: list[str], run_root=None):
         )
         ax.set_ylabel(r'$\Delta\:$' + PLOT_AXES_MAPPING.get(field, field) + r'$/\:kya$')
 
+    time_steps = delta_history.drop_duplicates(subset=['time_years', 'delta_time_years']).assign(node='all')
     sns.lineplot(
-        data=delta_history.drop_duplicates(subset=['time_years', 'delta_time_years']),
+        data=downsample_history(time_steps, 'time_years', 'delta_time_years', method=downsample, max_points=max_points),
         x='time_years',
         y='delta_time_years',
         ax=axs[-1],
@@ -110,3 +150,169 @@ def plot_history(history: pd.DataFrame, fields: list[str], run_root=None):
     axs[-1].set_ylabel(r'$\Delta\:t\:(years)$')
 
     plt.show()
+
+
+def downsample_history(data: pd.DataFrame, x: str, y: str, method: str, max_points: int) -> pd.DataFrame:
+    """Columns x, y and node of long-format history data, keeping at most max_points points of each node's series.
+    Series are pivoted to a column per node, so that all nodes are downsampled together."""
+    nodes = pd.unique(data.node)
+    wide = data.drop_duplicates(subset=[x, 'node']).pivot(index=x, columns='node', values=y)[nodes]
+    x_values = wide.index.to_numpy(dtype=float)
+    y_values = wide.to_numpy(dtype=float)
+    indexes_by_node = get_downsampled_indexes(x_values, y_values, method=method, max_points=max_points)
+    return pd.concat([
+        pd.DataFrame({x: x_values[indexes], y: y_values[indexes, j], 'node': node})
+        for j, (node, indexes) in enumerate(zip(nodes, indexes_by_node))
+    ], ignore_index=True)
+
+
+def follow_history(
+    history_file: Path,
+    nodes: Optional[Sequence[int]] = None,
+    fields: Optional[Sequence[str]] = None,
+    run_root: Optional[str] = None,
+    poll_seconds: Optional[float] = None,
+    plot: bool = True,
+    max_polls: Optional[int] = None,
+    downsample: Optional[str] = None,
+    max_points: Optional[int] = None,
+) -> HistoryTail:
+    """Tail a history file while FEHM writes it, logging summary statistics and updating live plots as timesteps are
+    appended. Only newly appended bytes are parsed on each poll, and plotted lines are downsampled to at most
+    max_points points as in plot_history. Stops at the end-of-run marker, after max_polls polls, or on interrupt
+    (Ctrl-C).
+    """
+    poll_seconds = poll_seconds if poll_seconds is not None else DEFAULT_POLL_SECONDS
+    tail = HistoryTail(history_file, read_nodes=nodes, read_fields=fields)
+    live_plot = None
+    previous_timestep = None
+    n_polls = 0
+    logger.info('Following history file %s, polling every %gs', history_file, poll_seconds)
+    try:
+        while True:
+            timesteps = tail.read_new_timesteps()
+            if timesteps:
+                fields = [field for field in tail.header.fields if not tail.read_fields or field in tail.read_fields]
+                _log_history_update(timesteps, previous_timestep, fields)
+                previous_timestep = timesteps[-1]
+                if plot:
+                    live_plot = live_plot or LiveHistoryPlot(
+                        tail.header,
+                        nodes,
+                        fields,
+                        run_root=run_root,
+                        downsample=downsample,
+                        max_points=max_points,
+                    )
+                    live_plot.update(timesteps)
+
+            n_polls += 1
+            if tail.finished:
+                logger.info('Run finished')
+                break
+            if max_polls is not None and n_polls >= max_polls:
+                break
+            if live_plot:
+                plt.pause(poll_seconds)  # keeps the figure responsive while waiting
+            else:
+                time.sleep(poll_seconds)
+    except KeyboardInterrupt:
+        logger.info('Stopped following %s', history_file)
+    return tail
+
+
+class LiveHistoryPlot:
+    """Figure with an axis per field and a line per node, extended in place as timesteps are appended.
+
+    Timesteps are kept in arrays grown geometrically, so appending is amortized over the run, and each line is
+    redrawn from at most max_points downsampled points however long the run gets."""
+
+    def __init__(
+        self,
+        header: HistoryHeader,
+        nodes: Optional[Sequence[int]],
+        fields: list[str],
+        run_root=None,
+        downsample: Optional[str] = None,
+        max_points: Optional[int] = None,
+    ):
+        self.nodes = [node for node in header.nodes if not nodes or node in nodes]
+        self.downsample = downsample or DEFAULT_DOWNSAMPLE_METHOD
+        self.max_points = max_points or DEFAULT_MAX_POINTS
+        self.n_timesteps = 0
+        self._times_years = np.empty(0)
+        self._values = np.empty((0, len(self.nodes), len(fields)))
+
+        plt.ion()
+        self.fig, axs = plt.subplots(len(fields), 1, figsize=(6, 2 + len(fields)), constrained_layout=True, sharex=True)
+        self.axs = np.atleast_1d(axs)
+        self.fig.suptitle(run_root or 'Run history')
+        self.lines = []
+        for field, ax in zip(fields, self.axs):
+            self.lines.append([ax.plot([], [], label=str(node))[0] for node in self.nodes])
+            ax.set_ylabel(PLOT_AXES_MAPPING.get(field, field))
+        self.axs[0].legend(title='node')
+        self.axs[-1].set_xlabel(r'$t\:(years)$')
+
+    @property
+    def times_years(self) -> np.ndarray:
+        return self._times_years[:self.n_timesteps]
+
+    @property
+    def values(self) -> np.ndarray:
+        """Values of shape (time, node, field)."""
+        return self._values[:self.n_timesteps]
+
+    def update(self, timesteps: list[HistoryTimestep]):
+        self._append(timesteps)
+        times_years, values = self.times_years, self.values
+        for field_index, (ax, lines) in enumerate(zip(self.axs, self.lines)):
+            field_values = values[:, :, field_index]
+            indexes_by_node = get_downsampled_indexes(
+                times_years,
+                field_values,
+                method=self.downsample,
+                max_points=self.max_points,
+            )
+            for node_index, (line, indexes) in enumerate(zip(lines, indexes_by_node)):
+                line.set_data(times_years[indexes], field_values[indexes, node_index])
+            ax.relim()
+            ax.autoscale_view()
+        self.fig.canvas.draw_idle()
+
+    def _append(self, timesteps: list[HistoryTimestep]):
+        n_timesteps = self.n_timesteps + len(timesteps)
+        if n_timesteps > len(self._times_years):
+            capacity = max(n_timesteps, 2 * len(self._times_years))
+            times_years = np.empty(capacity)
+            times_years[:self.n_timesteps] = self.times_years
+            values = np.empty((capacity, *self._values.shape[1:]))
+            values[:self.n_timesteps] = self.values
+            self._times_years, self._values = times_years, values
+        self._times_years[self.n_timesteps:n_timesteps] = [timestep.time_days / 365 for timestep in timesteps]
+        self._values[self.n_timesteps:n_timesteps] = [timestep.values for timestep in timesteps]
+        self.n_timesteps = n_timesteps
+
+
+def _log_history_update(
+    timesteps: list[HistoryTimestep],
+    previous_timestep: Optional[HistoryTimestep],
+    fields: list[str],
+):
+    """Log the latest time, and the range and fastest rate of change (per kyr, since the previous timestep) of each
+    field over monitored nodes."""
+    latest = timesteps[-1]
+    previous = timesteps[-2] if len(timesteps) > 1 else previous_timestep
+    logger.info('Read %d new timesteps, now at %.6G years', len(timesteps), latest.time_days / 365)
+    if not latest.values.size:
+        return
+
+    rates = None
+    if previous is not None and latest.time_days > previous.time_days:
+        rates = 1000 * (latest.values - previous.values) / ((latest.time_days - previous.time_days) / 365)
+    for field_index, field in enumerate(fields):
+        values = latest.values[:, field_index]
+        message = f'{field}: {values.min():.6G} to {values.max():.6G}'
+        if rates is not None:
+            message += f', max rate of change {np.abs(rates[:, field_index]).max():.3G} per kyr'
+        logger.info(message)
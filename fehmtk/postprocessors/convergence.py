@@ -0,0 +1,193 @@
+from collections import deque
+from dataclasses import dataclass, field
+import json
+import logging
+from pathlib import Path
+import sys
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from fehmtk.config import RunConfig
+from fehmtk.file_interface import HistoryTimestep, iterate_history, read_history_header
+
+logger = logging.getLogger(__name__)
+
+DAYS_PER_YEAR = 365
+DEFAULT_WINDOW_YEARS = 1000
+DEFAULT_RATE_THRESHOLDS_PER_KYR = {  # absolute rate of change per thousand years
+    'temperature(deg C)': 0.01,
+    'total pressure(Mpa)': 0.001,
+}
+EXIT_CODE_CONVERGED = 0
+EXIT_CODE_NOT_CONVERGED = 1
+
+
+@dataclass
+class ConvergenceReport:
+    """Rates of change over the trailing window ending at the last complete timestep of a history file.
+
+    Rates are per thousand years, as in the delta plots of plot_history. A run is converged once the window spans
+    window_years and every rate is below its field's threshold; converged_since_years is the earliest time from which
+    that held at every later timestep.
+    """
+    nodes: tuple[int, ...]
+    fields: tuple[str, ...]
+    thresholds_per_kyr: np.ndarray
+    window_years: float
+    n_timesteps: int = 0
+    time_years: Optional[float] = None
+    window_span_years: float = 0.
+    rates_per_kyr: Optional[np.ndarray] = None
+    converged_since_years: Optional[float] = None
+    window: deque = field(default_factory=deque, repr=False)  # (time_years, values) within the trailing window
+
+    @property
+    def converged(self) -> bool:
+        return self.converged_since_years is not None
+
+    def get_max_rates_per_kyr(self) -> dict[str, dict]:
+        """Largest absolute rate of change of each field, with the node at which it occurs."""
+        max_rates = {}
+        for field_index, field_name in enumerate(self.fields):
+            node_index = np.abs(self.rates_per_kyr[:, field_index]).argmax()
+            max_rates[field_name] = {
+                'node': self.nodes[node_index],
+                'rate_per_kyr': float(self.rates_per_kyr[node_index, field_index]),
+                'threshold_per_kyr': float(self.thresholds_per_kyr[field_index]),
+            }
+        return max_rates
+
+    def to_dict(self) -> dict:
+        return {
+            'converged': self.converged,
+            'converged_since_years': self.converged_since_years,
+            'time_years': self.time_years,
+            'n_timesteps': self.n_timesteps,
+            'window_years': self.window_years,
+            'window_span_years': self.window_span_years,
+            'max_rates_per_kyr': self.get_max_rates_per_kyr() if self.rates_per_kyr is not None else None,
+        }
+
+    def log(self):
+        if self.rates_per_kyr is None:
+            logger.warning(
+                'History spans %.6G years, less than the %.6G year window: not converged',
+                self.window_span_years,
+                self.window_years,
+            )
+            return
+
+        for field_name, max_rate in self.get_max_rates_per_kyr().items():
+            log = logger.info if abs(max_rate['rate_per_kyr']) < max_rate['threshold_per_kyr'] else logger.warning
+            log(
+                'Max rate of change of %s: %.3G per kyr at node %d (threshold %.3G)',
+                field_name,
+                max_rate['rate_per_kyr'],
+                max_rate['node'],
+                max_rate['threshold_per_kyr'],
+            )
+        if self.converged:
+            logger.info(
+                'Converged since %.6G years (last timestep %.6G years)',
+                self.converged_since_years,
+                self.time_years,
+            )
+        else:
+            logger.warning('Not converged at %.6G years', self.time_years)
+
+
+def check_convergence(
+    config_file: Path,
+    nodes: Optional[list[int]] = None,
+    fields: Optional[list[str]] = None,
+    thresholds: Optional[Union[dict[str, float], Iterable[tuple[str, float]]]] = None,
+    window_years: Optional[float] = None,
+    report_file: Optional[Path] = None,
+):
+    """Stream the run's history file and exit with status 0 if it has converged to steady state, 1 otherwise. The
+    report is logged, and written as JSON to report_file if given."""
+    logger.info(f'Reading configuration file: {config_file}')
+    config = RunConfig.from_yaml(config_file)
+
+    report = get_convergence_report(
+        config.files_config.history,
+        nodes=nodes,
+        fields=fields,
+        thresholds=thresholds,
+        window_years=window_years,
+    )
+    report.log()
+    if report_file:
+        logger.info('Writing convergence report to: %s', report_file)
+        Path(report_file).write_text(json.dumps(report.to_dict(), indent=2))
+    sys.exit(EXIT_CODE_CONVERGED if report.converged else EXIT_CODE_NOT_CONVERGED)
+
+
+def get_convergence_report(
+    history_file: Path,
+    nodes: Optional[Sequence[int]] = None,
+    fields: Optional[Sequence[str]] = None,
+    thresholds: Optional[Union[dict[str, float], Iterable[tuple[str, float]]]] = None,
+    window_years: Optional[float] = None,
+) -> ConvergenceReport:
+    """Rates of change of fields at monitored nodes, streamed from a history file one timestep at a time.
+
+    Optional params:
+      - nodes: monitored nodes to check (default: all)
+      - fields: fields to check (default: those with thresholds)
+      - thresholds: maximum absolute rate of change per kyr by field (default: DEFAULT_RATE_THRESHOLDS_PER_KYR)
+      - window_years: span over which rates are measured (default: DEFAULT_WINDOW_YEARS)
+    """
+    thresholds = dict(thresholds if thresholds is not None else DEFAULT_RATE_THRESHOLDS_PER_KYR)
+    fields = list(fields or thresholds)
+    window_years = window_years if window_years is not None else DEFAULT_WINDOW_YEARS
+    if window_years <= 0:
+        raise ValueError(f'window_years must be positive, got {window_years}')
+
+    missing_thresholds = set(fields) - thresholds.keys()
+    if missing_thresholds:
+        raise KeyError(f'No rate thresholds for fields: {missing_thresholds}')
+
+    header = read_history_header(history_file)
+    missing_fields = set(fields) - set(header.fields)
+    if missing_fields:
+        raise ValueError(f'Specified field names {missing_fields} not found in history file: {header.fields}')
+    fields = [field_name for field_name in header.fields if field_name in fields]  # in file order, as read
+    nodes = tuple(node for node in header.nodes if not nodes or node in nodes)
+    if not nodes:
+        raise ValueError(f'No monitored nodes to check in history file {history_file}')
+
+    report = ConvergenceReport(
+        nodes=nodes,
+        fields=tuple(fields),
+        thresholds_per_kyr=np.array([float(thresholds[field_name]) for field_name in fields]),
+        window_years=window_years,
+    )
+    update_convergence_report(report, iterate_history(history_file, read_nodes=nodes, read_fields=fields))
+    return report
+
+
+def update_convergence_report(report: ConvergenceReport, timesteps: Iterable[HistoryTimestep]):
+    """Advance a report over timesteps (which may arrive over several calls), keeping only the timesteps within the
+    trailing window in memory."""
+    window = report.window
+    for timestep in timesteps:
+        time_years = timestep.time_days / DAYS_PER_YEAR
+        window.append((time_years, timestep.values))
+        while len(window) > 1 and time_years - window[1][0] >= report.window_years:
+            window.popleft()  # the next oldest timestep still spans the window
+
+        report.n_timesteps += 1
+        report.time_years = time_years
+        start_years, start_values = window[0]
+        report.window_span_years = time_years - start_years
+        if report.window_span_years < report.window_years:
+            continue
+
+        report.rates_per_kyr = 1000 * (timestep.values - start_values) / report.window_span_years
+        if np.all(np.abs(report.rates_per_kyr) < report.thresholds_per_kyr):
+            if report.converged_since_years is None:
+                report.converged_since_years = time_years
+        else:
+            report.converged_since_years = None
@@ -0,0 +1,81 @@
+import numpy as np
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax', 'none')
+
+
+def get_downsampled_indexes(x: np.ndarray, y: np.ndarray, method: str, max_points: int) -> list[np.ndarray]:
+    """Indexes of the points to keep for each column of y, a series per column sharing the sorted x values.
+
+    Series with no more than max_points points are kept whole.
+    >>> x = np.arange(6.)
+    >>> y = np.array([[0, 5], [1, 4], [9, 3], [1, 2], [0, 1], [0, 0]])
+    >>> get_downsampled_indexes(x, y, 'lttb', max_points=4)
+    [array([0, 2, 3, 5]), array([0, 1, 3, 5])]
+    >>> get_downsampled_indexes(x, y, 'minmax', max_points=5)
+    [array([0, 2, 5]), array([0, 5])]
+    >>> get_downsampled_indexes(x, y, 'none', max_points=4)[0]
+    array([0, 1, 2, 3, 4, 5])
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f'Unknown downsample method "{method}", expected one of {DOWNSAMPLE_METHODS}')
+    if method == 'none' or len(x) <= max_points:
+        return [np.arange(len(x)) for _ in range(y.shape[1])]
+
+    if method == 'lttb':
+        indexes = get_lttb_indexes(x, y, max_points)
+    else:
+        indexes = get_minmax_indexes(x, y, n_buckets=max(1, (max_points - 2) // 2))
+    return [np.unique(column) for column in indexes.T]
+
+
+def get_lttb_indexes(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-triangle-three-buckets downsampling of every column of y at once, returning (n_out, n_series) indexes.
+
+    The first and last points are kept, and the rest split into n_out - 2 buckets of equal count. From each bucket,
+    the point kept is the one forming the largest triangle with the point kept from the previous bucket and the mean of
+    the next bucket. Buckets are visited in order, with the triangle areas of all series computed together.
+    """
+    n_points, n_series = y.shape
+    if n_out >= n_points or n_out < 3:
+        return np.tile(np.arange(n_points)[:, np.newaxis], (1, n_series))
+
+    edges = np.linspace(1, n_points - 1, n_out - 1).astype(int)
+    edges = np.append(edges, n_points)  # the final "bucket" is the last point
+    series = np.arange(n_series)
+    indexes = np.empty((n_out, n_series), dtype=int)
+    indexes[0] = 0
+    indexes[-1] = n_points - 1
+    previous = np.zeros(n_series, dtype=int)
+    for i in range(n_out - 2):
+        start, end, next_end = edges[i], edges[i + 1], edges[i + 2]
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean(axis=0)
+        previous_x = x[previous]
+        previous_y = y[previous, series]
+        areas = np.abs(
+            (previous_x - next_x) * (y[start:end] - previous_y)
+            - (previous_x - x[start:end, np.newaxis]) * (next_y - previous_y)
+        )
+        previous = start + areas.argmax(axis=0)
+        indexes[i + 1] = previous
+    return indexes
+
+
+def get_minmax_indexes(x: np.ndarray, y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Min/max envelope of every column of y at once: buckets span equal ranges of x (e.g. a pixel each), and the
+    first and last points, and the first minimum and maximum within each non-empty bucket, are kept. Returns
+    (2 * n_non_empty_buckets + 2, n_series) indexes, not sorted."""
+    n_points, n_series = y.shape
+    span = x[-1] - x[0]
+    buckets = np.zeros(n_points, dtype=int) if span == 0 else ((x - x[0]) / span * n_buckets).astype(int)
+    starts = np.flatnonzero(np.diff(np.minimum(buckets, n_buckets - 1), prepend=-1))
+    bucket_of_point = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, n_points)))
+
+    point_indexes = np.broadcast_to(np.arange(n_points)[:, np.newaxis], y.shape)
+    extreme_indexes = [np.zeros((1, n_series), dtype=int), np.full((1, n_series), n_points - 1)]
+    for reduce in (np.fmin, np.fmax):  # ignoring NaNs
+        extremes = reduce.reduceat(y, starts, axis=0)
+        is_extreme = y == extremes[bucket_of_point]
+        first_extremes = np.minimum.reduceat(np.where(is_extreme, point_indexes, n_points), starts, axis=0)
+        extreme_indexes.append(np.minimum(first_extremes, n_points - 1))  # all-NaN buckets keep their last point
+    return np.concatenate(extreme_indexes)
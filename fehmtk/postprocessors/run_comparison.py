@@ -0,0 +1,273 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import hashlib
+import itertools
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from fehmtk.config import FilesConfig, RunConfig
+from fehmtk.fehm_objects import Zone
+from fehmtk.file_interface import iterate_fehm_coordinates, iterate_restart_block, read_zones
+from fehmtk.file_interface.restart import SUPPORTED_BLOCK_KINDS
+
+logger = logging.getLogger(__name__)
+
+TOTAL_ZONE = 'total'
+COMPARE_FIELDS = SUPPORTED_BLOCK_KINDS
+DEFAULT_FIELDS = ('temperature', 'pressure')
+
+
+@dataclass(frozen=True)
+class RunSnapshot:
+    """Final state of a run as float arrays by restart block, with a fingerprint of its grid. The coordinates and
+    material zones the fingerprint was computed from are kept only when requested (for the reference run)."""
+    config_file: Path
+    grid_fingerprint: str
+    values_by_field: dict[str, np.ndarray]
+    coordinates: Optional[np.ndarray] = None
+    material_zones: Optional[tuple[Zone, ...]] = None
+
+
+def compare_many_runs(
+    config_files: Sequence[Path],
+    output_file: Path,
+    reference: Optional[Path] = None,
+    pairwise: bool = False,
+    fields: Optional[Sequence[str]] = None,
+    zones: Optional[Sequence[Union[int, str]]] = None,
+    n_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Difference statistics between the final states of several runs on the same grid, e.g. a parameter sweep.
+
+    Each run is compared with the reference run (default: the first), or with every other run if pairwise. For each
+    comparison, field and material zone (plus a "total" zone of all nodes), reports the maximum absolute difference
+    (reference minus other, as in compare_runs), with the node and coordinates at which it occurs, and the root mean
+    square difference.
+
+    Restart files are read, and grids fingerprinted from their coordinates and zones, in n_workers processes (default:
+    one per run, up to the number of CPUs). Runs whose grid fingerprints differ from the first run are rejected.
+    """
+    config_files = [Path(config_file) for config_file in config_files]
+    if reference is not None:
+        reference = Path(reference)
+        config_files = [reference] + [config_file for config_file in config_files if config_file != reference]
+    if len(config_files) < 2:
+        raise ValueError(f'At least two runs are needed for comparison, got {len(config_files)}')
+    fields = list(fields or DEFAULT_FIELDS)
+    unknown_fields = set(fields) - set(COMPARE_FIELDS)
+    if unknown_fields:
+        raise ValueError(f'Unknown fields {unknown_fields}, expected any of {COMPARE_FIELDS}')
+    labels = _get_run_labels(config_files)
+
+    snapshots = load_run_snapshots(config_files, fields, n_workers=n_workers)
+    _validate_same_grid_fingerprints(snapshots, labels)
+
+    reference_snapshot = snapshots[0]
+    zone_names, row_zone_indexes, row_node_indexes = _get_zone_rows(
+        reference_snapshot.material_zones,
+        n_nodes=len(reference_snapshot.coordinates),
+        zones=zones,
+    )
+    if pairwise:
+        comparisons = list(itertools.combinations(range(len(snapshots)), 2))
+    else:
+        comparisons = [(0, i) for i in range(1, len(snapshots))]
+
+    rows = []
+    for reference_index, other_index in comparisons:
+        for field in fields:
+            difference = (
+                snapshots[reference_index].values_by_field[field] - snapshots[other_index].values_by_field[field]
+            )
+            statistics = get_zone_difference_statistics(difference, row_zone_indexes, row_node_indexes, len(zone_names))
+            for i, zone in enumerate(zone_names):
+                max_index = statistics['max_node_index'][i]
+                x, y, z = reference_snapshot.coordinates[max_index]
+                rows.append({
+                    'reference_run': labels[reference_index],
+                    'run': labels[other_index],
+                    'field': field,
+                    'zone': zone,
+                    'n_nodes': statistics['n_nodes'][i],
+                    'max_abs_difference': statistics['max_abs'][i],
+                    'max_difference': difference[max_index],
+                    'max_node': max_index + 1,
+                    'max_x': x,
+                    'max_y': y,
+                    'max_z': z,
+                    'rms_difference': statistics['rms'][i],
+                })
+
+    comparison = pd.DataFrame(rows)
+    _log_comparison_matrix(comparison, labels, fields)
+    logger.info('Writing output to: %s', output_file)
+    comparison.to_csv(output_file, index=False)
+    return comparison
+
+
+def load_run_snapshots(
+    config_files: Sequence[Path],
+    fields: Sequence[str],
+    n_workers: Optional[int] = None,
+) -> list[RunSnapshot]:
+    """Snapshots of runs in the order given, loaded in worker processes. The first snapshot keeps its grid data."""
+    n_workers = n_workers or min(len(config_files), os.cpu_count() or 1)
+    include_grid = [i == 0 for i in range(len(config_files))]
+    fields = [fields] * len(config_files)
+    if n_workers == 1:
+        return list(map(load_run_snapshot, config_files, fields, include_grid))
+
+    logger.info('Loading %d runs with %d worker processes', len(config_files), n_workers)
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(load_run_snapshot, config_files, fields, include_grid))
+
+
+def load_run_snapshot(config_file: Path, fields: Sequence[str], include_grid: bool = False) -> RunSnapshot:
+    config = RunConfig.from_yaml(Path(config_file))
+    files_config = config.files_config
+
+    logger.info('Reading state from restart file: %s', files_config.final_conditions)
+    values_by_field = {
+        field: np.fromiter(iterate_restart_block(files_config.final_conditions, field), dtype=float)
+        for field in fields
+    }
+
+    coordinates, material_zones, outside_zones = read_grid_data(files_config)
+    for field, values in values_by_field.items():
+        if values.size != len(coordinates):
+            raise ValueError(
+                f'Number of {field} values ({values.size}) does not match grid nodes ({len(coordinates)}) in '
+                f'{files_config.final_conditions}'
+            )
+
+    return RunSnapshot(
+        config_file=Path(config_file),
+        grid_fingerprint=get_grid_fingerprint(coordinates, material_zones, outside_zones),
+        values_by_field=values_by_field,
+        coordinates=coordinates if include_grid else None,
+        material_zones=material_zones if include_grid else None,
+    )
+
+
+def read_grid_data(files_config: FilesConfig) -> tuple[np.ndarray, tuple[Zone, ...], tuple[Zone, ...]]:
+    """Float node coordinates, material zones and outside zones of a run's grid, read without building a Grid."""
+    coordinates = np.array([coordinates for _, *coordinates in iterate_fehm_coordinates(files_config.grid)])
+    return coordinates, read_zones(files_config.material_zone), read_zones(files_config.outside_zone)
+
+
+def get_grid_fingerprint(
+    coordinates: np.ndarray,
+    material_zones: Sequence[Zone],
+    outside_zones: Sequence[Zone],
+) -> str:
+    """Digest of node coordinates and of the nodes in each zone by number, ignoring zone names and file formatting."""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(np.ascontiguousarray(coordinates, dtype=float).tobytes())
+    for zone_kind, zones in (('material', material_zones), ('outside', outside_zones)):
+        for zone in sorted(zones, key=lambda zone: zone.number):
+            hasher.update(f'{zone_kind}:{zone.number}:'.encode())
+            hasher.update(np.asarray(zone.data, dtype=np.int64).tobytes())
+    return hasher.hexdigest()
+
+
+def get_zone_difference_statistics(
+    difference: np.ndarray,
+    row_zone_indexes: np.ndarray,
+    row_node_indexes: np.ndarray,
+    n_zones: int,
+) -> dict[str, np.ndarray]:
+    """Maximum absolute difference (and the node index where it first occurs) and root mean square difference for
+    every zone at once, from rows of (zone index, node index) pairs sorted by zone. Every zone must have a node.
+    >>> statistics = get_zone_difference_statistics(
+    ...     difference=np.array([1., -4., 2., 3.]),
+    ...     row_zone_indexes=np.array([0, 0, 0, 1, 1]),
+    ...     row_node_indexes=np.array([0, 1, 2, 2, 3]),
+    ...     n_zones=2,
+    ... )
+    >>> statistics['max_abs'], statistics['max_node_index'], statistics['rms']
+    (array([4., 3.]), array([1, 3]), array([2.64575131, 2.54950976]))
+    """
+    n_nodes = np.bincount(row_zone_indexes, minlength=n_zones)
+    if np.any(n_nodes == 0):
+        raise ValueError('Cannot compute difference statistics for an empty zone')
+    starts = np.concatenate(([0], np.cumsum(n_nodes)[:-1]))
+
+    abs_difference = np.abs(difference[row_node_indexes])
+    max_abs = np.fmax.reduceat(abs_difference, starts)
+    row_indexes = np.arange(row_node_indexes.size)
+    max_rows = np.minimum.reduceat(
+        np.where(abs_difference == max_abs[row_zone_indexes], row_indexes, row_node_indexes.size),
+        starts,
+    )
+    max_rows = np.minimum(max_rows, starts + n_nodes - 1)  # zones of NaNs report their last node
+    return {
+        'n_nodes': n_nodes,
+        'max_abs': max_abs,
+        'max_node_index': row_node_indexes[max_rows],
+        'rms': np.sqrt(np.bincount(row_zone_indexes, weights=abs_difference ** 2, minlength=n_zones) / n_nodes),
+    }
+
+
+def _get_zone_rows(
+    material_zones: Sequence[Zone],
+    n_nodes: int,
+    zones: Optional[Sequence[Union[int, str]]] = None,
+) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """Zone names and (zone index, node index) rows for selected material zones (default: all), then all nodes as
+    "total"."""
+    zones_by_key = {}
+    for zone in sorted(material_zones, key=lambda zone: zone.number):
+        zones_by_key[zone.number] = zones_by_key[zone.name] = zone
+    if zones:
+        missing_zones = [zone for zone in zones if zone not in zones_by_key]
+        if missing_zones:
+            raise KeyError(f'Zones {missing_zones} not found in grid material_zones.')
+        selected_zones = [zones_by_key[zone] for zone in zones]
+    else:
+        selected_zones = sorted(material_zones, key=lambda zone: zone.number)
+
+    node_indexes_by_zone = {
+        str(zone.name or zone.number): np.asarray(zone.data, dtype=int) - 1 for zone in selected_zones
+    }
+    node_indexes_by_zone[TOTAL_ZONE] = np.arange(n_nodes)
+    row_zone_indexes = np.concatenate([
+        np.full(node_indexes.size, zone_index) for zone_index, node_indexes in enumerate(node_indexes_by_zone.values())
+    ])
+    return list(node_indexes_by_zone), row_zone_indexes, np.concatenate(list(node_indexes_by_zone.values()))
+
+
+def _get_run_labels(config_files: Sequence[Path]) -> list[str]:
+    """Run directory names, or full config paths if directory names are not unique."""
+    labels = [config_file.resolve().parent.name for config_file in config_files]
+    if len(set(labels)) < len(labels):
+        labels = [str(config_file) for config_file in config_files]
+    if len(set(labels)) < len(labels):
+        raise ValueError(f'Config files are not unique: {labels}')
+    return labels
+
+
+def _validate_same_grid_fingerprints(snapshots: Sequence[RunSnapshot], labels: Sequence[str]):
+    mismatched = [
+        label for snapshot, label in zip(snapshots, labels)
+        if snapshot.grid_fingerprint != snapshots[0].grid_fingerprint
+    ]
+    if mismatched:
+        raise ValueError(f'Grid coordinates or zones of runs {mismatched} differ from those of run {labels[0]}')
+
+
+def _log_comparison_matrix(comparison: pd.DataFrame, labels: Sequence[str], fields: Sequence[str]):
+    """Log the RMS difference over all nodes between each pair of runs compared, as a matrix per field."""
+    total = comparison[comparison.zone == TOTAL_ZONE]
+    for field in fields:
+        matrix = (
+            total[total.field == field]
+            .pivot(index='reference_run', columns='run', values='rms_difference')
+            .reindex(index=[label for label in labels if label in set(total.reference_run)])
+            .reindex(columns=[label for label in labels if label in set(total.run)])
+        )
+        logger.info('RMS difference in %s over all nodes:\n%s', field, matrix.to_string(float_format='%.6G'))
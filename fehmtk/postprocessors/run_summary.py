@@ -1,23 +1,64 @@
+from dataclasses import dataclass
 import logging
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Optional, Sequence, Union
 import warnings
 
 from IPython import embed
+import numpy as np
 import pandas as pd
 
 from fehmtk.config import RunConfig
-from fehmtk.fehm_objects import Node, Grid, Zone
+from fehmtk.fehm_objects import Grid, Zone
 from fehmtk.file_interface import read_grid, read_restart
+from .run_comparison import read_grid_data
 
 logger = logging.getLogger(__name__)
 
+STATE_FIELDS = ('temperature', 'pressure', 'saturation')
+COLUMNAR_SUFFIXES = ('.npz', '.parquet')
+
+
+@dataclass(frozen=True)
+class GridArrays:
+    """Array-backed view of a grid's nodes, indexed by node number - 1, for selecting many nodes at once.
+
+    Coordinates and depths keep their Decimal values (as object arrays). Zone membership is a boolean array of shape
+    (n_zones, n_nodes), with zones sorted by number.
+    """
+    coordinates: np.ndarray
+    depths: np.ndarray
+    material_zone_numbers: np.ndarray
+    material_zone_membership: np.ndarray
+    outside_zone_numbers: np.ndarray
+    outside_zone_membership: np.ndarray
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> 'GridArrays':
+        coordinates = np.empty((grid.n_nodes, 3), dtype=object)
+        depths = np.empty(grid.n_nodes, dtype=object)
+        for node in grid.nodes:
+            coordinates[node.number - 1] = node.coordinates.value
+            depths[node.number - 1] = node.depth
+        material_zone_numbers, material_zone_membership = _get_zone_membership(grid.material_zones, grid.n_nodes)
+        outside_zone_numbers, outside_zone_membership = _get_zone_membership(grid.outside_zones, grid.n_nodes)
+        return cls(
+            coordinates=coordinates,
+            depths=depths,
+            material_zone_numbers=material_zone_numbers,
+            material_zone_membership=material_zone_membership,
+            outside_zone_numbers=outside_zone_numbers,
+            outside_zone_membership=outside_zone_membership,
+        )
+
 
 def compare_runs(
     config_file: Path,
     compare_config_file: Path,
     output_file: Path,
     nodes: Optional[Sequence] = None,
+    material_zones: Optional[Sequence[Union[int, str]]] = None,
+    outside_zones: Optional[Sequence[Union[int, str]]] = None,
     interact: bool = False,
 ):
     grid, summary = _summarize_run(
@@ -25,13 +66,28 @@ def compare_runs(
         compare_config_file=compare_config_file,
         output_file=output_file,
         nodes=nodes,
+        material_zones=material_zones,
+        outside_zones=outside_zones,
     )
     if interact:
         embed()
 
 
-def summarize_run(config_file: Path, output_file: Path, nodes: Optional[Sequence] = None, interact: bool = False):
-    grid, summary = _summarize_run(config_file, output_file=output_file, nodes=nodes)
+def summarize_run(
+    config_file: Path,
+    output_file: Path,
+    nodes: Optional[Sequence] = None,
+    material_zones: Optional[Sequence[Union[int, str]]] = None,
+    outside_zones: Optional[Sequence[Union[int, str]]] = None,
+    interact: bool = False,
+):
+    grid, summary = _summarize_run(
+        config_file,
+        output_file=output_file,
+        nodes=nodes,
+        material_zones=material_zones,
+        outside_zones=outside_zones,
+    )
     if interact:
         embed()
 
@@ -41,15 +97,18 @@ def _summarize_run(
     *,
     output_file: Path,
     nodes: Optional[Sequence] = None,
+    material_zones: Optional[Sequence[Union[int, str]]] = None,
+    outside_zones: Optional[Sequence[Union[int, str]]] = None,
     compare_config_file: Optional[Path] = None,
 ) -> tuple[Grid, pd.DataFrame]:
+    """Summarize the final state at the union of nodes and all nodes in the selected zones (default: the monitored
+    nodes of the FEHM input file). Output is CSV, or columnar (.npz, .parquet) by the suffix of output_file."""
     logger.info('Reading configuration file: %s', config_file)
     config = RunConfig.from_yaml(config_file)
 
-    if not nodes:
+    if not (nodes or material_zones or outside_zones):
         logger.info('Reading monitored nodes from input file: %s', config.files_config.input)
         nodes = read_monitored_nodes_from_input(config.files_config.input)
-    nodes = sorted(nodes)
 
     logger.info('Parsing grid into memory from files in %s', config_file)
     grid = read_grid(
@@ -58,74 +117,179 @@ def _summarize_run(
         material_zone_file=config.files_config.material_zone,
         read_elements=False,
     )
+    node_numbers = get_selected_node_numbers(grid, nodes, material_zones, outside_zones)
+    node_indexes = node_numbers - 1
 
-    monitored = (
-        pd.DataFrame(data=[_dict_from_node(grid.node(i)) for i in nodes])
-    )
     logger.info('Reading state from restart file: %s', config.files_config.final_conditions)
     state, metadata = read_restart(config.files_config.final_conditions)
+    values_by_field = _get_state_values(state, node_indexes)
 
+    grid_arrays = GridArrays.from_grid(grid)
     if compare_config_file:
         logger.info('Reading configuration file: %s', compare_config_file)
         compare_config_file = RunConfig.from_yaml(compare_config_file)
-        _validate_same_grids(grid, compare_config_file)
+        _validate_same_grids(grid, grid_arrays, compare_config_file)
 
         logger.info('Reading state from restart file: %s', compare_config_file.files_config.final_conditions)
         other_state, other_metadata = read_restart(compare_config_file.files_config.final_conditions)
-        state = state - other_state
+        if len(other_state.temperature) != len(state.temperature):
+            raise ValueError(
+                f'Incompatible states, number of nodes not equal ({len(state.temperature)} != '
+                f'{len(other_state.temperature)})'
+            )
+        other_values_by_field = _get_state_values(other_state, node_indexes)
+        for field, values in values_by_field.items():
+            other_values = other_values_by_field[field]
+            values_by_field[field] = None if values is None or other_values is None else values - other_values
 
-    monitored_indexes = [i - 1 for i in nodes]
-    monitored['temperature'] = [state.temperature[i] for i in monitored_indexes]
-    monitored['pressure'] = [state.pressure[i] for i in monitored_indexes]
-    monitored['saturation'] = [state.saturation[i] for i in monitored_indexes]
-    monitored['material_zones'] = _get_zones_for_nodes(nodes, grid.material_zones)
-    monitored['outside_zones'] = _get_zones_for_nodes(nodes, grid.outside_zones)
+    if Path(output_file).suffix in COLUMNAR_SUFFIXES:
+        summary = _get_columnar_summary(grid_arrays, node_numbers, values_by_field)
+    else:
+        summary = _get_summary(grid_arrays, node_numbers, values_by_field)
 
-    logger.info('Writing output to: %s', output_file)
-    monitored.to_csv(output_file, index=False)
-    return grid, monitored
+    logger.info('Writing %d nodes to: %s', len(summary), output_file)
+    write_node_table(summary, output_file)
+    return grid, summary
 
 
-def _dict_from_node(node: Node) -> dict:
-    return {'node': node.number, 'x': node.x, 'y': node.y, 'z': node.z, 'depth': node.depth}
+def get_selected_node_numbers(
+    grid: Grid,
+    nodes: Optional[Sequence[int]] = None,
+    material_zones: Optional[Sequence[Union[int, str]]] = None,
+    outside_zones: Optional[Sequence[Union[int, str]]] = None,
+) -> np.ndarray:
+    """Sorted, unique node numbers from nodes and all nodes in the given material and outside zones."""
+    node_numbers = [np.asarray(list(nodes or []), dtype=int)]
+    node_numbers.extend(grid.get_node_numbers_in_material_zone(zone) for zone in material_zones or [])
+    node_numbers.extend(grid.get_node_numbers_in_outside_zone(zone) for zone in outside_zones or [])
+    node_numbers = np.unique(np.concatenate(node_numbers))
+    if node_numbers.size and (node_numbers[0] < 1 or node_numbers[-1] > grid.n_nodes):
+        grid.validate_contains_node_numbers(node_numbers.tolist())
+    return node_numbers
 
 
-def _get_zones_for_nodes(nodes: list[int], zones: set[Zone]) -> list[int]:
-    zone_lookup = {zone.number: set(zone.data) for zone in zones}
-    return [
-        [zone_number for zone_number, zone_nodes in zone_lookup.items() if node in zone_nodes]
-        for node in nodes
-    ]
+def write_node_table(table: pd.DataFrame, output_file: Path):
+    """Write a table of nodes as CSV, or as columnar binary by suffix: .npz (an array per column) or .parquet (which
+    requires pyarrow or fastparquet)."""
+    suffix = Path(output_file).suffix
+    if suffix == '.npz':
+        with open(output_file, 'wb') as f:
+            np.savez(f, **{column: table[column].to_numpy() for column in table.columns})
+    elif suffix == '.parquet':
+        table.to_parquet(output_file, index=False)
+    else:
+        table.to_csv(output_file, index=False)
 
 
-def _validate_same_grids(grid: Grid, other_config: RunConfig):
-    logger.info('Parsing grid into memory from files in compare config')
-    other_grid = read_grid(
-        other_config.files_config.grid,
-        outside_zone_file=other_config.files_config.outside_zone,
-        material_zone_file=other_config.files_config.material_zone,
-        read_elements=False,
+def _get_summary(
+    grid_arrays: GridArrays,
+    node_numbers: np.ndarray,
+    values_by_field: dict[str, Optional[np.ndarray]],
+) -> pd.DataFrame:
+    """Summary of nodes with Decimal values as read, and lists of the zones containing each node."""
+    node_indexes = node_numbers - 1
+    coordinates = grid_arrays.coordinates[node_indexes]
+    summary = pd.DataFrame({
+        'node': node_numbers,
+        'x': coordinates[:, 0],
+        'y': coordinates[:, 1],
+        'z': coordinates[:, 2],
+        'depth': grid_arrays.depths[node_indexes],
+        **values_by_field,
+    })
+    summary['material_zones'] = _get_zone_lists(
+        grid_arrays.material_zone_numbers,
+        grid_arrays.material_zone_membership[:, node_indexes],
+    )
+    summary['outside_zones'] = _get_zone_lists(
+        grid_arrays.outside_zone_numbers,
+        grid_arrays.outside_zone_membership[:, node_indexes],
     )
-    if grid.n_nodes != other_grid.n_nodes:
-        raise ValueError(f'Grids have differing number of nodes: {grid.n_nodes} != {other_grid.n_nodes}')
-    for zone in grid.material_zones:
-        try:
-            other_zone = other_grid.get_material_zone(zone.number)
-        except KeyError:
-            warnings.warn('Material zone not present in other grid: %d', zone.number)
-            continue
-
-        if zone.data != other_zone.data:
-            raise ValueError(f'Grids have differing nodes in material zone: {zone.number}')
-    for zone in grid.outside_zones:
-        try:
-            other_zone = other_grid.get_outside_zone(zone.number)
-        except KeyError:
-            warnings.warn('Outside zone not present in other grid: %d', zone.number)
-            continue
-
-        if zone.data != other_grid.get_outside_zone(zone.number).data:
-            raise ValueError(f'Grids have differing nodes in outside zone: {zone.number}')
+    return summary
+
+
+def _get_columnar_summary(
+    grid_arrays: GridArrays,
+    node_numbers: np.ndarray,
+    values_by_field: dict[str, Optional[np.ndarray]],
+) -> pd.DataFrame:
+    """Summary of nodes with float values, and a boolean column per zone (e.g. material_zone_1) for membership."""
+    node_indexes = node_numbers - 1
+    coordinates = _as_float(grid_arrays.coordinates[node_indexes])
+    columns = {
+        'node': node_numbers,
+        'x': coordinates[:, 0],
+        'y': coordinates[:, 1],
+        'z': coordinates[:, 2],
+        'depth': _as_float(grid_arrays.depths[node_indexes]),
+    }
+    for field, values in values_by_field.items():
+        columns[field] = _as_float(values if values is not None else np.full(node_numbers.size, None))
+    for zone_kind, zone_numbers, membership in (
+        ('material_zone', grid_arrays.material_zone_numbers, grid_arrays.material_zone_membership),
+        ('outside_zone', grid_arrays.outside_zone_numbers, grid_arrays.outside_zone_membership),
+    ):
+        for zone_number, zone_membership in zip(zone_numbers, membership):
+            columns[f'{zone_kind}_{zone_number}'] = zone_membership[node_indexes]
+    return pd.DataFrame(columns)
+
+
+def _get_state_values(state, node_indexes: np.ndarray) -> dict[str, Optional[np.ndarray]]:
+    values_by_field = {}
+    for field in STATE_FIELDS:
+        values = getattr(state, field)
+        values_by_field[field] = None if values is None else np.asarray(values, dtype=object)[node_indexes]
+    return values_by_field
+
+
+def _get_zone_membership(zones: set[Zone], n_nodes: int) -> tuple[np.ndarray, np.ndarray]:
+    zones = sorted(zones, key=lambda zone: zone.number)
+    membership = np.zeros((len(zones), n_nodes), dtype=bool)
+    for zone_index, zone in enumerate(zones):
+        membership[zone_index, np.asarray(zone.data, dtype=int) - 1] = True
+    return np.array([zone.number for zone in zones], dtype=int), membership
+
+
+def _get_zone_lists(zone_numbers: np.ndarray, membership: np.ndarray) -> list[list[int]]:
+    """Zone numbers containing each node, from membership of shape (n_zones, n_nodes).
+    >>> _get_zone_lists(np.array([1, 3]), np.array([[True, False, True], [True, False, False]]))
+    [[1, 3], [], [1]]
+    """
+    if not membership.shape[1]:
+        return []
+    node_positions, zone_positions = np.nonzero(membership.T)
+    split_positions = np.searchsorted(node_positions, np.arange(1, membership.shape[1]))
+    zone_lists = np.split(zone_numbers[zone_positions], split_positions)
+    return [zone_list.tolist() for zone_list in zone_lists]
+
+
+def _as_float(values: np.ndarray) -> np.ndarray:
+    """Decimal (or None) object arrays as floats, with None as NaN."""
+    return np.where(pd.isna(values), np.nan, values).astype(float)
+
+
+def _validate_same_grids(grid: Grid, grid_arrays: GridArrays, other_config: RunConfig):
+    """Compare the other run's coordinates and zones, read without building a Grid, with the grid in memory. Zones
+    missing from the other grid only warn."""
+    other_coordinates, other_material_zones, other_outside_zones = read_grid_data(other_config.files_config)
+    if grid.n_nodes != len(other_coordinates):
+        raise ValueError(f'Grids have differing number of nodes: {grid.n_nodes} != {len(other_coordinates)}')
+    if not np.array_equal(grid_arrays.coordinates.astype(float), other_coordinates):
+        raise ValueError('Grids have differing node coordinates')
+
+    for zone_kind, zones, other_zones in (
+        ('Material', grid.material_zones, other_material_zones),
+        ('Outside', grid.outside_zones, other_outside_zones),
+    ):
+        other_zones_by_number = {zone.number: zone for zone in other_zones}
+        for zone in zones:
+            other_zone = other_zones_by_number.get(zone.number)
+            if other_zone is None:
+                warnings.warn(f'{zone_kind} zone not present in other grid: {zone.number}')
+                continue
+
+            if tuple(zone.data) != tuple(other_zone.data):
+                raise ValueError(f'Grids have differing nodes in {zone_kind.lower()} zone: {zone.number}')
 
 
 def read_monitored_nodes_from_input(input_file: Path) -> set[int]:
@@ -0,0 +1,146 @@
+import logging
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from fehmtk.config import RunConfig
+from fehmtk.fehm_objects import Grid
+from fehmtk.file_interface import read_avs_columns, read_compact_node_array, read_grid, read_storage_coefficients
+
+logger = logging.getLogger(__name__)
+
+TOTAL_ZONE = 'total'
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+QUANTILES = (0.5, 0.9, 0.99)
+POROSITY_COLUMN = 2  # rock properties are density, specific heat, porosity
+
+
+def summarize_velocities(
+    config_file: Path,
+    output_file: Path,
+    state_files: Optional[Sequence[Path]] = None,
+    zones: Optional[Sequence[Union[int, str]]] = None,
+) -> pd.DataFrame:
+    """Summarize pore water velocities (Darcy flux over porosity) by material zone, for one or more snapshots.
+
+    Snapshots are AVS vector files holding liquid volume flux (default: every <run_root>.*_vec_node.avs beside the
+    grid). For each snapshot and zone, reports the maximum speed (with its node and velocity), the volume-weighted mean
+    speed and volume-weighted quantiles of speed, in m/yr. A "total" row summarizes all nodes.
+    """
+    logger.info('Reading configuration file: %s', config_file)
+    config = RunConfig.from_yaml(config_file)
+    files_config = config.files_config
+
+    logger.info('Parsing grid into memory')
+    grid = read_grid(files_config.grid, material_zone_file=files_config.material_zone, read_elements=False)
+    if not zones:
+        zones = [zone.name or zone.number for zone in sorted(grid.material_zones, key=lambda zone: zone.number)]
+    if not state_files:
+        state_files = sorted(files_config.grid.parent.glob(f'{files_config.run_root}.*_vec_node.avs'))
+        if not state_files:
+            raise ValueError(f'No AVS vector files found for {files_config.run_root} in {files_config.grid.parent}')
+
+    logger.info('Reading volumes from %s', files_config.storage)
+    volumes = read_storage_coefficients(files_config.storage).volumes
+    logger.info('Reading porosity from %s', files_config.rock_properties)
+    porosity = read_compact_node_array(files_config.rock_properties, grid.n_nodes)[:, POROSITY_COLUMN]
+
+    zone_names, row_zone_indexes, row_node_indexes = _get_zone_rows(grid, zones)
+
+    rows = []
+    for state_file in state_files:
+        logger.info('Reading liquid volume flux from %s', state_file)
+        columns = read_avs_columns(state_file)
+        if 'volume_flux' not in columns:
+            raise KeyError(f'No liquid volume flux in AVS file {state_file}')
+        if len(columns['volume_flux']) != grid.n_nodes:
+            raise ValueError(
+                f'Number of fluxes ({len(columns["volume_flux"])}) does not match grid nodes ({grid.n_nodes})'
+            )
+
+        velocity = columns['volume_flux'] / porosity[:, np.newaxis] * SECONDS_PER_YEAR
+        speed = np.linalg.norm(velocity, axis=1)
+        statistics = get_zone_speed_statistics(speed, volumes, row_zone_indexes, row_node_indexes, len(zone_names))
+
+        for i, zone in enumerate(zone_names):
+            max_index = statistics['max_node_index'][i]
+            row = {
+                'state_file': Path(state_file).name,
+                'zone': zone,
+                'max_speed_m_per_yr': statistics['max'][i],
+                'max_speed_node': max_index + 1,
+                'max_vx_m_per_yr': velocity[max_index, 0],
+                'max_vy_m_per_yr': velocity[max_index, 1],
+                'max_vz_m_per_yr': velocity[max_index, 2],
+                'mean_speed_m_per_yr': statistics['mean'][i],
+            }
+            for quantile, values in zip(QUANTILES, statistics['quantiles']):
+                row[f'p{quantile * 100:g}_speed_m_per_yr'] = values[i]
+            rows.append(row)
+        logger.info('%s: max speed %.6G m/yr', Path(state_file).name, speed.max())
+
+    summary = pd.DataFrame(rows)
+    logger.info('Writing output to: %s', output_file)
+    summary.to_csv(output_file, index=False)
+    return summary
+
+
+def get_zone_speed_statistics(
+    speed: np.ndarray,
+    volumes: np.ndarray,
+    row_zone_indexes: np.ndarray,
+    row_node_indexes: np.ndarray,
+    n_zones: int,
+) -> dict[str, np.ndarray]:
+    """Maximum, volume-weighted mean and volume-weighted quantiles of speed for every zone at once, from rows of
+    (zone index, node index) pairs sorted by zone. Zones may overlap; every zone must have at least one node.
+    >>> statistics = get_zone_speed_statistics(
+    ...     speed=np.array([1., 4., 2., 3.]),
+    ...     volumes=np.array([1., 1., 2., 1.]),
+    ...     row_zone_indexes=np.array([0, 0, 0, 1, 1]),
+    ...     row_node_indexes=np.array([0, 1, 2, 2, 3]),
+    ...     n_zones=2,
+    ... )
+    >>> statistics['max'], statistics['max_node_index'], statistics['mean']
+    (array([4., 3.]), array([1, 3]), array([2.25      , 2.33333333]))
+    >>> statistics['quantiles'][0]
+    array([2., 2.])
+    """
+    zone_speed = speed[row_node_indexes]
+    order = np.lexsort((zone_speed, row_zone_indexes))
+    sorted_zones = row_zone_indexes[order]
+    sorted_speed = zone_speed[order]
+    sorted_volumes = volumes[row_node_indexes][order]
+
+    zone_indexes = np.arange(n_zones)
+    starts = np.searchsorted(sorted_zones, zone_indexes, side='left')
+    ends = np.searchsorted(sorted_zones, zone_indexes, side='right')
+    if np.any(starts == ends):
+        raise ValueError('Cannot compute speed statistics for an empty zone')
+
+    total_volumes = np.bincount(sorted_zones, weights=sorted_volumes, minlength=n_zones)
+    cumulative_volumes = np.cumsum(sorted_volumes)
+    preceding_volumes = np.concatenate(([0.], cumulative_volumes))[starts]
+    quantiles = []
+    for quantile in QUANTILES:
+        indexes = np.searchsorted(cumulative_volumes, preceding_volumes + quantile * total_volumes, side='left')
+        quantiles.append(sorted_speed[np.clip(indexes, starts, ends - 1)])
+
+    return {
+        'max': sorted_speed[ends - 1],
+        'max_node_index': row_node_indexes[order][ends - 1],
+        'mean': np.bincount(sorted_zones, weights=sorted_speed * sorted_volumes, minlength=n_zones) / total_volumes,
+        'quantiles': quantiles,
+    }
+
+
+def _get_zone_rows(grid: Grid, zones: Sequence[Union[int, str]]) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """Zone names and (zone index, node index) rows for each material zone, then all nodes as "total"."""
+    node_indexes_by_zone = {str(zone): grid.get_node_numbers_in_material_zone(zone) - 1 for zone in zones}
+    node_indexes_by_zone[TOTAL_ZONE] = np.arange(grid.n_nodes)
+    row_zone_indexes = np.concatenate([
+        np.full(node_indexes.size, zone_index) for zone_index, node_indexes in enumerate(node_indexes_by_zone.values())
+    ])
+    return list(node_indexes_by_zone), row_zone_indexes, np.concatenate(list(node_indexes_by_zone.values()))
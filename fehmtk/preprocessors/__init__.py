@@ -1,3 +1,4 @@
 from .boundaries import generate_flow_boundaries, generate_heat_flux_boundaries
 from .hydrostatic_pressure import generate_hydrostatic_pressure
-from .rock_properties import generate_rock_properties
+from .numeric_mode_comparison import compare_numeric_modes
+from .rock_properties import DEPTH_EVALUATIONS, generate_rock_properties
@@ -0,0 +1,189 @@
+import itertools
+import logging
+from typing import Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveColumnLookup:
+    """Lookup interpolating column values sampled on an adaptively refined (binary tree or quadtree) grid.
+
+    Each leaf cell holds the columns sampled at its corners. Points are interpolated (bi)linearly between the corner
+    columns of the leaf containing them, and linearly between the z targets of each column.
+    """
+
+    def __init__(
+        self,
+        *,
+        lower: np.ndarray,
+        base_spacing: np.ndarray,
+        n_base_cells: int,
+        z_targets: np.ndarray,
+        columns: np.ndarray,
+        leaves: list[tuple[int, tuple[int], tuple[int]]],
+    ):
+        self.lower = lower
+        self.base_spacing = base_spacing
+        self.n_base_cells = n_base_cells
+        self.z_targets = z_targets
+        self.columns = columns
+
+        self._leaf_levels = np.array([level for level, _, _ in leaves])
+        self._leaf_indexes = np.array([index for _, index, _ in leaves])
+        self._leaf_corners = np.array([corners for _, _, corners in leaves])
+        self._leaf_codes_by_level = {}
+        for level in np.unique(self._leaf_levels):
+            leaf_ids = np.flatnonzero(self._leaf_levels == level)
+            codes = self._codes(self._leaf_indexes[leaf_ids], level)
+            order = np.argsort(codes)
+            self._leaf_codes_by_level[level] = (codes[order], leaf_ids[order])
+
+    @property
+    def n_columns(self) -> int:
+        return len(self.columns)
+
+    @property
+    def n_leaves(self) -> int:
+        return len(self._leaf_levels)
+
+    def __call__(self, coordinates: np.ndarray) -> np.ndarray:
+        horizontal, z = coordinates[:, :-1].astype(float), coordinates[:, -1].astype(float)
+        leaf_ids = self._find_leaves(horizontal)
+
+        spacing = self.base_spacing / 2 ** self._leaf_levels[leaf_ids][:, np.newaxis]
+        cell_lower = self.lower + self._leaf_indexes[leaf_ids] * spacing
+        t = np.clip((horizontal - cell_lower) / spacing, 0, 1)
+
+        k = np.clip(np.searchsorted(self.z_targets, z, side='right') - 1, 0, len(self.z_targets) - 2)
+        f = np.clip((z - self.z_targets[k]) / (self.z_targets[k + 1] - self.z_targets[k]), 0, 1)
+
+        values = np.zeros(len(coordinates))
+        for corner_number, offset in enumerate(_corner_offsets(horizontal.shape[1])):
+            weight = np.prod(np.where(offset, t, 1 - t), axis=1)
+            corner_columns = self._leaf_corners[leaf_ids, corner_number]
+            values += weight * (self.columns[corner_columns, k] * (1 - f) + self.columns[corner_columns, k + 1] * f)
+        return values
+
+    def _find_leaves(self, horizontal: np.ndarray) -> np.ndarray:
+        leaf_ids = np.full(len(horizontal), -1)
+        for level, (leaf_codes, level_leaf_ids) in sorted(self._leaf_codes_by_level.items()):
+            unresolved = np.flatnonzero(leaf_ids < 0)
+            if not len(unresolved):
+                break
+
+            n_cells = self.n_base_cells * 2 ** level
+            indexes = _get_cell_indexes(horizontal[unresolved], self.lower, self.base_spacing / 2 ** level, n_cells)
+            codes = self._codes(indexes, level)
+            positions = np.clip(np.searchsorted(leaf_codes, codes), 0, len(leaf_codes) - 1)
+            found = leaf_codes[positions] == codes
+            leaf_ids[unresolved[found]] = level_leaf_ids[positions[found]]
+
+        if (leaf_ids < 0).any():
+            raise ValueError(f'No adaptive sampling cell found for {(leaf_ids < 0).sum()} points.')
+        return leaf_ids
+
+    def _codes(self, indexes: np.ndarray, level: int) -> np.ndarray:
+        n_cells = self.n_base_cells * 2 ** level
+        return np.ravel_multi_index(tuple(indexes.T), dims=indexes.shape[1] * (n_cells,))
+
+
+def sample_columns_adaptively(
+    *,
+    horizontal_coordinates: np.ndarray,
+    z_targets: np.ndarray,
+    solve_column: Callable[[np.ndarray], np.ndarray],
+    initial_samples: int,
+    tolerance: float,
+    max_refinement_level: int,
+) -> AdaptiveColumnLookup:
+    """Sample columns on a grid refined wherever interpolation misses an explicit solve by more than `tolerance`.
+
+    The horizontal extent of `horizontal_coordinates` is covered by a regular grid of `initial_samples` columns per
+    dimension. Each cell containing points is checked by solving the column at its center and comparing the result to
+    the mean of its corner columns. Cells failing the check are split in two (1D) or four (2D), up to
+    `max_refinement_level` times.
+    """
+    n_dimensions = horizontal_coordinates.shape[1]
+    n_base_cells = initial_samples - 1
+    lower = horizontal_coordinates.min(axis=0).astype(float)
+    upper = horizontal_coordinates.max(axis=0).astype(float)
+    base_spacing = (upper - lower) / n_base_cells
+    finest_spacing = base_spacing / 2 ** max_refinement_level
+
+    columns = []
+    column_number_by_vertex = {}
+
+    def get_column_number(level: int, vertex: tuple[int]) -> int:
+        finest_vertex = tuple(v * 2 ** (max_refinement_level - level) for v in vertex)
+        if finest_vertex not in column_number_by_vertex:
+            columns.append(solve_column(lower + np.array(finest_vertex) * finest_spacing))
+            column_number_by_vertex[finest_vertex] = len(columns) - 1
+        return column_number_by_vertex[finest_vertex]
+
+    leaves = []
+    cells = list(itertools.product(range(n_base_cells), repeat=n_dimensions))
+    for level in range(max_refinement_level + 1):
+        logger.info('Checking %d cells at refinement level %d', len(cells), level)
+        occupied_cells = set(map(tuple, np.unique(
+            _get_cell_indexes(horizontal_coordinates, lower, base_spacing / 2 ** level, n_base_cells * 2 ** level),
+            axis=0,
+        )))
+
+        cells_to_refine = []
+        for cell in cells:
+            corners = tuple(
+                get_column_number(level, tuple(i + d for i, d in zip(cell, offset)))
+                for offset in _corner_offsets(n_dimensions)
+            )
+            if level == max_refinement_level or cell not in occupied_cells:
+                leaves.append((level, cell, corners))
+                continue
+
+            center = get_column_number(level + 1, tuple(2 * i + 1 for i in cell))
+            interpolated = np.mean([columns[c] for c in corners], axis=0)
+            if np.abs(columns[center] - interpolated).max() > tolerance:
+                cells_to_refine.append(cell)
+            else:
+                leaves.append((level, cell, corners))
+
+        if not cells_to_refine:
+            break
+        cells = [
+            tuple(2 * i + d for i, d in zip(cell, offset))
+            for cell in cells_to_refine
+            for offset in _corner_offsets(n_dimensions)
+        ]
+
+    finest_level = max(level for level, _, _ in leaves)
+    logger.info(
+        'Adaptive sampling solved %d columns (%d at equivalent regular spacing), %d cells to refinement level %d',
+        len(columns),
+        (n_base_cells * 2 ** finest_level + 1) ** n_dimensions,
+        len(leaves),
+        finest_level,
+    )
+    return AdaptiveColumnLookup(
+        lower=lower,
+        base_spacing=base_spacing,
+        n_base_cells=n_base_cells,
+        z_targets=z_targets,
+        columns=np.array(columns),
+        leaves=leaves,
+    )
+
+
+def _get_cell_indexes(horizontal: np.ndarray, lower: np.ndarray, spacing: np.ndarray, n_cells: int) -> np.ndarray:
+    indexes = np.floor((horizontal.astype(float) - lower) / spacing).astype(int)
+    return np.clip(indexes, 0, n_cells - 1)
+
+
+def _corner_offsets(n_dimensions: int) -> list[tuple[int]]:
+    """Offsets of cell corners from the lower corner, in a consistent order.
+    >>> _corner_offsets(1)
+    [(0,), (1,)]
+    >>> _corner_offsets(2)
+    [(0, 0), (0, 1), (1, 0), (1, 1)]
+    """
+    return list(itertools.product((0, 1), repeat=n_dimensions))
@@ -1,23 +1,50 @@
-from decimal import Decimal
+from dataclasses import dataclass
 import logging
 from pathlib import Path
 import re
-from typing import Union
+from typing import Optional, Union
 import warnings
 
-from matplotlib import cm, colors, pyplot as plt
-import pandas as pd
-from scipy.spatial import Voronoi, voronoi_plot_2d
+from matplotlib import colors, pyplot as plt
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+import numpy as np
+from scipy.spatial import Voronoi
 
 from fehmtk.config import BoundaryConfig, FlowConfig, HeatFluxConfig, RunConfig
-from fehmtk.fehm_objects import Grid, Node
-from fehmtk.file_interface import read_grid, write_compact_node_data
+from fehmtk.fehm_objects import Grid
+from fehmtk.file_interface import read_grid, write_compact_node_array
 
-from .boundary_models import get_boundary_model
+from .boundary_models import get_boundary_model, validate_boundary_model
 
 
 logger = logging.getLogger(__name__)
 
+VORONOI_MAX_POINTS = 20_000
+
+
+@dataclass(frozen=True)
+class BoundaryNodeArrays:
+    """Object arrays of (n_nodes, 3) coordinates, (n_nodes, 3) outside areas and (n_nodes,) volumes of all nodes, by
+    node number - 1, with None where not read. Built in one pass over the grid, then indexed by each boundary."""
+    coordinates: np.ndarray
+    outside_areas: np.ndarray
+    volumes: np.ndarray
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> 'BoundaryNodeArrays':
+        nodes = list(grid.nodes)
+        node_indexes = np.fromiter((node.number - 1 for node in nodes), dtype=int, count=len(nodes))
+        coordinates = np.empty((grid.n_nodes, 3), dtype=object)
+        coordinates[node_indexes] = [node.coordinates.value for node in nodes]
+        outside_areas = np.full((grid.n_nodes, 3), None, dtype=object)
+        outside_areas[node_indexes] = [
+            node.outside_area.value if node.outside_area is not None else (None, None, None) for node in nodes
+        ]
+        volumes = np.empty(grid.n_nodes, dtype=object)
+        volumes[node_indexes] = [node.volume for node in nodes]
+        return cls(coordinates=coordinates, outside_areas=outside_areas, volumes=volumes)
+
 
 def generate_flow_boundaries(config_file: Path):
     logger.info(f'Reading configuration file: {config_file}')
@@ -37,13 +64,14 @@ def generate_flow_boundaries(config_file: Path):
     )
 
     logger.info('Generating flow data')
-    flow_by_node = generate_boundary_data_by_node_number(
+    node_numbers, flow = generate_boundary_data(
         grid,
         boundary_configs=config.flow_config.boundary_configs,
         boundary_kind='flow',
     )
-    write_compact_node_data(
-        flow_by_node,
+    write_compact_node_array(
+        node_numbers,
+        flow,
         output_file=config.files_config.flow,
         header='flow\n',
         footer='0\n',
@@ -52,7 +80,12 @@ def generate_flow_boundaries(config_file: Path):
     warn_if_file_not_referenced(input_file=config.files_config.input, referenced_file=config.files_config.flow)
 
 
-def generate_heat_flux_boundaries(config_file: Path, plot: bool = False):
+def generate_heat_flux_boundaries(
+    config_file: Path,
+    plot: bool = False,
+    plot_file: Optional[Path] = None,
+    plot_max_points: Optional[int] = None,
+):
     logger.info(f'Reading configuration file: {config_file}')
     config = RunConfig.from_yaml(config_file)
     if not config.files_config.heat_flux:
@@ -60,6 +93,7 @@ def generate_heat_flux_boundaries(config_file: Path, plot: bool = False):
 
     _validate_config(config.heat_flux_config)
 
+    plot = plot or plot_file is not None
     if plot and len(config.heat_flux_config.boundary_configs) > 1:
         raise NotImplementedError('No support for plotting when multiple boundary_configs are present.')
 
@@ -72,15 +106,18 @@ def generate_heat_flux_boundaries(config_file: Path, plot: bool = False):
     )
 
     logger.info('Computing boundary heat flux')
-    heatflux_by_node = generate_boundary_data_by_node_number(
+    node_arrays = BoundaryNodeArrays.from_grid(grid)
+    node_numbers, heatflux = generate_boundary_data(
         grid,
         boundary_configs=config.heat_flux_config.boundary_configs,
         boundary_kind='heat_flux',
+        node_arrays=node_arrays,
     )
 
     logger.info(f'Writing heat flux to disk: {config.files_config.heat_flux}')
-    write_compact_node_data(
-        {node_number: (heatflux, '0.') for node_number, heatflux in heatflux_by_node.items()},
+    write_compact_node_array(
+        node_numbers,
+        np.column_stack((heatflux, np.full(len(heatflux), '0.', dtype=object))),
         output_file=config.files_config.heat_flux,
         header='hflx\n',
         footer='0\n',
@@ -88,32 +125,54 @@ def generate_heat_flux_boundaries(config_file: Path, plot: bool = False):
     warn_if_file_not_referenced(input_file=config.files_config.input, referenced_file=config.files_config.heat_flux)
 
     if plot:
-        plot_heatflux(heatflux_by_node, grid)
+        plot_heatflux(node_numbers, heatflux, node_arrays, output_file=plot_file, max_points=plot_max_points)
 
 
-def generate_boundary_data_by_node_number(
+def generate_boundary_data(
     grid: Grid,
     *,
     boundary_configs: list[BoundaryConfig],
     boundary_kind: str,
-) -> dict[int, float]:
-    flow_data_by_number = {}
+    node_arrays: Optional[BoundaryNodeArrays] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Sorted numbers of the boundary nodes, and their values (an (n,) or (n, k) object array). Each boundary config's
+    model is evaluated on all of its nodes at once; later configs take precedence for nodes in more than one config.
+    node_arrays (default: built from the grid) can be passed to reuse them, e.g. for plotting."""
+    node_arrays = node_arrays or BoundaryNodeArrays.from_grid(grid)
+    node_values = None
+    has_value = np.zeros(grid.n_nodes, dtype=bool)
     for boundary_config in boundary_configs:
+        validate_boundary_model(boundary_kind, boundary_config.boundary_model)
         model = get_boundary_model(boundary_kind, boundary_config.boundary_model.kind)
-        nodes = _gather_nodes(grid, boundary_config.outside_zones, boundary_config.material_zones)
-        for node in nodes:
-            flow_data_by_number[node.number] = model(node, boundary_config.boundary_model.params)
-
-    return flow_data_by_number
-
-
-def _gather_nodes(grid: Grid, outside_zones: list[Union[str, int]], material_zones: list[Union[str, int]]) -> set[Node]:
-    nodes = set()
+        node_indexes = _gather_node_numbers(grid, boundary_config.outside_zones, boundary_config.material_zones) - 1
+        values = model(
+            node_arrays.coordinates[node_indexes],
+            node_arrays.outside_areas[node_indexes],
+            node_arrays.volumes[node_indexes],
+            boundary_config.boundary_model.params,
+        )
+        if node_values is None:
+            node_values = np.empty((grid.n_nodes, *values.shape[1:]), dtype=object)
+        node_values[node_indexes] = values
+        has_value[node_indexes] = True
+
+    if node_values is None:
+        return np.empty(0, dtype=int), np.empty(0, dtype=object)
+    return np.flatnonzero(has_value) + 1, node_values[has_value]
+
+
+def _gather_node_numbers(
+    grid: Grid,
+    outside_zones: list[Union[str, int]],
+    material_zones: list[Union[str, int]],
+) -> np.ndarray:
+    """Sorted numbers of the nodes in any of the zones, each included once."""
+    node_numbers = np.empty(0, dtype=int)
     for zone in outside_zones:
-        nodes.update(grid.get_nodes_in_outside_zone(zone))
+        node_numbers = np.union1d(node_numbers, grid.get_node_numbers_in_outside_zone(zone))
     for zone in material_zones:
-        nodes.update(grid.get_nodes_in_material_zone(zone))
-    return nodes
+        node_numbers = np.union1d(node_numbers, grid.get_node_numbers_in_material_zone(zone))
+    return node_numbers
 
 
 def warn_if_file_not_referenced(*, input_file: Path, referenced_file: Path):
@@ -132,64 +191,123 @@ def _validate_config(config: Union[FlowConfig, HeatFluxConfig]):
             raise ValueError('No zones specified (outside or material), at least one zone is required.')
 
 
-def plot_heatflux(heatflux_by_node: dict[int, Decimal], grid: Grid):
-    entries = []
-    for node_number, heatflux_MW in heatflux_by_node.items():
-        node = grid.node(node_number)
-        entries.append({
-            'x': node.x / 1E3,  # convert m -> km
-            'y': node.y / 1E3,  # convert m -> km
-            'heatflux_mW': 1E9 * heatflux_MW / node.outside_area.z,  # convert to MW -> mW
-        })
-    plot_data = pd.DataFrame(entries)
-
-    axis_2d = _get_2d_axis_or_none(plot_data)
+def plot_heatflux(
+    node_numbers: np.ndarray,
+    heatflux: np.ndarray,
+    node_arrays: BoundaryNodeArrays,
+    output_file: Optional[Path] = None,
+    max_points: Optional[int] = None,
+):
+    """Plot heat flux per unit area: as a line along a 2D boundary, or as a map of Voronoi cells around each node.
+
+    The map is drawn as a single rasterized collection of cells, so it remains fast for large boundaries; beyond
+    VORONOI_MAX_POINTS nodes, cells are replaced by a triangulation of the nodes with interpolated (Gouraud) shading. If
+    the boundary has more than max_points nodes, a reproducible random subset of max_points nodes is drawn. The plot is
+    written to output_file if given (without a display), or shown interactively otherwise.
+    """
+    node_indexes = np.asarray(node_numbers) - 1
+    heatflux_MW = np.asarray(heatflux, dtype=float)
+    coordinates_km = node_arrays.coordinates[node_indexes, :2].astype(float) / 1E3  # m -> km
+    areas_z = node_arrays.outside_areas[node_indexes, 2].astype(float)
+    heatflux_mW = 1E9 * heatflux_MW / areas_z  # MW -> mW
+
+    if max_points is not None and len(node_numbers) > max_points:
+        logger.info('Plotting heat flux for %d of %d boundary nodes', max_points, len(node_numbers))
+        indexes = _get_decimated_indexes(len(node_numbers), max_points)
+        coordinates_km, heatflux_mW = coordinates_km[indexes], heatflux_mW[indexes]
+
+    axis_2d = _get_2d_axis_or_none(coordinates_km)
     if axis_2d:
-        _plot_heatflux_2d(plot_data, plot_axis='x' if axis_2d == 'y' else 'y')
+        plot_axis = 'x' if axis_2d == 'y' else 'y'
+        fig = _plot_heatflux_2d(coordinates_km[:, 'xy'.index(plot_axis)], heatflux_mW, plot_axis, output_file)
+    else:
+        fig = _plot_heatflux_3d(coordinates_km, heatflux_mW, output_file)
+
+    if output_file is None:
+        plt.show()
         return
 
-    _plot_heatflux_3d(plot_data)
+    logger.info(f'Writing heat flux plot: {output_file}')
+    fig.savefig(output_file, dpi=150)
 
 
-def _plot_heatflux_2d(plot_data: pd.DataFrame, plot_axis: str):
-    fig, ax = plt.subplots(figsize=(8, 5))
-    plot_data.plot(x=plot_axis, y='heatflux_mW', marker='o', legend=False, ax=ax)
+def _create_figure(figsize: tuple[float, float], output_file: Optional[Path]) -> Figure:
+    """A pyplot figure for interactive display, or a standalone figure (no GUI backend) when writing to file."""
+    if output_file is None:
+        return plt.figure(figsize=figsize)
+    return Figure(figsize=figsize)
+
+
+def _plot_heatflux_2d(
+    positions_km: np.ndarray,
+    heatflux_mW: np.ndarray,
+    plot_axis: str,
+    output_file: Optional[Path],
+) -> Figure:
+    order = np.argsort(positions_km, kind='stable')
+    fig = _create_figure((8, 5), output_file)
+    ax = fig.subplots()
+    ax.plot(positions_km[order], heatflux_mW[order], marker='o')
     ax.set_xlabel(rf'{plot_axis} ($km$)')
     ax.set_ylabel(r'Heat flux ($mW/m^2$)')
     ax.set_title('Bottom boundary heat flux')
-    plt.show()
-
-
-def _plot_heatflux_3d(plot_data: pd.DataFrame):
-    vor = Voronoi(plot_data[['x', 'y']].values)
-    heatflux_mW = plot_data['heatflux_mW'].values
-
-    norm = colors.Normalize(vmin=min(heatflux_mW), vmax=max(heatflux_mW), clip=True)
-    mapper = cm.ScalarMappable(norm=norm, cmap=cm.Reds)
-
-    fig, ax = plt.subplots(figsize=(8, 8))
-    voronoi_plot_2d(vor, show_points=False, show_vertices=False, line_width=0.3, ax=ax)
-    for region_index, region_heatflux_mW in zip(vor.point_region, heatflux_mW):
-        region = vor.regions[region_index]
-        if -1 in region:
-            continue
-
-        polygon = [vor.vertices[i] for i in region]
-        ax.fill(*zip(*polygon), color=mapper.to_rgba(region_heatflux_mW))
-
+    return fig
+
+
+def _plot_heatflux_3d(coordinates_km: np.ndarray, heatflux_mW: np.ndarray, output_file: Optional[Path]) -> Figure:
+    norm = colors.Normalize(vmin=heatflux_mW.min(), vmax=heatflux_mW.max(), clip=True)
+    fig = _create_figure((8, 8), output_file)
+    ax = fig.subplots()
+
+    if len(heatflux_mW) > VORONOI_MAX_POINTS:
+        cells = ax.tripcolor(
+            coordinates_km[:, 0],
+            coordinates_km[:, 1],
+            heatflux_mW,
+            shading='gouraud',
+            cmap='Reds',
+            norm=norm,
+            rasterized=True,
+        )
+    else:
+        vor = Voronoi(coordinates_km)
+        regions = [vor.regions[region_index] for region_index in vor.point_region]
+        is_bounded = np.array([bool(region) and -1 not in region for region in regions])
+        cells = PolyCollection(
+            [vor.vertices[region] for region, bounded in zip(regions, is_bounded) if bounded],
+            array=heatflux_mW[is_bounded],
+            cmap='Reds',
+            norm=norm,
+            edgecolors='black',
+            linewidths=0.3,
+            rasterized=True,
+        )
+        ax.add_collection(cells)
+
+    ax.set_xlim(coordinates_km[:, 0].min(), coordinates_km[:, 0].max())
+    ax.set_ylim(coordinates_km[:, 1].min(), coordinates_km[:, 1].max())
     ax.set_aspect('equal')
     ax.set_xlabel(r'x ($km$)')
     ax.set_ylabel(r'y ($km$)')
     ax.set_title(r'Bottom boundary heat flux ($mW/m^2$)')
-    plt.colorbar(mapper, ax=ax)
-    plt.show()
+    fig.colorbar(cells, ax=ax)
+    return fig
+
+
+def _get_decimated_indexes(n_points: int, max_points: int) -> np.ndarray:
+    """Sorted indexes of a reproducible random subset of max_points out of n_points.
+    >>> _get_decimated_indexes(10, 4).tolist()
+    [2, 4, 5, 7]
+    """
+    rng = np.random.default_rng(seed=0)
+    return np.sort(rng.choice(n_points, size=max_points, replace=False))
 
 
-def _get_2d_axis_or_none(plot_data: pd.DataFrame) -> str:
-    if not plot_data.x.var():
+def _get_2d_axis_or_none(coordinates: np.ndarray) -> Optional[str]:
+    if not coordinates[:, 0].var():
         return 'x'
 
-    if not plot_data.y.var():
+    if not coordinates[:, 1].var():
         return 'y'
 
     return None
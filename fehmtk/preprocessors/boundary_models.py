@@ -1,10 +1,16 @@
 from decimal import Decimal
 from typing import Callable
 
-from fehmtk.fehm_objects import Node
+import numpy as np
+
+from fehmtk.config import ModelConfig
+
+COORDINATE_DIMENSIONS = ('x', 'y', 'z')
 
 
 def get_boundary_model(boundary_kind: str, model_kind: str) -> Callable:
+    """Boundary model evaluating all nodes of a boundary at once. Models take (n, 3) coordinate and outside area arrays,
+    an (n,) volume array and the model params, and return an array of n values (or (n, k) rows of values)."""
     if boundary_kind == 'heat_flux':
         models_by_kind = _get_heat_flux_models_by_kind()
     elif boundary_kind == 'flow':
@@ -18,26 +24,42 @@ def get_boundary_model(boundary_kind: str, model_kind: str) -> Callable:
         raise NotImplementedError(f'No model defined for kind {model_kind}')
 
 
+def validate_boundary_model(boundary_kind: str, model_config: ModelConfig):
+    """Check that a boundary model exists and its params are valid, once per config rather than per node."""
+    get_boundary_model(boundary_kind, model_config.kind)
+    validate_params = _get_param_validators_by_kind().get(model_config.kind)
+    if validate_params is not None:
+        validate_params(model_config.params)
+
+
+def _get_param_validators_by_kind() -> dict[str, Callable]:
+    return {
+        'crustal_age': _validate_crustal_age_params,
+    }
+
+
 def _get_flow_models_by_kind() -> dict[str, Callable]:
     return {
         'open_flow': _open_flow,
     }
 
 
-def _open_flow(node: Node, params: dict) -> tuple[Decimal]:
+def _open_flow(coordinates: np.ndarray, outside_areas: np.ndarray, volumes: np.ndarray, params: dict) -> np.ndarray:
     """Fluid flow set to constant pressure, allowing flow in or out to maintain it.
 
     Fluid input comes in at the specified temperature, output is at the in-place temperature. AIPED value sets the
-    impedence to flow, and therefore determines the model's ability to maintain the desired pressure.
+    impedence to flow, and therefore determines the model's ability to maintain the desired pressure. Returns rows of
+    (skd, eflow, aiped).
 
     Required params:
     input_fluid_temp_degC       (numeric)
     aiped_to_volume_ratio       (numeric)
     """
-    skd = '0'
-    eflow = -params['input_fluid_temp_degC']
-    aiped = abs(node.volume * params['aiped_to_volume_ratio'])
-    return (skd, eflow, aiped)
+    flow = np.empty((len(volumes), 3), dtype=object)
+    flow[:, 0] = '0'  # skd
+    flow[:, 1] = -params['input_fluid_temp_degC']  # eflow
+    flow[:, 2] = np.abs(volumes * params['aiped_to_volume_ratio'])  # aiped
+    return flow
 
 
 def _get_heat_flux_models_by_kind() -> dict[str, Callable]:
@@ -47,7 +69,12 @@ def _get_heat_flux_models_by_kind() -> dict[str, Callable]:
     }
 
 
-def _crustal_age_heatflux(node: Node, params: dict) -> Decimal:
+def _crustal_age_heatflux(
+    coordinates: np.ndarray,
+    outside_areas: np.ndarray,
+    volumes: np.ndarray,
+    params: dict,
+) -> np.ndarray:
     """Heat input per square meter as a function of distance to ridge in x:
 
     C / a^0.5
@@ -63,26 +90,44 @@ def _crustal_age_heatflux(node: Node, params: dict) -> Decimal:
     crustal_age_sign              [±]  (+, -, 1, or -1)
     crustal_age_dimension         [x]  (x, y, or z) [default x]
     """
+    crustal_age_sign = 1 if params['crustal_age_sign'] in (1, '+') else -1
+    dimension_index = COORDINATE_DIMENSIONS.index(params.get('crustal_age_dimension', 'x'))
+    distance_from_boundary_m = crustal_age_sign * coordinates[:, dimension_index]
+
+    distance_from_ridge_m = params['boundary_distance_to_ridge_m'] + distance_from_boundary_m
+    age_ma = 1 / (params['spread_rate_mm_per_year'] * Decimal('1E3')) * distance_from_ridge_m
+    heatflux_per_m2 = params['coefficient_MW'] / _sqrt(age_ma)
+    return -np.abs(outside_areas[:, 2] * heatflux_per_m2)
+
+
+def _validate_crustal_age_params(params: dict):
     if params['crustal_age_sign'] not in (1, -1, '+', '-'):
         raise ValueError(f'Invalid crustal_age_sign {params["crustal_age_sign"]}, must be 1, -1, +, or -')
 
-    crustal_age_sign = 1 if params['crustal_age_sign'] in (1, '+') else -1
-
     crustal_age_dimension = params.get('crustal_age_dimension', 'x')
-    if crustal_age_dimension not in ('x', 'y', 'z'):
+    if crustal_age_dimension not in COORDINATE_DIMENSIONS:
         raise ValueError(f'Invalid crustal_age_dimension: {crustal_age_dimension}')
-    distance_from_boundary_m = crustal_age_sign * getattr(node, crustal_age_dimension)
-
-    distance_from_ridge_m = params['boundary_distance_to_ridge_m'] + distance_from_boundary_m
-    age_ma = 1 / (params['spread_rate_mm_per_year'] * Decimal('1E3')) * distance_from_ridge_m
-    heatflux_per_m2 = params['coefficient_MW'] / age_ma ** Decimal('0.5')
-    return -abs(node.outside_area.z * heatflux_per_m2)
 
 
-def _constant_MW_per_m2(node: Node, params: dict) -> Decimal:
+def _constant_MW_per_m2(
+    coordinates: np.ndarray,
+    outside_areas: np.ndarray,
+    volumes: np.ndarray,
+    params: dict,
+) -> np.ndarray:
     """Heat input per square meter as a constant value throughout the grid.
 
     Required params:
     constant  (numeric)
     """
-    return -abs(node.outside_area.z * params['constant'])
+    return -np.abs(outside_areas[:, 2] * params['constant'])
+
+
+def _sqrt(values: np.ndarray) -> np.ndarray:
+    """Elementwise square root, exact (correctly rounded) for Decimal (object) arrays.
+    >>> _sqrt(np.array([Decimal(4), Decimal('0.25')], dtype=object))
+    array([Decimal('2'), Decimal('0.5')], dtype=object)
+    """
+    if values.dtype == object:
+        return np.array([value.sqrt() for value in values], dtype=object)
+    return np.sqrt(values)
@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+from decimal import Decimal
+import hashlib
+import logging
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE_SUFFIX = '.hydrostat_cache.npz'
+DIGEST_SIZE = 16
+COLUMN_CACHE_VERSION = 2  # bump when column solutions change for the same inputs (2: bilinear density lookup)
+
+
+@dataclass
+class CachedColumn:
+    temperature_digest: bytes
+    z_top: float
+    P_column: np.ndarray
+    P_targets: np.ndarray
+
+
+class HydrostatColumnCache:
+    """Column pressures solved by a previous hydrostat run, keyed by column location and targets.
+
+    A column can be reused outright when the pressure model parameters, water properties, density interpolation and
+    the temperatures sampled along it are unchanged. Otherwise the previous pressures, interpolated onto the new column,
+    serve as the initial guess for the fixed-point iteration.
+    """
+
+    def __init__(
+        self,
+        *,
+        params_digest: bytes,
+        z_interval_m: float,
+        columns: Optional[dict[bytes, CachedColumn]] = None,
+    ):
+        self.params_digest = params_digest
+        self.z_interval_m = z_interval_m
+        self.columns = columns if columns is not None else {}
+        self.previous_z_interval_m = z_interval_m
+        self.previous_columns = {}
+        self.n_reused = 0
+        self.n_warm_started = 0
+        self.n_cold_started = 0
+
+    @classmethod
+    def from_file(cls, cache_file: Path) -> 'HydrostatColumnCache':
+        with np.load(cache_file) as data:
+            P_column_splits = np.cumsum(data['P_column_lengths'])[:-1]
+            P_target_splits = np.cumsum(data['P_target_lengths'])[:-1]
+            columns = {
+                key.tobytes(): CachedColumn(
+                    temperature_digest=temperature_digest.tobytes(),
+                    z_top=z_top,
+                    P_column=P_column,
+                    P_targets=P_targets,
+                )
+                for key, temperature_digest, z_top, P_column, P_targets in zip(
+                    data['keys'],
+                    data['temperature_digests'],
+                    data['z_tops'],
+                    np.split(data['P_columns'], P_column_splits),
+                    np.split(data['P_targets'], P_target_splits),
+                )
+            }
+            return cls(
+                params_digest=data['params_digest'].tobytes(),
+                z_interval_m=float(data['z_interval_m']),
+                columns=columns,
+            )
+
+    def to_file(self, cache_file: Path):
+        columns = list(self.columns.values())
+        np.savez(
+            cache_file,
+            params_digest=np.frombuffer(self.params_digest, dtype=np.uint8),
+            z_interval_m=np.array(self.z_interval_m),
+            keys=_bytes_to_array(self.columns.keys()),
+            temperature_digests=_bytes_to_array(column.temperature_digest for column in columns),
+            z_tops=np.array([column.z_top for column in columns], dtype=float),
+            P_column_lengths=np.array([len(column.P_column) for column in columns], dtype=int),
+            P_columns=_concatenate(column.P_column for column in columns),
+            P_target_lengths=np.array([len(column.P_targets) for column in columns], dtype=int),
+            P_targets=_concatenate(column.P_targets for column in columns),
+        )
+
+    def get_reusable_pressures(self, key: bytes, temperature_digest: bytes) -> Optional[np.ndarray]:
+        column = self.previous_columns.get(key)
+        if column is None or column.temperature_digest != temperature_digest:
+            return None
+
+        self.n_reused += 1
+        self.columns[key] = column
+        return column.P_targets
+
+    def get_initial_guess(self, key: bytes, z_column: np.ndarray) -> Optional[np.ndarray]:
+        column = self.previous_columns.get(key)
+        if column is None:
+            self.n_cold_started += 1
+            return None
+
+        self.n_warm_started += 1
+        cached_z_column = column.z_top - self.previous_z_interval_m * np.arange(len(column.P_column))
+        return np.interp(z_column, xp=np.flip(cached_z_column), fp=np.flip(column.P_column))
+
+    def store(self, key: bytes, *, temperature_digest: bytes, z_column: np.ndarray, P_column: np.ndarray, P_targets):
+        self.columns[key] = CachedColumn(
+            temperature_digest=temperature_digest,
+            z_top=float(z_column[0]),
+            P_column=P_column,
+            P_targets=P_targets,
+        )
+
+    def log_summary(self):
+        logger.info(
+            'Column cache: %d reused, %d warm started, %d cold started',
+            self.n_reused,
+            self.n_warm_started,
+            self.n_cold_started,
+        )
+
+
+def load_column_cache(
+    cache_file: Path,
+    params: dict[str, Decimal],
+    *,
+    water_properties_checksum: str,
+    density_interpolation: str,
+) -> HydrostatColumnCache:
+    """Load columns cached by a previous run. Only columns used by this run are kept when the cache is rewritten.
+
+    Columns solved with different params, a different water properties table (by checksum), a different density
+    interpolation or an older COLUMN_CACHE_VERSION are used as initial guesses only.
+    """
+    cache = HydrostatColumnCache(
+        params_digest=get_params_digest(
+            params,
+            water_properties_checksum=water_properties_checksum,
+            density_interpolation=density_interpolation,
+        ),
+        z_interval_m=float(params['z_interval_m']),
+    )
+    if not cache_file.exists():
+        logger.info(f'No column cache found at {cache_file}, starting cold.')
+        return cache
+
+    try:
+        previous_cache = HydrostatColumnCache.from_file(cache_file)
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning(f'Could not read column cache {cache_file} ({e}), starting cold.')
+        return cache
+
+    logger.info(f'Read {len(previous_cache.columns)} cached columns from {cache_file}')
+    if previous_cache.params_digest != cache.params_digest:
+        logger.info(
+            'Pressure model params, water properties or density interpolation changed, using cached columns as '
+            'initial guesses only.'
+        )
+        for column in previous_cache.columns.values():
+            column.temperature_digest = bytes(DIGEST_SIZE)
+
+    cache.previous_z_interval_m = previous_cache.z_interval_m
+    cache.previous_columns = previous_cache.columns
+    return cache
+
+
+def get_column_cache_file(output_file: Path) -> Path:
+    return output_file.with_name(output_file.name + CACHE_FILE_SUFFIX)
+
+
+def get_params_digest(params: dict[str, Decimal], water_properties_checksum: str, density_interpolation: str) -> bytes:
+    serialized = ';'.join([
+        f'version={COLUMN_CACHE_VERSION}',
+        f'water_properties={water_properties_checksum}',
+        f'density_interpolation={density_interpolation}',
+        *(f'{key}={params[key]}' for key in sorted(params)),
+    ])
+    return hashlib.blake2b(serialized.encode(), digest_size=DIGEST_SIZE).digest()
+
+
+def get_column_key(target_xy: np.ndarray, z_targets: np.ndarray) -> bytes:
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    hasher.update(np.asarray(target_xy, dtype=float).tobytes())
+    hasher.update(np.asarray(z_targets, dtype=float).tobytes())
+    return hasher.digest()
+
+
+def get_array_digest(values: np.ndarray) -> bytes:
+    return hashlib.blake2b(np.ascontiguousarray(values, dtype=float).tobytes(), digest_size=DIGEST_SIZE).digest()
+
+
+def _bytes_to_array(values) -> np.ndarray:
+    return np.array([np.frombuffer(value, dtype=np.uint8) for value in values], dtype=np.uint8).reshape(-1, DIGEST_SIZE)
+
+
+def _concatenate(arrays) -> np.ndarray:
+    arrays = list(arrays)
+    return np.concatenate(arrays) if arrays else np.array([], dtype=float)
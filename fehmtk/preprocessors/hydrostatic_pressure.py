@@ -1,50 +1,105 @@
 from decimal import Decimal
+import itertools
 import logging
 from pathlib import Path
-from typing import Callable, Optional, Sequence
+import tempfile
+from typing import Callable, Iterable, Iterator, Optional, Sequence
 
 import numpy as np
 from scipy.interpolate import LinearNDInterpolator, NearestNDInterpolator, RegularGridInterpolator
 
-from fehmtk.common import round_significant_figures
+from fehmtk.common import round_significant_figures_array
 from fehmtk.config import ModelConfig, HydrostatConfig, RunConfig
 from fehmtk.fehm_objects import Grid, State
-from fehmtk.file_interface import read_grid, read_nist_lookup_table, read_restart, write_pressure
+from fehmtk.file_interface import (
+    get_file_checksum,
+    iterate_fehm_coordinates,
+    iterate_restart_block,
+    read_fehm_node_count,
+    read_grid,
+    read_nist_density_table,
+    read_nist_lookup_table,
+    read_restart,
+    read_zones,
+    write_pressure_chunks,
+)
 from fehmtk.file_interface.grid import COORDINATE_SIGNIFICANT_FIGURES
 
+from .adaptive_sampling import AdaptiveColumnLookup, sample_columns_adaptively
+from .hydrostat_cache import (
+    HydrostatColumnCache,
+    get_array_digest,
+    get_column_cache_file,
+    get_column_key,
+    load_column_cache,
+)
+
 logger = logging.getLogger(__name__)
 
 N_ITERATIONS = 5
+CONVERGENCE_TOLERANCE_MPA = 1e-9
 GRAVITY_ACCELERATION_M_S2 = -9.80665
 RANDOM_SAMPLE_SEED = 12
 WATER_PROPERTIES_SIGNIFICANT_FIGURES = 7  # Coordinates in water properties files stored as e.g. 0.100974E+04
+DEFAULT_ADAPTIVE_INITIAL_SAMPLES = 3
+DEFAULT_ADAPTIVE_MAX_REFINEMENT_LEVEL = 6
 
 
-def generate_hydrostatic_pressure(config_file: Path, output_file: Path):
+def generate_hydrostatic_pressure(
+    config_file: Path,
+    output_file: Path,
+    warm_start: bool = False,
+    chunk_size: Optional[int] = None,
+):
     logger.info(f'Reading configuration file: {config_file}')
     config = RunConfig.from_yaml(config_file)
 
     logger.info('Reading water properties lookup')
     density_lookup_MPa_degC = _read_density_lookup(config.files_config.water_properties)
 
-    logger.info('Reading node data into memory')
-    grid = read_grid(
-        config.files_config.grid,
-        material_zone_file=config.files_config.material_zone,
-        outside_zone_file=config.files_config.outside_zone,
-        read_elements=False,
-    )
-    state, restart_metadata = read_restart(config.files_config.final_conditions)
+    column_cache = None
+    if warm_start:
+        cache_file = get_column_cache_file(output_file)
+        column_cache = load_column_cache(
+            cache_file,
+            config.hydrostat_config.pressure_model.params,
+            water_properties_checksum=get_file_checksum(config.files_config.water_properties.resolve()),
+            density_interpolation=type(density_lookup_MPa_degC).__name__,
+        )
 
-    pressure_by_node = compute_hydrostatic_pressure(
-        grid=grid,
-        state=state,
-        hydrostat_config=config.hydrostat_config,
-        density_lookup_MPa_degC=density_lookup_MPa_degC,
-    )
+    if chunk_size is not None:
+        _generate_hydrostatic_pressure_streaming(
+            config,
+            output_file=output_file,
+            density_lookup_MPa_degC=density_lookup_MPa_degC,
+            column_cache=column_cache,
+            chunk_size=chunk_size,
+        )
+    else:
+        logger.info('Reading node data into memory')
+        grid = read_grid(
+            config.files_config.grid,
+            material_zone_file=config.files_config.material_zone,
+            outside_zone_file=config.files_config.outside_zone,
+            read_elements=False,
+        )
+        state, restart_metadata = read_restart(config.files_config.final_conditions)
+
+        node_numbers, pressures = compute_hydrostatic_pressure(
+            grid=grid,
+            state=state,
+            hydrostat_config=config.hydrostat_config,
+            density_lookup_MPa_degC=density_lookup_MPa_degC,
+            column_cache=column_cache,
+        )
+
+        logger.info(f'Writing pressures to file {output_file}')
+        write_pressure_chunks([_round_pressures(pressures)], output_file=output_file, n_nodes=len(pressures))
 
-    logger.info(f'Writing pressures to file {output_file}')
-    write_pressure(pressure_by_node, output_file=output_file)
+    if column_cache is not None:
+        column_cache.log_summary()
+        logger.info(f'Writing column cache to file {cache_file}')
+        column_cache.to_file(cache_file)
 
 
 def compute_hydrostatic_pressure(
@@ -52,10 +107,12 @@ def compute_hydrostatic_pressure(
     grid: Grid,
     state: State,
     hydrostat_config: HydrostatConfig,
-    density_lookup_MPa_degC: LinearNDInterpolator,
-) -> dict[int, Decimal]:
-    coordinates_by_number = _get_coordinates_by_number_without_flat_dimensions(grid)
-    node_coordinates, node_temperatures = _get_coordinate_and_temperature_arrays(coordinates_by_number, state)
+    density_lookup_MPa_degC: Callable,
+    column_cache: Optional[HydrostatColumnCache] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate pressures (MPa) for all nodes, returned as arrays of node numbers and pressures in node order."""
+    node_numbers, node_coordinates = _get_node_numbers_and_coordinates_without_flat_dimensions(grid)
+    node_temperatures = np.array([float(state.temperature[number - 1]) for number in node_numbers])
     _validate_hydrostat_config(hydrostat_config, node_coordinates)
 
     # TODO(dustin): Add config support for uniform temperature
@@ -63,34 +120,242 @@ def compute_hydrostatic_pressure(
     temperature_lookup = NearestNDInterpolator(node_coordinates, node_temperatures)
 
     if hydrostat_config.interpolation_model is None:
-        sampled_node_numbers = [node.number for node in grid.nodes]
+        is_explicit = np.ones(len(node_numbers), dtype=bool)
     else:
         sampled_node_numbers = _sample_node_numbers(grid, sampling_model=hydrostat_config.sampling_model)
+        is_explicit = np.isin(node_numbers, list(sampled_node_numbers))
+
+    explicit_indexes = np.flatnonzero(is_explicit)
+    logger.info(f'Calculating explicit pressures for {len(explicit_indexes)}/{len(node_numbers)} nodes')
+    pressures = np.empty(len(node_numbers))
+    for i, index in enumerate(explicit_indexes, start=1):
+        if not i % 10000 or i in (0, len(explicit_indexes)):
+            logger.info(f'Pressures calculated: {i} / {len(explicit_indexes)}')
+
+        pressures[index] = _calculate_explicit_node_pressure(
+            node_numbers[index],
+            node_coordinates[index],
+            params=hydrostat_config.pressure_model.params,
+            density_lookup_MPa_degC=density_lookup_MPa_degC,
+            temperature_lookup=temperature_lookup,
+            column_cache=column_cache,
+        )
 
-    logger.info(f'Calculating explicit pressures for {len(sampled_node_numbers)}/{len(coordinates_by_number)} nodes')
-    pressure_by_node = {}
-    for i, node_number in enumerate(sampled_node_numbers, start=1):
-        if not i % 10000 or i in (0, len(sampled_node_numbers)):
-            logger.info(f'Pressures calculated: {i} / {len(sampled_node_numbers)}')
+    if hydrostat_config.interpolation_model is not None:
+        P_lookup = _build_pressure_lookup(
+            node_coordinates,
+            hydrostat_config=hydrostat_config,
+            density_lookup_MPa_degC=density_lookup_MPa_degC,
+            temperature_lookup=temperature_lookup,
+            column_cache=column_cache,
+        )
 
-        pressures = calculate_hydrostatic_pressure_for_column(
-            target_xy=coordinates_by_number[node_number][:-1],
-            z_targets=np.array([coordinates_by_number[node_number][-1]]),
+        logger.info('Interpolating remaining node pressures')
+        pressures[~is_explicit] = P_lookup(node_coordinates[~is_explicit])
+    return node_numbers, pressures
+
+
+def _generate_hydrostatic_pressure_streaming(
+    config: RunConfig,
+    *,
+    output_file: Path,
+    density_lookup_MPa_degC: Callable,
+    column_cache: Optional[HydrostatColumnCache],
+    chunk_size: int,
+):
+    """Calculate and write pressures chunk by chunk, holding node coordinates in memory-mapped scratch files.
+
+    Nodes must be numbered sequentially. Only the temperature lookup (a nearest-neighbor tree over all nodes) and the
+    sampled pressure lookup are held fully in memory.
+    """
+    if chunk_size < 1:
+        raise ValueError(f'Invalid chunk_size ({chunk_size}), must be positive.')
+
+    hydrostat_config = config.hydrostat_config
+    n_nodes = read_fehm_node_count(config.files_config.grid)
+    with tempfile.TemporaryDirectory(dir=output_file.parent) as scratch_dir:
+        logger.info(f'Reading node data into memory-mapped scratch files in {scratch_dir}')
+        node_coordinates = _read_node_coordinates_to_memmap(
+            config.files_config.grid,
+            scratch_file=Path(scratch_dir) / 'coordinates.dat',
+            n_nodes=n_nodes,
+            chunk_size=chunk_size,
+        )
+        node_temperatures = np.memmap(Path(scratch_dir) / 'temperature.dat', dtype=float, mode='w+', shape=(n_nodes,))
+        _fill_memmap_in_chunks(
+            node_temperatures,
+            iterate_restart_block(config.files_config.final_conditions, 'temperature'),
+            chunk_size=chunk_size,
+        )
+        _validate_hydrostat_config(hydrostat_config, node_coordinates)
+
+        logger.info('Generating temperature lookups')
+        temperature_lookup = NearestNDInterpolator(node_coordinates, node_temperatures)
+
+        if hydrostat_config.interpolation_model is None:
+            P_lookup, sampled_node_numbers = None, None
+        else:
+            sampled_node_numbers = _sample_node_numbers_streaming(config, n_nodes=n_nodes)
+            P_lookup = _build_pressure_lookup(
+                node_coordinates,
+                hydrostat_config=hydrostat_config,
+                density_lookup_MPa_degC=density_lookup_MPa_degC,
+                temperature_lookup=temperature_lookup,
+                column_cache=column_cache,
+            )
+
+        pressure_chunks = _iterate_pressure_chunks(
+            node_coordinates,
+            chunk_size=chunk_size,
+            sampled_node_numbers=sampled_node_numbers,
+            P_lookup=P_lookup,
             params=hydrostat_config.pressure_model.params,
             density_lookup_MPa_degC=density_lookup_MPa_degC,
             temperature_lookup=temperature_lookup,
-            n_iterations=N_ITERATIONS,
+            column_cache=column_cache,
         )
-        pressure_by_node[node_number] = pressures[0]
-        if pressure_by_node[node_number].is_nan():
-            raise ValueError(f'Pressure at node {node_number} is not a number. May be out of range for density lookup.')
+        logger.info(f'Streaming pressures to file {output_file}')
+        write_pressure_chunks(pressure_chunks, output_file=output_file, n_nodes=n_nodes)
+
+
+def _iterate_pressure_chunks(
+    node_coordinates: np.ndarray,
+    *,
+    chunk_size: int,
+    sampled_node_numbers: Optional[set[int]],
+    P_lookup: Optional[Callable],
+    params: dict[str, Decimal],
+    density_lookup_MPa_degC: Callable,
+    temperature_lookup: Callable,
+    column_cache: Optional[HydrostatColumnCache],
+) -> Iterator[np.ndarray]:
+    """Yield pressures for consecutive chunks of nodes, solving sampled nodes explicitly and interpolating the rest.
+
+    All nodes are solved explicitly when no pressure lookup is given.
+    """
+    n_nodes = len(node_coordinates)
+    for start in range(0, n_nodes, chunk_size):
+        logger.info(f'Pressures calculated: {start} / {n_nodes}')
+        chunk_coordinates = np.array(node_coordinates[start:start + chunk_size])
+        chunk_node_numbers = range(start + 1, start + 1 + len(chunk_coordinates))
+
+        is_explicit = np.array([
+            P_lookup is None or node_number in sampled_node_numbers for node_number in chunk_node_numbers
+        ])
+        pressures = np.empty(len(chunk_coordinates))
+        if not is_explicit.all():
+            pressures[~is_explicit] = P_lookup(chunk_coordinates[~is_explicit])
+        for i in np.flatnonzero(is_explicit):
+            pressures[i] = _calculate_explicit_node_pressure(
+                chunk_node_numbers[i],
+                chunk_coordinates[i],
+                params=params,
+                density_lookup_MPa_degC=density_lookup_MPa_degC,
+                temperature_lookup=temperature_lookup,
+                column_cache=column_cache,
+            )
+        yield _round_pressures(pressures)
+    logger.info(f'Pressures calculated: {n_nodes} / {n_nodes}')
+
+
+def _calculate_explicit_node_pressure(
+    node_number: int,
+    coordinates: np.ndarray,
+    *,
+    params: dict[str, Decimal],
+    density_lookup_MPa_degC: Callable,
+    temperature_lookup: Callable,
+    column_cache: Optional[HydrostatColumnCache],
+) -> float:
+    pressures = calculate_hydrostatic_pressure_for_column(
+        target_xy=coordinates[:-1],
+        z_targets=np.array([coordinates[-1]]),
+        params=params,
+        density_lookup_MPa_degC=density_lookup_MPa_degC,
+        temperature_lookup=temperature_lookup,
+        n_iterations=N_ITERATIONS,
+        column_cache=column_cache,
+    )
+    if np.isnan(pressures[0]):
+        raise ValueError(f'Pressure at node {node_number} is not a number. May be out of range for density lookup.')
+    return pressures[0]
+
+
+def _read_node_coordinates_to_memmap(
+    fehm_file: Path,
+    *,
+    scratch_file: Path,
+    n_nodes: int,
+    chunk_size: int,
+) -> np.memmap:
+    """Read sequentially numbered node coordinates into a memory-mapped array, dropping any flat dimension."""
+    def iterate_coordinates():
+        for expected_number, (number, *coordinates) in enumerate(iterate_fehm_coordinates(fehm_file), start=1):
+            if number != expected_number:
+                raise ValueError(f'Streaming requires sequential node numbers, found {number} at {expected_number}.')
+            yield coordinates
+
+    xyz = np.memmap(scratch_file.with_suffix('.xyz.dat'), dtype=float, mode='w+', shape=(n_nodes, 3))
+    _fill_memmap_in_chunks(xyz, iterate_coordinates(), chunk_size=chunk_size)
+
+    lower, upper = xyz[:1].min(axis=0), xyz[:1].max(axis=0)
+    for start in range(0, n_nodes, chunk_size):
+        chunk = np.array(xyz[start:start + chunk_size])
+        lower, upper = np.minimum(lower, chunk.min(axis=0)), np.maximum(upper, chunk.max(axis=0))
+
+    flat_dimension = next((dim for dim in (0, 1) if lower[dim] == upper[dim]), None)
+    if flat_dimension is None:
+        return xyz
+
+    coordinates = np.memmap(scratch_file, dtype=float, mode='w+', shape=(n_nodes, 2))
+    for start in range(0, n_nodes, chunk_size):
+        coordinates[start:start + chunk_size] = np.delete(xyz[start:start + chunk_size], obj=flat_dimension, axis=1)
+    return coordinates
+
+
+def _fill_memmap_in_chunks(array: np.memmap, values: Iterable, chunk_size: int):
+    values = iter(values)
+    for start in range(0, len(array), chunk_size):
+        chunk = list(itertools.islice(values, chunk_size))
+        array[start:start + len(chunk)] = chunk
+        if len(chunk) < min(chunk_size, len(array) - start):
+            raise ValueError(f'Expected {len(array)} values, found {start + len(chunk)}.')
+    array.flush()
+
+
+def _sample_node_numbers_streaming(config: RunConfig, n_nodes: int) -> set[int]:
+    sampling_model = config.hydrostat_config.sampling_model
+    if sampling_model is None:
+        return set()
+
+    missing_nodes = {n for n in sampling_model.params.get('explicit_nodes', []) if not 1 <= n <= n_nodes}
+    if missing_nodes:
+        raise ValueError(f'Grid does not contain nodes: {missing_nodes}.')
+
+    zones_only_grid = Grid(
+        nodes_by_number={},
+        elements_by_number={},
+        material_zones=read_zones(config.files_config.material_zone) if config.files_config.material_zone else None,
+        outside_zones=read_zones(config.files_config.outside_zone) if config.files_config.outside_zone else None,
+    )
+    return _sample_node_numbers_from_zones(zones_only_grid, sampling_model)
+
 
-    if hydrostat_config.interpolation_model is not None and hydrostat_config.interpolation_model.kind == 'regular_grid':
+def _build_pressure_lookup(
+    node_coordinates: np.ndarray,
+    *,
+    hydrostat_config: HydrostatConfig,
+    density_lookup_MPa_degC: Callable,
+    temperature_lookup: Callable,
+    column_cache: Optional[HydrostatColumnCache] = None,
+) -> Callable:
+    interpolation_model = hydrostat_config.interpolation_model
+    if interpolation_model.kind == 'regular_grid':
         x_targets, y_targets, z_targets = _get_xyz_targets(
             node_coordinates,
-            interpolation_params=hydrostat_config.interpolation_model.params,
+            interpolation_params=interpolation_model.params,
         )
-        n_columns = _get_n_columns(hydrostat_config.interpolation_model.params)
+        n_columns = _get_n_columns(interpolation_model.params)
         logger.info(f'Calculating explicit pressures for {n_columns} sampled columns.')
 
         target_points, P_cube = _calculate_explicit_target_pressures(
@@ -101,17 +366,70 @@ def compute_hydrostatic_pressure(
             density_lookup_MPa_degC=density_lookup_MPa_degC,
             temperature_lookup=temperature_lookup,
             n_iterations=N_ITERATIONS,
+            column_cache=column_cache,
         )
+        return RegularGridInterpolator(points=target_points, values=P_cube)
+
+    if interpolation_model.kind == 'adaptive':
+        return _build_adaptive_pressure_lookup(
+            node_coordinates,
+            interpolation_params=interpolation_model.params,
+            pressure_params=hydrostat_config.pressure_model.params,
+            density_lookup_MPa_degC=density_lookup_MPa_degC,
+            temperature_lookup=temperature_lookup,
+            column_cache=column_cache,
+        )
+
+    raise NotImplementedError(f'Interpolation model kind {interpolation_model.kind} not supported.')
 
-        logger.info('Interpolating remaining node pressures')
-        unassigned_nodes = coordinates_by_number.keys() - pressure_by_node.keys()
-        unassigned_coordinates = np.array([coordinates_by_number[node_number] for node_number in unassigned_nodes])
 
-        P_lookup = RegularGridInterpolator(points=target_points, values=P_cube)
-        P_interpolated = P_lookup(unassigned_coordinates)
-        for node, pressure in zip(unassigned_nodes, P_interpolated):
-            pressure_by_node[node] = pressure
-    return pressure_by_node
+def _build_adaptive_pressure_lookup(
+    node_coordinates: np.ndarray,
+    *,
+    interpolation_params: dict,
+    pressure_params: dict[str, Decimal],
+    density_lookup_MPa_degC: Callable,
+    temperature_lookup: Callable,
+    column_cache: Optional[HydrostatColumnCache] = None,
+) -> AdaptiveColumnLookup:
+    """Pressure lookup from columns sampled on a grid refined where interpolation error exceeds a tolerance.
+
+    Columns start on a regular grid of initial_samples per horizontal dimension. A cell is split in two (2D grids) or
+    four (3D grids) when the pressures interpolated to its center from its corners differ from an explicit column solve
+    by more than tolerance_MPa.
+
+    Required params:
+    z_samples              (int)
+    tolerance_MPa          (numeric)
+    initial_samples        (int) [default 3]
+    max_refinement_level   (int) [default 6]
+    """
+    z_targets = np.linspace(
+        node_coordinates[:, -1].min(axis=0),
+        node_coordinates[:, -1].max(axis=0),
+        interpolation_params['z_samples'],
+    )
+
+    def solve_column(target_xy: np.ndarray) -> np.ndarray:
+        pressures = calculate_hydrostatic_pressure_for_column(
+            target_xy=target_xy,
+            z_targets=z_targets,
+            params=pressure_params,
+            density_lookup_MPa_degC=density_lookup_MPa_degC,
+            temperature_lookup=temperature_lookup,
+            n_iterations=N_ITERATIONS,
+            column_cache=column_cache,
+        )
+        return pressures
+
+    return sample_columns_adaptively(
+        horizontal_coordinates=node_coordinates[:, :-1],
+        z_targets=z_targets.astype(float),
+        solve_column=solve_column,
+        initial_samples=interpolation_params.get('initial_samples', DEFAULT_ADAPTIVE_INITIAL_SAMPLES),
+        tolerance=float(interpolation_params['tolerance_MPa']),
+        max_refinement_level=interpolation_params.get('max_refinement_level', DEFAULT_ADAPTIVE_MAX_REFINEMENT_LEVEL),
+    )
 
 
 def calculate_hydrostatic_pressure_for_column(
@@ -122,8 +440,13 @@ def calculate_hydrostatic_pressure_for_column(
     density_lookup_MPa_degC: Callable,
     temperature_lookup: Callable,
     n_iterations: int,
+    column_cache: Optional[HydrostatColumnCache] = None,
 ) -> np.ndarray:
+    """Bootstrap pressures down (and up) a column from the reference point, iterating on density until converged.
 
+    When a column cache is given, a column whose sampled temperatures are unchanged since the cached run is reused, and
+    a changed column starts its iteration from the cached pressures.
+    """
     params = {
         k: float(v)  # interpolation requires floating point, and conversion to Decimal is too expensive at this step
         for k, v in params.items()
@@ -141,7 +464,19 @@ def calculate_hydrostatic_pressure_for_column(
     mean_T = ((T_column + np.roll(T_column, -1)) / 2)[:-1]
     PT_column = _prepend_entry_to_array(params['reference_pressure_MPa'], mean_T)
 
-    for iteration in range(n_iterations):  # TODO(Dustin): use convergence criteria rather than set number
+    previous_P_column = None
+    if column_cache is not None:
+        column_key = get_column_key(target_xy, z_targets)
+        temperature_digest = get_array_digest(T_column)
+        P_targets = column_cache.get_reusable_pressures(column_key, temperature_digest)
+        if P_targets is not None:
+            return P_targets
+
+        previous_P_column = column_cache.get_initial_guess(column_key, z_column)
+        if previous_P_column is not None:
+            PT_column[:, 0] = ((previous_P_column + np.roll(previous_P_column, -1)) / 2)[:-1]
+
+    for iteration in range(n_iterations):
         density_kg_m3 = density_lookup_MPa_degC(PT_column)
         delta_P = -1e-6 * density_kg_m3 * GRAVITY_ACCELERATION_M_S2 * params['z_interval_m']
 
@@ -150,12 +485,25 @@ def calculate_hydrostatic_pressure_for_column(
             np.array([params['reference_pressure_MPa']]),
             params['reference_pressure_MPa'] + np.cumsum(delta_P[reference_index:]),
         ))
-        PT_column[:, 0] = ((P_column + np.roll(P_column, -1)) / 2)[:-1]  # TODO(dustin): skip this on last iteration
+        if previous_P_column is not None and np.abs(P_column - previous_P_column).max() < CONVERGENCE_TOLERANCE_MPA:
+            break
+        previous_P_column = P_column
+        PT_column[:, 0] = ((P_column + np.roll(P_column, -1)) / 2)[:-1]
 
     P_targets = np.interp(z_targets.astype(float), xp=np.flip(z_column), fp=np.flip(P_column))
-    return np.array([
-        round_significant_figures(Decimal(P), n=COORDINATE_SIGNIFICANT_FIGURES) for P in P_targets
-    ])
+    if column_cache is not None:
+        column_cache.store(
+            column_key,
+            temperature_digest=temperature_digest,
+            z_column=z_column,
+            P_column=P_column,
+            P_targets=P_targets,
+        )
+    return P_targets
+
+
+def _round_pressures(pressures: np.ndarray) -> np.ndarray:
+    return round_significant_figures_array(pressures, n=COORDINATE_SIGNIFICANT_FIGURES)
 
 
 def build_z_column_around_reference(z_targets: np.ndarray, params: dict[str, float]) -> np.ndarray:
@@ -185,6 +533,7 @@ def _calculate_explicit_target_pressures(
     density_lookup_MPa_degC: Callable,
     temperature_lookup: Callable,
     n_iterations: int,
+    column_cache: Optional[HydrostatColumnCache] = None,
 ) -> tuple[tuple[Sequence], np.ndarray]:
     if x is None or y is None:
         horizontal_target = x if x is not None else y
@@ -200,6 +549,7 @@ def _calculate_explicit_target_pressures(
                 density_lookup_MPa_degC=density_lookup_MPa_degC,
                 temperature_lookup=temperature_lookup,
                 n_iterations=N_ITERATIONS,
+                column_cache=column_cache,
             )
             P_square[i, :] = pressures
         return (horizontal_target, z), P_square
@@ -217,6 +567,7 @@ def _calculate_explicit_target_pressures(
                 density_lookup_MPa_degC=density_lookup_MPa_degC,
                 temperature_lookup=temperature_lookup,
                 n_iterations=N_ITERATIONS,
+                column_cache=column_cache,
             )
             P_cube[i, j, :] = pressures
     return (x, y, z), P_cube
@@ -268,34 +619,30 @@ def _get_n_columns(interpolation_params: dict[str, int]):
     return interpolation_params.get('x_samples', 1) * interpolation_params.get('y_samples', 1)
 
 
-def _get_coordinates_by_number_without_flat_dimensions(grid: Grid) -> dict[int, np.ndarray]:
-    numbers = []
-    coordinates = []
-    for node in grid.nodes:
-        numbers.append(node.number)
-        coordinates.append(node.coordinates.value)
+def _get_node_numbers_and_coordinates_without_flat_dimensions(grid: Grid) -> tuple[np.ndarray, np.ndarray]:
+    nodes = sorted(grid.nodes, key=lambda node: node.number)
+    numbers = np.array([node.number for node in nodes])
+    coordinates = np.array([node.coordinates.value for node in nodes], dtype=float)
 
-    coordinates = np.array(coordinates)
     flat_dimension = _get_flat_dimension_or_none(coordinates)
     if flat_dimension is not None:
         coordinates = np.delete(coordinates, obj=flat_dimension, axis=1)
-    return {n: c for n, c in zip(numbers, coordinates)}
-
+    return numbers, coordinates
 
-def _get_coordinate_and_temperature_arrays(
-    coordinates_by_number: dict[int, np.ndarray],
-    state: State,
-) -> tuple[np.ndarray]:
-    coordinates = []
-    temperatures = []
-    for number, coordinate in coordinates_by_number.items():
-        coordinates.append(coordinate)
-        temperatures.append(state.temperature[number - 1])
-
-    return np.array(coordinates), np.array(temperatures)
 
+def _read_density_lookup(water_properties_file: Path) -> Callable:
+    try:
+        table = read_nist_density_table(water_properties_file)
+    except ValueError as e:
+        logger.warning(f'{e} Falling back to triangulated interpolation.')
+    else:
+        return RegularGridInterpolator(
+            points=(table.pressures_MPa, table.temperatures_degC),
+            values=table.density_kg_m3,
+            bounds_error=False,
+            fill_value=np.nan,
+        )
 
-def _read_density_lookup(water_properties_file: Path) -> LinearNDInterpolator:
     raw_lookup = read_nist_lookup_table(water_properties_file)
     points, density_kg_m3 = [], []
     for pressure_temperature_key, properties in raw_lookup.items():
@@ -324,10 +671,14 @@ def _sample_node_numbers(grid: Grid, sampling_model: Optional[ModelConfig]) -> s
     if sampling_model is None:
         return set()
 
+    grid.validate_contains_node_numbers(sampling_model.params.get('explicit_nodes', []))
+    return _sample_node_numbers_from_zones(grid, sampling_model)
+
+
+def _sample_node_numbers_from_zones(grid: Grid, sampling_model: ModelConfig) -> set[int]:
     explicit_nodes = sampling_model.params.get('explicit_nodes', [])
     explicit_material_zones = sampling_model.params.get('explicit_material_zones', [])
     explicit_outside_zones = sampling_model.params.get('explicit_outside_zones', [])
-    grid.validate_contains_node_numbers(explicit_nodes)
 
     sampled_nodes = set(explicit_nodes)
     for zone_key in explicit_material_zones:
@@ -367,7 +718,7 @@ def _validate_hydrostat_config(config: HydrostatConfig, node_coordinates: np.nda
 
 
 def _validate_interpolation_model(model: ModelConfig, node_coordinates: np.ndarray):
-    if model.kind not in ('regular_grid'):
+    if model.kind not in ('regular_grid', 'adaptive'):
         raise NotImplementedError(f'Interpolation model kind {model.kind} not supported.')
 
     if model.kind == 'regular_grid':
@@ -380,3 +731,13 @@ def _validate_interpolation_model(model: ModelConfig, node_coordinates: np.ndarr
                 f'Number of sample dimensions ({sample_xy_dimensions}) '
                 f'inconsistent with grid dimensions ({node_xy_dimensions}).'
             )
+
+    if model.kind == 'adaptive':
+        if model.params.get('z_samples', 0) < 2:
+            raise ValueError('Adaptive interpolation requires at least 2 z_samples.')
+        if model.params.get('initial_samples', DEFAULT_ADAPTIVE_INITIAL_SAMPLES) < 2:
+            raise ValueError('Adaptive interpolation requires at least 2 initial_samples.')
+        if model.params.get('max_refinement_level', DEFAULT_ADAPTIVE_MAX_REFINEMENT_LEVEL) < 0:
+            raise ValueError('Adaptive interpolation max_refinement_level cannot be negative.')
+        if 'tolerance_MPa' not in model.params or model.params['tolerance_MPa'] <= 0:
+            raise ValueError('Adaptive interpolation requires a positive tolerance_MPa.')
@@ -0,0 +1,59 @@
+import logging
+from pathlib import Path
+import time
+from typing import Optional
+
+from fehmtk.common import get_max_relative_difference
+from fehmtk.config import RunConfig
+from fehmtk.file_interface import read_grid
+from .rock_properties import compute_rock_properties
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOLERANCE = 1e-9
+
+
+def compare_numeric_modes(config_file: Path, tolerance: Optional[float] = None) -> dict[str, float]:
+    """Compute rock properties for a config in both exact and fast numeric_mode, and report the maximum relative
+    difference between them for each property kind (over all nodes and Vector components). Differences are relative to
+    the exact value, or absolute where the exact value is 0. Returns the differences by property kind.
+    """
+    tolerance = tolerance if tolerance is not None else DEFAULT_TOLERANCE
+    logger.info(f'Reading configuration file: {config_file}')
+    exact_config = RunConfig.from_yaml(config_file, rock_properties_numeric_mode='exact')
+    fast_config = RunConfig.from_yaml(config_file, rock_properties_numeric_mode='fast')
+
+    logger.info('Parsing grid into memory')
+    grid = read_grid(
+        exact_config.files_config.grid,
+        outside_zone_file=exact_config.files_config.outside_zone,
+        material_zone_file=exact_config.files_config.material_zone,
+        read_elements=False,
+    )
+
+    property_stores_by_mode = {}
+    for numeric_mode, config in (('exact', exact_config), ('fast', fast_config)):
+        start = time.perf_counter()
+        property_stores_by_mode[numeric_mode] = compute_rock_properties(
+            grid,
+            config.rock_properties_config,
+            numeric_mode=numeric_mode,
+        )
+        logger.info('Computed rock properties in %s numeric_mode (%.3fs)', numeric_mode, time.perf_counter() - start)
+
+    differences = {}
+    for property_kind, exact_store in property_stores_by_mode['exact'].items():
+        differences[property_kind] = get_max_relative_difference(
+            exact_store.values.astype(float),
+            property_stores_by_mode['fast'][property_kind].values.astype(float),
+        )
+
+    for property_kind, difference in differences.items():
+        log = logger.info if difference <= tolerance else logger.warning
+        log('Max relative difference (%s): %.3G', property_kind, difference)
+
+    if all(difference <= tolerance for difference in differences.values()):
+        logger.info('Fast numeric_mode is within tolerance (%G) for all properties', tolerance)
+    else:
+        logger.warning('Fast numeric_mode exceeds tolerance (%G) for some properties', tolerance)
+    return differences
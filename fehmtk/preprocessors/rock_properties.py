@@ -1,21 +1,74 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from decimal import Decimal
+import functools
 import logging
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Optional, Union
 
-from fehmtk.config import ModelConfig, RockPropertiesConfig, RunConfig
-from fehmtk.fehm_objects import Node, Grid, Zone
-from fehmtk.file_interface import read_grid, write_compact_node_data
-from fehmtk.property_models import get_rock_property_model
+import numpy as np
+
+from fehmtk.common import get_max_relative_difference
+from fehmtk.config import NUMERIC_MODES, ModelConfig, RockPropertiesConfig, RunConfig
+from fehmtk.fehm_objects import Grid, Vector, Zone
+from fehmtk.file_interface import read_grid, write_compact_node_array
+from fehmtk.property_models import get_rock_property_model, get_rock_property_model_dependencies
+from fehmtk.property_models.expression import COORDINATE_VARIABLES
+from fehmtk.property_models.generic import VECTOR_PROPERTY_KINDS
+from .rock_properties_cache import (
+    RockPropertiesCache,
+    get_rock_properties_cache_files,
+    get_zone_property_fingerprint,
+    load_rock_properties_cache,
+)
 
 logger = logging.getLogger(__name__)
 
 PROPERTY_KINDS = ('grain_density', 'specific_heat', 'porosity', 'conductivity', 'permeability', 'compressibility')
+DEPTH_EVALUATIONS = ('nodes', 'unique', 'table')
+DEFAULT_DEPTH_TABLE_TOLERANCE = 1e-6
+INITIAL_DEPTH_TABLE_POINTS = 65
+
+
+@dataclass
+class PropertyStore:
+    """Values of one property, indexed by node number - 1, with a mask of nodes assigned so far."""
+    values: np.ndarray
+    assigned: np.ndarray
+
+    @classmethod
+    def empty(cls, n_nodes: int, vector_valued: bool) -> 'PropertyStore':
+        return cls(
+            values=np.empty((n_nodes, 3) if vector_valued else n_nodes, dtype=object),
+            assigned=np.zeros(n_nodes, dtype=bool),
+        )
 
+    def assign(self, node_numbers: np.ndarray, values: np.ndarray):
+        indexes = np.asarray(node_numbers, dtype=int) - 1
+        self.values[indexes] = values
+        self.assigned[indexes] = True
 
-def generate_rock_properties(config_file: Path):
+    def get_missing_nodes(self) -> np.ndarray:
+        return np.flatnonzero(~self.assigned) + 1
+
+    def to_dict(self) -> dict[int, Decimal]:
+        return dict(zip(range(1, len(self.values) + 1), self.values))
+
+
+def generate_rock_properties(
+    config_file: Path,
+    incremental: bool = False,
+    n_workers: Optional[int] = None,
+    numeric_mode: Optional[str] = None,
+    depth_evaluation: Optional[str] = None,
+    depth_table_tolerance: Optional[float] = None,
+):
+    numeric_mode = numeric_mode or 'exact'
+    depth_evaluation = depth_evaluation or 'nodes'
+    if depth_table_tolerance is None:
+        depth_table_tolerance = DEFAULT_DEPTH_TABLE_TOLERANCE
     logger.info(f'Reading configuration file: {config_file}')
-    config = RunConfig.from_yaml(config_file)
+    config = RunConfig.from_yaml(config_file, rock_properties_numeric_mode=numeric_mode)
 
     logger.info('Parsing grid into memory')
     grid = read_grid(
@@ -25,68 +78,435 @@ def generate_rock_properties(config_file: Path):
         read_elements=False,
     )
 
-    property_lookups = compute_rock_properties(grid, config.rock_properties_config)
-
-    logger.info('Writing property file (rock): %s', config.files_config.rock_properties)
-    output_by_node = {
-        node.number: (
-            property_lookups['grain_density'][node.number],
-            property_lookups['specific_heat'][node.number],
-            property_lookups['porosity'][node.number],
+    cache = None
+    if incremental:
+        cache = load_rock_properties_cache(
+            config.files_config.rock_properties,
+            nodes=grid.nodes,
+            numeric_mode=numeric_mode,
+            depth_table_tolerance=depth_table_tolerance if depth_evaluation == 'table' else None,
         )
-        for node in grid.nodes
-    }
-    write_compact_node_data(output_by_node, config.files_config.rock_properties, header='rock\n', footer='\n')
+
+    property_stores = compute_rock_properties(
+        grid,
+        config.rock_properties_config,
+        cache=cache,
+        n_workers=n_workers,
+        numeric_mode=numeric_mode,
+        depth_evaluation=depth_evaluation,
+        depth_table_tolerance=depth_table_tolerance,
+    )
+
+    node_numbers = np.arange(1, grid.n_nodes + 1)
+    rock_properties_file = config.files_config.rock_properties
+    rock_property_kinds = ('grain_density', 'specific_heat', 'porosity')
+    if cache is not None and cache.is_file_unchanged(rock_properties_file, rock_property_kinds):
+        logger.info('Property file unchanged, skipping (rock): %s', rock_properties_file)
+    else:
+        logger.info('Writing property file (rock): %s', rock_properties_file)
+        rock_values = np.column_stack([property_stores[property_kind].values for property_kind in rock_property_kinds])
+        write_compact_node_array(node_numbers, rock_values, rock_properties_file, header='rock\n', footer='\n')
 
     for property_kind, header, output_file in (
         ('conductivity', 'cond\n', config.files_config.conductivity),
         ('permeability', 'perm\n', config.files_config.permeability),
         ('compressibility', 'ppor\n   1\n', config.files_config.pore_pressure),
     ):
-        logger.info('Writing property file (%s): %s', header.strip(), output_file)
-        write_compact_node_data(property_lookups[property_kind], output_file, header=header, footer='\n')
+        if cache is not None and cache.is_file_unchanged(output_file, (property_kind,)):
+            logger.info('Property file unchanged, skipping (%s): %s', header.split()[0], output_file)
+            continue
+        logger.info('Writing property file (%s): %s', header.split()[0], output_file)
+        write_compact_node_array(
+            node_numbers,
+            property_stores[property_kind].values,
+            output_file,
+            header=header,
+            footer='\n',
+        )
+
+    if cache is not None:
+        for output_file in (
+            rock_properties_file,
+            config.files_config.conductivity,
+            config.files_config.permeability,
+            config.files_config.pore_pressure,
+        ):
+            cache.store_file_digest(output_file)
+        cache.to_files(*get_rock_properties_cache_files(rock_properties_file))
+        cache.log_summary()
+
+
+def compute_rock_properties(
+    grid: Grid,
+    rock_properties_config: RockPropertiesConfig,
+    reference: bool = False,
+    cache: Optional[RockPropertiesCache] = None,
+    n_workers: Optional[int] = None,
+    numeric_mode: str = 'exact',
+    depth_evaluation: str = 'nodes',
+    depth_table_tolerance: float = DEFAULT_DEPTH_TABLE_TOLERANCE,
+) -> dict[str, PropertyStore]:
+    """Compute rock properties for all nodes, zone by zone in assignment order, as a store of values by node number - 1
+    for each property kind.
+
+    Properties are evaluated on arrays of node depths, unless reference is set, in which case the scalar (Decimal)
+    models are evaluated node by node. Within a zone, each property is evaluated once, after the properties it depends
+    on (e.g. porosity before a porosity dependent permeability), which are passed to its model.
+
+    In exact numeric_mode, depths and coordinates are Decimal, and so are the values computed from them; arithmetic
+    on these object arrays is still per element, at about the cost of the reference models. In fast mode they are
+    float64, and models evaluate with NumPy floating point arithmetic (model params should also be float, see
+    RunConfig.from_yaml). Fast mode is not available for reference evaluation.
 
+    Since models depend only on depth (unless a model uses node coordinates), zones may be evaluated on fewer depths
+    than nodes, by depth_evaluation:
+    - nodes: evaluate at each node's depth
+    - unique: evaluate at each distinct depth in the zone, and gather values back to nodes (identical results)
+    - table: in fast numeric_mode only, evaluate on a regular depth table spanning the zone, refined until linear
+        interpolation between table depths is within depth_table_tolerance (relative) at table midpoints, and
+        interpolate values at node depths. Zones with fewer distinct depths than the table are evaluated as unique.
 
-def compute_rock_properties(grid: Grid, rock_properties_config: RockPropertiesConfig) -> dict[str, dict[int, Decimal]]:
+    If a cache is given, (zone, property) pairs whose fingerprint is unchanged are read from it instead, and the cache
+    is updated with the computed values.
+
+    With n_workers, zones are evaluated concurrently: in processes in exact numeric_mode (vectorized or reference), as
+    Decimal arithmetic on object arrays holds the GIL throughout, or in threads in fast mode, where NumPy releases it.
+    Results are assigned in zone_assignment_order regardless of the order in which they complete.
+    """
     _validate_config_all_zones_exist(rock_properties_config, zones=grid.material_zones)
+    _validate_overburden_column_models(rock_properties_config)
+    if numeric_mode not in NUMERIC_MODES:
+        raise ValueError(f'Unknown numeric_mode {numeric_mode!r}, expected one of {NUMERIC_MODES}')
+    if reference and numeric_mode != 'exact':
+        raise ValueError('Reference rock property models only support exact numeric_mode')
+    if depth_evaluation not in DEPTH_EVALUATIONS:
+        raise ValueError(f'Unknown depth_evaluation {depth_evaluation!r}, expected one of {DEPTH_EVALUATIONS}')
+    if reference and depth_evaluation != 'nodes':
+        raise ValueError('Reference rock property models are evaluated at each node (depth_evaluation: nodes)')
+    if depth_evaluation == 'table' and numeric_mode != 'fast':
+        raise ValueError('Interpolated depth tables (depth_evaluation: table) require fast numeric_mode')
+    dtype = float if numeric_mode == 'fast' else object
 
     model_lookup_by_zone_and_property = rock_properties_config.create_model_lookup_by_zone_and_property()
-    property_lookups = {}
+    if reference:
+        compute_zone_properties = _compute_rock_properties_for_zone
+    else:
+        compute_zone_properties = functools.partial(
+            _compute_rock_properties_for_zone_vectorized,
+            depth_evaluation=depth_evaluation,
+            depth_table_tolerance=depth_table_tolerance,
+        )
+    if cache is not None:
+        owned_nodes_by_zone = _get_owned_nodes_by_zone(grid, rock_properties_config.zone_assignment_order)
+
+    property_stores = {
+        property_kind: PropertyStore.empty(grid.n_nodes, vector_valued=property_kind in VECTOR_PROPERTY_KINDS)
+        for property_kind in PROPERTY_KINDS
+    }
+    zone_assignments = []
+    zone_tasks = []
     for zone in rock_properties_config.zone_assignment_order:
-        logger.info('Computing properties for zone (%d)', zone)
         model_config_by_property_kind = model_lookup_by_zone_and_property[zone]
-        zone_properties = _compute_rock_properties_for_zone(
-            model_config_by_property_kind,
-            nodes=grid.get_nodes_in_material_zone(zone),
-        )
-        property_lookups = _update_with_zone_properties(property_lookups, zone_properties)
+        nodes = grid.get_nodes_in_material_zone(zone)
+
+        reused_values = {}
+        if cache is not None:
+            owned_node_numbers = [node.number for node in owned_nodes_by_zone[zone]]
+            for property_kind in PROPERTY_KINDS:
+                values_by_node = cache.get_reusable_values(
+                    zone,
+                    property_kind,
+                    fingerprint=get_zone_property_fingerprint(
+                        model_config_by_property_kind,
+                        property_kind,
+                        owned_nodes=owned_nodes_by_zone[zone],
+                    ),
+                    owned_nodes=owned_node_numbers,
+                )
+                if values_by_node is not None:
+                    reused_values[property_kind] = (
+                        owned_node_numbers,
+                        _to_value_array(list(values_by_node.values()), property_kind),
+                    )
 
-    _validate_all_nodes_covered(property_lookups, grid.n_nodes)
-    return property_lookups
+        property_kinds = [kind for kind in PROPERTY_KINDS if kind not in reused_values]
+        if property_kinds:
+            logger.info('Computing properties for zone (%s): %s', zone, ', '.join(property_kinds))
+            zone_tasks.append((
+                model_config_by_property_kind,
+                np.array([node.depth for node in nodes], dtype=dtype),
+                [node.coordinates.value for node in nodes],
+                property_kinds,
+            ))
+        node_numbers = np.array([node.number for node in nodes], dtype=int)
+        zone_assignments.append((node_numbers, bool(property_kinds), reused_values))
+
+    computed_zone_values = iter(
+        _evaluate_zones(compute_zone_properties, zone_tasks, n_workers=n_workers, use_processes=dtype is object)
+    )
+    for node_numbers, computed, reused_values in zone_assignments:  # in assignment order; later zones take precedence
+        for property_kind, (owned_node_numbers, values) in reused_values.items():
+            property_stores[property_kind].assign(owned_node_numbers, values)
+        if computed:
+            for property_kind, values in next(computed_zone_values).items():
+                property_stores[property_kind].assign(node_numbers, values)
+
+    _validate_all_nodes_covered(property_stores)
+    if cache is not None:
+        cache.values_by_property_kind = {
+            property_kind: store.to_dict() for property_kind, store in property_stores.items()
+        }
+    return property_stores
+
+
+def _evaluate_zones(
+    compute_zone_properties: Callable,
+    zone_tasks: list[tuple],
+    n_workers: Optional[int],
+    use_processes: bool,
+) -> list[dict[str, np.ndarray]]:
+    if not n_workers or n_workers == 1 or len(zone_tasks) < 2:
+        return [compute_zone_properties(*task) for task in zone_tasks]
+
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    logger.info('Evaluating %d zones with %d workers (%s)', len(zone_tasks), n_workers, executor_class.__name__)
+    with executor_class(max_workers=n_workers) as executor:
+        return list(executor.map(compute_zone_properties, *zip(*zone_tasks)))
 
 
 def _compute_rock_properties_for_zone(
     model_config_by_property_kind: dict[str, ModelConfig],
-    nodes: Iterable[Node],
-) -> dict[str, dict[int, Decimal]]:
-    zone_properties = {}
-    for property_kind, model_config in model_config_by_property_kind.items():
+    depths: np.ndarray,
+    coordinates: list[tuple[Decimal]],
+    property_kinds: Iterable[str] = PROPERTY_KINDS,
+) -> dict[str, np.ndarray]:
+    values_by_property_kind = _get_coordinate_values(coordinates, dtype=object)
+    for property_kind in _get_property_evaluation_order(model_config_by_property_kind, property_kinds):
+        model_config = model_config_by_property_kind[property_kind]
         rock_property_model = get_rock_property_model(property_kind, model_config.kind)
+        dependency_kinds = get_rock_property_model_dependencies(property_kind, model_config.kind, model_config.params)
 
-        zone_properties[property_kind] = {
-            node.number: rock_property_model(node.depth, model_config_by_property_kind, property_kind)
-            for node in nodes
-        }
-    return zone_properties
+        if not dependency_kinds:
+            values = [rock_property_model(depth, model_config_by_property_kind, property_kind) for depth in depths]
+        else:
+            values = [
+                rock_property_model(
+                    depth,
+                    model_config_by_property_kind,
+                    property_kind,
+                    dependencies={kind: values_by_property_kind[kind][i] for kind in dependency_kinds},
+                )
+                for i, depth in enumerate(depths)
+            ]
+        values_by_property_kind[property_kind] = _to_value_array(values, property_kind)
+
+    return {property_kind: values_by_property_kind[property_kind] for property_kind in property_kinds}
+
+
+def _compute_rock_properties_for_zone_vectorized(
+    model_config_by_property_kind: dict[str, ModelConfig],
+    depths: np.ndarray,
+    coordinates: list[tuple[Decimal]],
+    property_kinds: Iterable[str] = PROPERTY_KINDS,
+    depth_evaluation: str = 'nodes',
+    depth_table_tolerance: float = DEFAULT_DEPTH_TABLE_TOLERANCE,
+) -> dict[str, np.ndarray]:
+    """Evaluate properties on arrays of node depths: Decimal (object) depths for exact values, or float for fast."""
+    evaluation_order = _get_property_evaluation_order(model_config_by_property_kind, property_kinds)
+    if depth_evaluation != 'nodes' and _uses_coordinates(model_config_by_property_kind, evaluation_order):
+        depth_evaluation = 'nodes'
+
+    if depth_evaluation == 'nodes':
+        coordinate_values = _get_coordinate_values(coordinates, dtype=depths.dtype)
+        values_by_property_kind = _evaluate_on_depths(
+            model_config_by_property_kind,
+            depths,
+            coordinate_values,
+            evaluation_order,
+        )
+    elif depth_evaluation == 'table':
+        values_by_property_kind = _evaluate_on_depth_table(
+            model_config_by_property_kind,
+            depths,
+            evaluation_order,
+            tolerance=depth_table_tolerance,
+        )
+    else:
+        values_by_property_kind = _evaluate_on_unique_depths(model_config_by_property_kind, depths, evaluation_order)
+
+    return {property_kind: values_by_property_kind[property_kind] for property_kind in property_kinds}
+
+
+def _evaluate_on_unique_depths(
+    model_config_by_property_kind: dict[str, ModelConfig],
+    depths: np.ndarray,
+    evaluation_order: list[str],
+) -> dict[str, np.ndarray]:
+    unique_depths, inverse = np.unique(depths, return_inverse=True)
+    logger.debug('Evaluating zone on %d unique depths for %d nodes', len(unique_depths), len(depths))
+    values_by_property_kind = _evaluate_on_depths(model_config_by_property_kind, unique_depths, {}, evaluation_order)
+    return {property_kind: values[inverse] for property_kind, values in values_by_property_kind.items()}
+
+
+def _evaluate_on_depth_table(
+    model_config_by_property_kind: dict[str, ModelConfig],
+    depths: np.ndarray,
+    evaluation_order: list[str],
+    tolerance: float,
+) -> dict[str, np.ndarray]:
+    """Evaluate on a regular table of depths, doubling its resolution until interpolation of each property is within
+    tolerance. Properties still outside tolerance once the table is as large as the number of distinct depths, or
+    whose interpolation error does not at least halve as the table doubles (e.g. piecewise constant models), are
+    evaluated at unique depths instead.
+    """
+    unique_depths = np.unique(depths)
+    values_by_property_kind = {}
+    remaining_kinds = list(evaluation_order)
+    errors_by_property_kind = {}
+    n_points = INITIAL_DEPTH_TABLE_POINTS
+    while remaining_kinds and n_points < len(unique_depths):
+        order = _get_property_evaluation_order(model_config_by_property_kind, remaining_kinds)
+        table_depths = np.linspace(unique_depths[0], unique_depths[-1], n_points)
+        midpoint_depths = (table_depths[1:] + table_depths[:-1]) / 2
+        table_values = _evaluate_on_depths(model_config_by_property_kind, table_depths, {}, order)
+        midpoint_values = _evaluate_on_depths(model_config_by_property_kind, midpoint_depths, {}, order)
+
+        for property_kind in list(remaining_kinds):
+            error = get_max_relative_difference(
+                midpoint_values[property_kind],
+                _interpolate_depth_table(midpoint_depths, table_depths, table_values[property_kind]),
+            )
+            if error <= tolerance:
+                logger.debug('Interpolating %s from a table of %d depths', property_kind, n_points)
+                values_by_property_kind[property_kind] = _interpolate_depth_table(
+                    depths,
+                    table_depths,
+                    table_values[property_kind],
+                )
+                remaining_kinds.remove(property_kind)
+            elif error > errors_by_property_kind.get(property_kind, np.inf) / 2:
+                remaining_kinds.remove(property_kind)
+            errors_by_property_kind[property_kind] = error
+        n_points = 2 * n_points - 1
+
+    unique_kinds = [kind for kind in evaluation_order if kind not in values_by_property_kind]
+    if unique_kinds:
+        order = _get_property_evaluation_order(model_config_by_property_kind, unique_kinds)
+        unique_values = _evaluate_on_unique_depths(model_config_by_property_kind, depths, order)
+        values_by_property_kind.update({property_kind: unique_values[property_kind] for property_kind in unique_kinds})
+    return {property_kind: values_by_property_kind[property_kind] for property_kind in evaluation_order}
+
+
+def _evaluate_on_depths(
+    model_config_by_property_kind: dict[str, ModelConfig],
+    depths: np.ndarray,
+    coordinate_values: dict[str, np.ndarray],
+    evaluation_order: list[str],
+) -> dict[str, np.ndarray]:
+    values_by_property_kind = dict(coordinate_values)
+    for property_kind in evaluation_order:
+        model_config = model_config_by_property_kind[property_kind]
+        rock_property_model = get_rock_property_model(property_kind, model_config.kind, vectorized=True)
+        dependency_kinds = get_rock_property_model_dependencies(property_kind, model_config.kind, model_config.params)
+
+        if not dependency_kinds:
+            values = rock_property_model(depths, model_config_by_property_kind, property_kind)
+        else:
+            dependencies = {kind: values_by_property_kind[kind] for kind in dependency_kinds}
+            values = rock_property_model(depths, model_config_by_property_kind, property_kind, dependencies)
+        values_by_property_kind[property_kind] = values
+
+    return {property_kind: values_by_property_kind[property_kind] for property_kind in evaluation_order}
 
 
-def _update_with_zone_properties(property_lookups: dict, zone_properties: dict) -> dict:
-    combined = {}
-    for property_kind in PROPERTY_KINDS:
-        property_lookup = property_lookups.get(property_kind, {}).copy()
-        property_lookup.update(zone_properties[property_kind])
-        combined[property_kind] = property_lookup
-    return combined
+def _interpolate_depth_table(depths: np.ndarray, table_depths: np.ndarray, table_values: np.ndarray) -> np.ndarray:
+    """Linearly interpolate table values at depths, column by column for Vector valued (n, 3) values.
+    >>> _interpolate_depth_table(np.array([0.5, 1.5]), np.array([0., 1., 2.]), np.array([[0., 2., 4.], [2., 2., 0.]]).T)
+    array([[1., 2.],
+           [3., 1.]])
+    """
+    if table_values.ndim == 1:
+        return np.interp(depths, table_depths, table_values)
+    return np.column_stack([np.interp(depths, table_depths, column) for column in table_values.T])
+
+
+def _uses_coordinates(model_config_by_property_kind: dict[str, ModelConfig], property_kinds: Iterable[str]) -> bool:
+    for property_kind in property_kinds:
+        model_config = model_config_by_property_kind[property_kind]
+        dependency_kinds = get_rock_property_model_dependencies(property_kind, model_config.kind, model_config.params)
+        if set(dependency_kinds) & set(COORDINATE_VARIABLES):
+            return True
+    return False
+
+
+def _get_coordinate_values(coordinates: list[tuple[Decimal]], dtype: Union[type, np.dtype]) -> dict[str, np.ndarray]:
+    coordinate_array = np.empty((len(coordinates), len(COORDINATE_VARIABLES)), dtype=dtype)
+    coordinate_array[:] = coordinates
+    return dict(zip(COORDINATE_VARIABLES, coordinate_array.T))
+
+
+def _to_value_array(values: list, property_kind: str) -> np.ndarray:
+    """Object array of values, with Vector values as (n, 3) rows."""
+    if property_kind not in VECTOR_PROPERTY_KINDS:
+        return np.array(values, dtype=object)
+
+    value_array = np.empty((len(values), 3), dtype=object)
+    for i, value in enumerate(values):
+        value_array[i] = value.value if isinstance(value, Vector) else value
+    return value_array
+
+
+def _get_property_evaluation_order(
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kinds: Optional[Iterable[str]] = None,
+) -> list[str]:
+    """Order property kinds (by default, all configured) so that each comes after the properties it depends on.
+    >>> from fehmtk.config import ModelConfig
+    >>> _get_property_evaluation_order({
+    ...     'permeability': ModelConfig('void_ratio_exponential', {}),
+    ...     'porosity': ModelConfig('constant', {}),
+    ... })
+    ['porosity', 'permeability']
+    """
+    order = []
+    visiting = set()
+
+    def visit(property_kind: str):
+        if property_kind in order:
+            return
+        if property_kind in COORDINATE_VARIABLES:
+            return
+        if property_kind in visiting:
+            raise ValueError(f'Circular dependency between rock property models at {property_kind}')
+        if property_kind not in model_config_by_property_kind:
+            raise KeyError(f'Rock property model depends on {property_kind}, which is not configured')
+
+        visiting.add(property_kind)
+        model_config = model_config_by_property_kind[property_kind]
+        dependency_kinds = get_rock_property_model_dependencies(property_kind, model_config.kind, model_config.params)
+        for dependency_kind in dependency_kinds:
+            visit(dependency_kind)
+        visiting.remove(property_kind)
+        order.append(property_kind)
+
+    for property_kind in property_kinds if property_kinds is not None else model_config_by_property_kind:
+        visit(property_kind)
+    return order
+
+
+def _get_owned_nodes_by_zone(grid: Grid, zone_assignment_order: list[Union[int, str]]) -> dict[Union[int, str], list]:
+    """Nodes whose properties are set by each zone, i.e. those not reassigned by a later zone in the order."""
+    owner_by_node = {}
+    nodes_by_number = {}
+    for zone in zone_assignment_order:
+        for node in grid.get_nodes_in_material_zone(zone):
+            owner_by_node[node.number] = zone
+            nodes_by_number[node.number] = node
+
+    owned_nodes_by_zone = {zone: [] for zone in zone_assignment_order}
+    for node_number in sorted(owner_by_node):
+        owned_nodes_by_zone[owner_by_node[node_number]].append(nodes_by_number[node_number])
+    return owned_nodes_by_zone
 
 
 def _validate_config_all_zones_exist(config: RockPropertiesConfig, zones: tuple[Zone]):
@@ -108,9 +528,25 @@ def _validate_config_all_zones_exist(config: RockPropertiesConfig, zones: tuple[
             raise ValueError(f'Mismatched property kinds in zone {zone}: {mismatched_property_kinds}')
 
 
-def _validate_all_nodes_covered(property_lookups: dict, n_nodes: int):
-    for property_kind, values_by_node in property_lookups.items():
-        expected_nodes = set(range(1, n_nodes + 1))
-        missing_nodes = expected_nodes - values_by_node.keys()
-        if missing_nodes:
-            raise ValueError(f'Computed {property_kind} missing values for nodes: {missing_nodes}')
+def _validate_overburden_column_models(config: RockPropertiesConfig):
+    """The overburden compressibility model evaluates porosity and grain density down a column of depths, with no
+    node coordinates or other properties, so their models may only depend on depth in zones using it."""
+    for zone, model_config_by_property_kind in config.create_model_lookup_by_zone_and_property().items():
+        compressibility_config = model_config_by_property_kind.get('compressibility')
+        if compressibility_config is None or compressibility_config.kind != 'overburden':
+            continue
+
+        for property_kind in ('porosity', 'grain_density'):
+            model_config = model_config_by_property_kind[property_kind]
+            dependencies = get_rock_property_model_dependencies(property_kind, model_config.kind, model_config.params)
+            if dependencies:
+                raise ValueError(
+                    f'The {property_kind} model in zone {zone} depends on {", ".join(dependencies)}, but overburden '
+                    f'compressibility evaluates {property_kind} at depths alone; use a depth-only {property_kind} model'
+                )
+
+
+def _validate_all_nodes_covered(property_stores: dict[str, PropertyStore]):
+    for property_kind, store in property_stores.items():
+        if not store.assigned.all():
+            raise ValueError(f'Computed {property_kind} missing values for nodes: {store.get_missing_nodes().tolist()}')
@@ -0,0 +1,276 @@
+from decimal import Decimal
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+import numpy as np
+
+from fehmtk.config import ModelConfig
+from fehmtk.fehm_objects import Node, Vector
+from fehmtk.property_models import get_rock_property_model_dependencies
+from fehmtk.property_models.expression import COORDINATE_VARIABLES
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_SUFFIX = '.rock_properties_manifest.json'
+VALUES_SUFFIX = '.rock_properties_cache.npz'
+MANIFEST_VERSION = 1
+
+
+class RockPropertiesCache:
+    """Rock property values computed by a previous run, with the fingerprints they were computed from.
+
+    Each (zone, property kind) pair is fingerprinted from its model config, the configs of the properties it depends
+    on, and the numbers and depths of the nodes the zone owns (i.e. nodes not reassigned by a later zone in
+    zone_assignment_order). Values for the owned nodes can be reused while the fingerprint is unchanged.
+    """
+
+    def __init__(
+        self,
+        *,
+        grid_digest: str,
+        numeric_mode: str = 'exact',
+        depth_table_tolerance: Optional[float] = None,
+        fingerprints: Optional[dict[str, str]] = None,
+        file_digests: Optional[dict[str, str]] = None,
+        values_by_property_kind: Optional[dict[str, dict[int, Any]]] = None,
+    ):
+        self.grid_digest = grid_digest
+        self.numeric_mode = numeric_mode
+        self.depth_table_tolerance = depth_table_tolerance
+        self.fingerprints = fingerprints if fingerprints is not None else {}
+        self.file_digests = file_digests if file_digests is not None else {}
+        self.values_by_property_kind = values_by_property_kind if values_by_property_kind is not None else {}
+        self.previous_fingerprints = {}
+        self.previous_values_by_property_kind = {}
+        self.n_reused = 0
+        self.n_computed = 0
+
+    @classmethod
+    def from_files(cls, manifest_file: Path, values_file: Path) -> 'RockPropertiesCache':
+        manifest = json.loads(manifest_file.read_text())
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f'Unsupported manifest version {manifest.get("version")}')
+
+        values_by_property_kind = {}
+        with np.load(values_file) as data:
+            for property_kind in manifest['property_kinds']:
+                values_by_property_kind[property_kind] = _deserialize_values(
+                    data[f'{property_kind}_nodes'],
+                    data[f'{property_kind}_values'],
+                    is_float=bool(data[f'{property_kind}_is_float']),
+                )
+        return cls(
+            grid_digest=manifest['grid_digest'],
+            numeric_mode=manifest.get('numeric_mode', 'exact'),
+            depth_table_tolerance=manifest.get('depth_table_tolerance'),
+            fingerprints=manifest['fingerprints'],
+            file_digests=manifest['file_digests'],
+            values_by_property_kind=values_by_property_kind,
+        )
+
+    def to_files(self, manifest_file: Path, values_file: Path):
+        """Write values, then the manifest, through temporary files so that an interrupted write leaves no manifest
+        pointing at partial values."""
+        tmp_suffix = f'.{os.getpid()}.tmp'
+        arrays = {}
+        for property_kind, values_by_node in self.values_by_property_kind.items():
+            nodes, values, is_float = _serialize_values(values_by_node)
+            arrays[f'{property_kind}_nodes'] = nodes
+            arrays[f'{property_kind}_values'] = values
+            arrays[f'{property_kind}_is_float'] = np.array(is_float)
+
+        tmp_values_file = values_file.with_name(values_file.name + tmp_suffix)
+        with open(tmp_values_file, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_values_file, values_file)
+
+        tmp_manifest_file = manifest_file.with_name(manifest_file.name + tmp_suffix)
+        tmp_manifest_file.write_text(json.dumps({
+            'version': MANIFEST_VERSION,
+            'grid_digest': self.grid_digest,
+            'numeric_mode': self.numeric_mode,
+            'depth_table_tolerance': self.depth_table_tolerance,
+            'property_kinds': list(self.values_by_property_kind),
+            'fingerprints': self.fingerprints,
+            'file_digests': self.file_digests,
+        }, indent=2))
+        os.replace(tmp_manifest_file, manifest_file)
+
+    def get_reusable_values(self, zone: Union[int, str], property_kind: str, fingerprint: str, owned_nodes: list[int]):
+        """Values of a property for the nodes owned by zone, or None if they must be recomputed."""
+        key = _get_fingerprint_key(zone, property_kind)
+        self.fingerprints[key] = fingerprint
+        if self.previous_fingerprints.get(key) != fingerprint:
+            self.n_computed += 1
+            return None
+
+        self.n_reused += 1
+        previous_values = self.previous_values_by_property_kind[property_kind]
+        return {node: previous_values[node] for node in owned_nodes}
+
+    def is_file_unchanged(self, output_file: Path, property_kinds: Iterable[str]) -> bool:
+        """Whether output_file is as last written, and the values of the properties it holds are unchanged."""
+        previous_digest = self.file_digests.get(output_file.name)
+        if previous_digest is None or not output_file.exists() or get_file_digest(output_file) != previous_digest:
+            return False
+
+        for property_kind in property_kinds:
+            previous_values = self.previous_values_by_property_kind.get(property_kind)
+            if previous_values is None:
+                return False
+            if not _serialized_values_equal(previous_values, self.values_by_property_kind[property_kind]):
+                return False
+        return True
+
+    def store_file_digest(self, output_file: Path):
+        self.file_digests[output_file.name] = get_file_digest(output_file)
+
+    def log_summary(self):
+        logger.info(
+            'Rock properties cache: %d zone properties reused, %d computed',
+            self.n_reused,
+            self.n_computed,
+        )
+
+
+def load_rock_properties_cache(
+    rock_properties_file: Path,
+    nodes: Iterable[Node],
+    numeric_mode: str = 'exact',
+    depth_table_tolerance: Optional[float] = None,
+) -> RockPropertiesCache:
+    """Load values cached by a previous run beside rock_properties_file. A cache for a different grid, or computed in
+    a different numeric_mode or with a different depth table tolerance (None if not interpolated), is ignored."""
+    cache = RockPropertiesCache(
+        grid_digest=get_nodes_digest(nodes),
+        numeric_mode=numeric_mode,
+        depth_table_tolerance=depth_table_tolerance,
+    )
+    manifest_file, values_file = get_rock_properties_cache_files(rock_properties_file)
+    if not manifest_file.exists() or not values_file.exists():
+        logger.info(f'No rock properties manifest found at {manifest_file}, computing all zones.')
+        return cache
+
+    try:
+        previous_cache = RockPropertiesCache.from_files(manifest_file, values_file)
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning(f'Could not read rock properties cache {manifest_file} ({e}), computing all zones.')
+        return cache
+
+    if previous_cache.grid_digest != cache.grid_digest:
+        logger.info('Grid changed since rock properties were cached, computing all zones.')
+        return cache
+
+    if previous_cache.numeric_mode != cache.numeric_mode:
+        logger.info(
+            'Rock properties were cached in %s numeric_mode, computing all zones in %s mode.',
+            previous_cache.numeric_mode,
+            cache.numeric_mode,
+        )
+        return cache
+
+    if previous_cache.depth_table_tolerance != cache.depth_table_tolerance:
+        logger.info('Depth table tolerance changed since rock properties were cached, computing all zones.')
+        return cache
+
+    logger.info(f'Read rock properties manifest {manifest_file}')
+    cache.previous_fingerprints = previous_cache.fingerprints
+    cache.previous_values_by_property_kind = previous_cache.values_by_property_kind
+    cache.file_digests = previous_cache.file_digests
+    return cache
+
+
+def get_rock_properties_cache_files(rock_properties_file: Path) -> tuple[Path, Path]:
+    return (
+        rock_properties_file.with_name(rock_properties_file.name + MANIFEST_SUFFIX),
+        rock_properties_file.with_name(rock_properties_file.name + VALUES_SUFFIX),
+    )
+
+
+def get_zone_property_fingerprint(
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+    owned_nodes: Iterable[Node],
+) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    for kind in sorted(_get_transitive_dependencies(model_config_by_property_kind, property_kind)):
+        model_config = model_config_by_property_kind[kind]
+        hasher.update(f'{kind}={model_config.kind}:{_serialize_params(model_config.params)};'.encode())
+    hasher.update(get_nodes_digest(owned_nodes).encode())
+    return hasher.hexdigest()
+
+
+def get_nodes_digest(nodes: Iterable[Node]) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    for node in nodes:
+        hasher.update(f'{node.number}:{node.depth}:{node.coordinates.value};'.encode())
+    return hasher.hexdigest()
+
+
+def get_file_digest(file: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(file, 'rb') as f:
+        for block in iter(lambda: f.read(2 ** 20), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def _get_transitive_dependencies(model_config_by_property_kind: dict[str, ModelConfig], property_kind: str) -> set:
+    kinds = {property_kind}
+    model_config = model_config_by_property_kind[property_kind]
+    for dependency_kind in get_rock_property_model_dependencies(property_kind, model_config.kind, model_config.params):
+        if dependency_kind not in COORDINATE_VARIABLES:  # node coordinates are fingerprinted with the nodes
+            kinds |= _get_transitive_dependencies(model_config_by_property_kind, dependency_kind)
+    return kinds
+
+
+def _serialize_params(params: dict) -> str:
+    """
+    >>> _serialize_params({'b': Decimal('1.0'), 'a': {'y': [1, 2], 'x': 'poly'}})
+    "{a={x='poly',y=[1, 2]},b=Decimal('1.0')}"
+    """
+    if not isinstance(params, dict):
+        return repr(params)
+    return '{' + ','.join(f'{key}={_serialize_params(params[key])}' for key in sorted(params)) + '}'
+
+
+def _get_fingerprint_key(zone: Union[int, str], property_kind: str) -> str:
+    return f'{zone}:{property_kind}'
+
+
+def _serialize_values(values_by_node: dict[int, Any]) -> tuple[np.ndarray, np.ndarray, bool]:
+    """Values as strings, which round trip Decimals exactly (including trailing zeros, which are written out)."""
+    nodes = np.array(sorted(values_by_node), dtype=int)
+    rows = [_as_row(values_by_node[node]) for node in nodes]
+    is_float = bool(rows) and not isinstance(np.ravel(rows[0])[0], Decimal)
+    values = np.array([[str(v) for v in np.ravel(row)] for row in rows], dtype=str)
+    if not rows or np.ndim(rows[0]) == 0:
+        values = values.reshape(len(rows))
+    return nodes, values, is_float
+
+
+def _deserialize_values(nodes: np.ndarray, values: np.ndarray, is_float: bool) -> dict[int, Any]:
+    parse = float if is_float else Decimal
+    if values.ndim == 1:
+        return {int(node): parse(value) for node, value in zip(nodes, values)}
+    return {int(node): np.array([parse(v) for v in row], dtype=object) for node, row in zip(nodes, values)}
+
+
+def _serialized_values_equal(values_by_node: dict[int, Any], other_values_by_node: dict[int, Any]) -> bool:
+    nodes, values, is_float = _serialize_values(values_by_node)
+    other_nodes, other_values, other_is_float = _serialize_values(other_values_by_node)
+    return (
+        is_float == other_is_float
+        and np.array_equal(nodes, other_nodes)
+        and np.array_equal(values, other_values)
+    )
+
+
+def _as_row(value: Any) -> Any:
+    if isinstance(value, Vector):
+        return np.array(value.value, dtype=object)
+    return value
@@ -1 +1 @@
-from .models import get_rock_property_model
+from .models import get_rock_property_model, get_rock_property_model_dependencies
@@ -1,11 +1,14 @@
 from decimal import Decimal
 import math
+from typing import Optional
 
 import numpy as np
 
 from ..config import ModelConfig
-from .generic import get_generic_model
-from .porosity import get_porosity_model
+from .generic import cast_like, cast_params_like, get_generic_array_model
+from .porosity import evaluate_porosity, evaluate_porosity_array, get_porosity_array_model
+
+MIN_OVERBURDEN_COLUMN_DEPTH = 1000
 
 
 def get_compressibility_models_by_kind() -> dict:
@@ -14,47 +17,46 @@ def get_compressibility_models_by_kind() -> dict:
     }
 
 
+def get_compressibility_array_models_by_kind() -> dict:
+    return {
+        'overburden': overburden_array,
+    }
+
+
 class Overburden:
     def __init__(self):
         self.model_config_by_property_kind = None
         self.params = None
-        self.porosity_model = None
-        self.rho_wet_bulk_column = None
+        self.cumulative_overburden_column = None
 
     def __call__(
         self,
         depth: Decimal,
         model_config_by_property_kind: dict[str, ModelConfig],
         property_kind: str,
+        dependencies: Optional[dict] = None,
     ) -> Decimal:
         if (
             self.model_config_by_property_kind is None
             or self.model_config_by_property_kind != model_config_by_property_kind
-            or depth > len(self.rho_wet_bulk_column)
+            or math.ceil(depth) >= len(self.cumulative_overburden_column)
         ):
-            self._precompute(model_config_by_property_kind, depth=depth if depth >= 1000 else 1000)
+            self._precompute(model_config_by_property_kind, depth=depth)
 
-        return self._model(depth=depth)
+        porosity = evaluate_porosity(depth, model_config_by_property_kind, dependencies)
+        return self._model(depth=depth, porosity=porosity)
 
     def _precompute(self, model_config_by_property_kind: dict[str, ModelConfig], depth: Decimal):
         self.model_config_by_property_kind = model_config_by_property_kind
         self.params = self.model_config_by_property_kind['compressibility'].params
-        self.porosity_model = get_porosity_model(self.model_config_by_property_kind['porosity'].kind)
-        grain_density_model = get_generic_model(  # no grain_density-specific models exist currently, using generic
-            model_kind=self.model_config_by_property_kind['grain_density'].kind
+        self.cumulative_overburden_column = _get_cumulative_overburden_column(
+            model_config_by_property_kind,
+            column_depth=max(MIN_OVERBURDEN_COLUMN_DEPTH, math.ceil(depth)),
+            params=self.params,
+            dtype=object,
         )
-        depth_column_1m_spacing = list(range(math.floor(depth) + 1)) if depth else [0]
-        porosity_column = np.array([
-            self.porosity_model(d, self.model_config_by_property_kind, 'porosity')
-            for d in depth_column_1m_spacing
-        ])
-        grain_density_column = np.array([
-            grain_density_model(depth, self.model_config_by_property_kind, 'grain_density')
-            for d in depth_column_1m_spacing
-        ])
-        self.rho_wet_bulk_column = (1 - porosity_column) * grain_density_column + porosity_column * self.params['rhow']
-
-    def _model(self, depth: Decimal) -> Decimal:
+
+    def _model(self, depth: Decimal, porosity: Decimal) -> Decimal:
         """Compressibility as a function of depth based on an overburden calculation:
         0.435 * A * (1 - p) / b
         where A is a constant and overburden b is calculated as described below. Porosity p is calculated separately
@@ -65,17 +67,82 @@ class Overburden:
         where G, W, and B are constants; G is the acceleration of gravity, W is the density of water, and B is the
         minimum allowed overburden. Grain density g is calculated separately with its own property model.
 
+        The column is summed down to the next whole meter below the node, unless interpolate_depth is set, in which
+        case the sum is interpolated linearly between the whole meters above and below the node.
+
         Required params:
         a               [A]  (numeric)
         grav            [G]  (numeric)
         rhow            [W]  (numeric)
         min_overburden  [B]  (numeric)
+
+        Optional params:
+        interpolate_depth    (boolean, default false)
         """
-        a, grav, rhow, min_overburden = (
-            self.params['a'], self.params['grav'], self.params['rhow'], self.params['min_overburden']
-        )
-        porosity = self.porosity_model(depth, self.model_config_by_property_kind, 'porosity')
-        rho_wet_bulk_column_to_depth = self.rho_wet_bulk_column[:math.ceil(depth) + 1]
+        a, grav, min_overburden = self.params['a'], self.params['grav'], self.params['min_overburden']
+        column = self.cumulative_overburden_column
+        if self.params.get('interpolate_depth', False):
+            lower = math.floor(depth)
+            column_sum = column[lower] + (depth - lower) * (column[math.ceil(depth)] - column[lower])
+        else:
+            column_sum = column[math.ceil(depth)]
 
-        overburden = max(grav * sum(rho_wet_bulk_column_to_depth - rhow), min_overburden)
+        overburden = max(grav * column_sum, min_overburden)
         return Decimal('0.435') * a * (1 - porosity) / overburden
+
+
+def overburden_array(
+    depths: np.ndarray,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+    dependencies: Optional[dict] = None,
+) -> np.ndarray:
+    """Array version of the overburden compressibility model (see Overburden._model).
+
+    The wet bulk density column is summed once, and the overburden at each depth is read from its cumulative sum.
+    """
+    params = cast_params_like(model_config_by_property_kind[property_kind].params, depths)
+    a, grav, min_overburden = params['a'], params['grav'], params['min_overburden']
+
+    if depths.dtype == object:
+        floor_depths = np.array([math.floor(depth) for depth in depths], dtype=int)
+        ceil_depths = np.array([math.ceil(depth) for depth in depths], dtype=int)
+    else:
+        floor_depths, ceil_depths = np.floor(depths).astype(int), np.ceil(depths).astype(int)
+
+    column = _get_cumulative_overburden_column(
+        model_config_by_property_kind,
+        column_depth=max(MIN_OVERBURDEN_COLUMN_DEPTH, ceil_depths.max(initial=0)),
+        params=params,
+        dtype=depths.dtype,
+    )
+    if params.get('interpolate_depth', False):
+        column_sums = column[floor_depths] + (depths - floor_depths) * (column[ceil_depths] - column[floor_depths])
+    else:
+        column_sums = column[ceil_depths]
+
+    cumulative_overburden = grav * column_sums
+    overburden = np.where(min_overburden > cumulative_overburden, min_overburden, cumulative_overburden)
+
+    porosity = evaluate_porosity_array(depths, model_config_by_property_kind, dependencies)
+    return cast_like(Decimal('0.435'), depths) * a * (1 - porosity) / overburden
+
+
+def _get_cumulative_overburden_column(
+    model_config_by_property_kind: dict[str, ModelConfig],
+    column_depth: int,
+    params: dict,
+    dtype: np.dtype,
+) -> np.ndarray:
+    """Cumulative sum of wet bulk density less water density, down a column at 1 m spacing from 0 to column_depth."""
+    porosity_model = get_porosity_array_model(model_config_by_property_kind['porosity'].kind)
+    grain_density_model = get_generic_array_model(  # no grain_density-specific models exist currently, using generic
+        model_kind=model_config_by_property_kind['grain_density'].kind
+    )
+    depth_column_1m_spacing = np.arange(column_depth + 1).astype(dtype)
+    porosity_column = porosity_model(depth_column_1m_spacing, model_config_by_property_kind, 'porosity')
+    grain_density_column = grain_density_model(depth_column_1m_spacing, model_config_by_property_kind, 'grain_density')
+
+    rhow = params['rhow']
+    rho_wet_bulk_column = (1 - porosity_column) * grain_density_column + porosity_column * rhow
+    return np.cumsum(rho_wet_bulk_column - rhow)
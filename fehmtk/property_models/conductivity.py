@@ -1,14 +1,18 @@
 from collections import defaultdict
+from dataclasses import dataclass
 from decimal import Decimal
+import functools
 import re
 from statistics import mean
-from typing import Callable
+from typing import Callable, Optional
+
+import numpy as np
 
 from ..common import round_significant_figures
 from ..config.model_config import MODEL_PARAMS_SIGNIFICANT_FIGURES, ModelConfig
 from ..fehm_objects import Vector
-from .generic import constant
-from .porosity import get_porosity_model
+from .generic import cast_params_like, constant, constant_array
+from .porosity import evaluate_porosity, evaluate_porosity_array
 
 TCON_SPACING_M = 1
 
@@ -22,10 +26,20 @@ def get_conductivity_models_by_kind() -> dict:
     }
 
 
+def get_conductivity_array_models_by_kind() -> dict:
+    return {
+        'porosity_weighted': porosity_weighted_array,
+        'porosity_weighted_anisotropic': porosity_weighted_anisotropic_array,
+        'constant_anisotropic': constant_anisotropic_array,
+        'ctr2tcon': ctr2tcon_array,
+    }
+
+
 def porosity_weighted(
     depth: Decimal,
     model_config_by_property_kind: dict[str, ModelConfig],
     property_kind: str,
+    dependencies: Optional[dict] = None,
 ) -> Vector:
     """Combined conductivity of water and rock, weighted by porosity:
     W^p * R^(1 - p)
@@ -39,8 +53,7 @@ def porosity_weighted(
     params = model_config_by_property_kind[property_kind].params
     kw, kg = params['water_conductivity'], params['rock_conductivity']
 
-    porosity_model = get_porosity_model(model_config_by_property_kind['porosity'].kind)
-    porosity = porosity_model(depth, model_config_by_property_kind, 'porosity')
+    porosity = evaluate_porosity(depth, model_config_by_property_kind, dependencies)
 
     conductivity = (kw ** porosity) * (kg ** (1 - porosity))
     return Vector(x=conductivity, y=conductivity, z=conductivity)
@@ -50,6 +63,7 @@ def porosity_weighted_anisotropic(
     depth: Decimal,
     model_config_by_property_kind: dict[str, ModelConfig],
     property_kind: str,
+    dependencies: Optional[dict] = None,
 ) -> Vector:
     """Conductivity set by _porosity_weighted function, with anisotropic scaling applied after.
     [x_scale * value, y_scale * value, z_scale * value]
@@ -61,7 +75,7 @@ def porosity_weighted_anisotropic(
     y_scale   (numeric)
     z_scale   (numeric)
     """
-    value = porosity_weighted(depth, model_config_by_property_kind, property_kind)
+    value = porosity_weighted(depth, model_config_by_property_kind, property_kind, dependencies)
     params = model_config_by_property_kind[property_kind].params
     x_scale, y_scale, z_scale = params['x_scale'], params['y_scale'], params['z_scale']
     return Vector(x=value.x * x_scale, y=value.y * y_scale, z=value.z * z_scale)
@@ -87,7 +101,35 @@ def constant_anisotropic(
     return Vector(x=value.x * x_scale, y=value.y * y_scale, z=value.z * z_scale)
 
 
-def ctr2tcon(depth: Decimal, model_config_by_property_kind: dict[str, ModelConfig], property_kind: str) -> Vector:
+@dataclass
+class Ctr2tconTable:
+    """Conductivity for each node depth key of a ctr2tcon config, compiled once per config.
+
+    Keys keep their first-seen rank, so equidistant depths resolve to the same key as a min() over the original ranges.
+    """
+    node_depths: np.ndarray
+    ranks: np.ndarray
+    tcons: np.ndarray
+    float_tcons: np.ndarray
+
+    def find_nearest(self, depths: np.ndarray) -> np.ndarray:
+        depths = np.asarray(depths, dtype=float)
+        right = np.clip(np.searchsorted(self.node_depths, depths), 0, len(self.node_depths) - 1)
+        left = np.clip(right - 1, 0, len(self.node_depths) - 1)
+        left_distance = np.abs(depths - self.node_depths[left])
+        right_distance = np.abs(self.node_depths[right] - depths)
+        use_right = (right_distance < left_distance) | (
+            (right_distance == left_distance) & (self.ranks[right] < self.ranks[left])
+        )
+        return np.where(use_right, right, left)
+
+
+def ctr2tcon(
+    depth: Decimal,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+    dependencies: Optional[dict] = None,
+) -> Vector:
     """Conductivity calculated by inverting a cumulative thermal resistance profile.
 
     CTR must be defined with a ctr_model (e.g. polynomial function), and is optimised on the basis of the node depths
@@ -101,21 +143,114 @@ def ctr2tcon(depth: Decimal, model_config_by_property_kind: dict[str, ModelConfi
     ctr_model           (model)
     node_depth_columns  (list of list of numbers; [[0, 50, 100], [0, 80]])
     """
-    params = model_config_by_property_kind[property_kind].params
+    table = _get_ctr2tcon_table(model_config_by_property_kind[property_kind].params)
+    tcon = table.tcons[table.find_nearest([depth])[0]]
+    return Vector(x=tcon, y=tcon, z=tcon)
 
-    tcon_func = _get_tcon_func(params['ctr_model'])
-    node_ranges_by_depth = _get_node_ranges_by_depth(params['node_depth_columns'])
 
-    nearest_depth = min(node_ranges_by_depth, key=lambda x: abs(x - depth))
-    weight_total = 0
-    weighted_tcon_total = 0
-    for (lower, upper) in node_ranges_by_depth[nearest_depth]:
-        lower, upper = round(lower), round(upper)
-        weight_total += upper - lower
-        weighted_tcon_total += sum([tcon_func(d) for d in range(lower, upper + 1, TCON_SPACING_M) if d != 0])
+def porosity_weighted_array(
+    depths: np.ndarray,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+    dependencies: Optional[dict] = None,
+) -> np.ndarray:
+    """Array version of porosity_weighted, returning an (n, 3) array."""
+    params = cast_params_like(model_config_by_property_kind[property_kind].params, depths)
+    kw, kg = params['water_conductivity'], params['rock_conductivity']
 
-    tcon = weighted_tcon_total / weight_total
-    return Vector(x=tcon, y=tcon, z=tcon)
+    porosity = evaluate_porosity_array(depths, model_config_by_property_kind, dependencies)
+
+    conductivity = (kw ** porosity) * (kg ** (1 - porosity))
+    return np.column_stack((conductivity, conductivity, conductivity))
+
+
+def porosity_weighted_anisotropic_array(
+    depths: np.ndarray,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+    dependencies: Optional[dict] = None,
+) -> np.ndarray:
+    """Array version of porosity_weighted_anisotropic, returning an (n, 3) array."""
+    value = porosity_weighted_array(depths, model_config_by_property_kind, property_kind, dependencies)
+    params = cast_params_like(model_config_by_property_kind[property_kind].params, depths)
+    return value * np.array([params['x_scale'], params['y_scale'], params['z_scale']], dtype=depths.dtype)
+
+
+def constant_anisotropic_array(
+    depths: np.ndarray,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+) -> np.ndarray:
+    """Array version of constant_anisotropic, returning an (n, 3) array."""
+    value = constant_array(depths, model_config_by_property_kind, property_kind)
+    params = cast_params_like(model_config_by_property_kind[property_kind].params, depths)
+    return value * np.array([params['x_scale'], params['y_scale'], params['z_scale']], dtype=depths.dtype)
+
+
+def ctr2tcon_array(
+    depths: np.ndarray,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+    dependencies: Optional[dict] = None,
+) -> np.ndarray:
+    """Array version of ctr2tcon, returning an (n, 3) array."""
+    table = _get_ctr2tcon_table(model_config_by_property_kind[property_kind].params)
+    tcons = table.tcons if depths.dtype == object else table.float_tcons
+    tcon = tcons[table.find_nearest(depths)]
+    return np.column_stack((tcon, tcon, tcon))
+
+
+def _get_ctr2tcon_table(params: dict) -> Ctr2tconTable:
+    ctr_model_key = (params['ctr_model']['model_kind'], tuple(params['ctr_model']['model_params'].items()))
+    node_depth_columns_key = tuple(tuple(column) for column in params['node_depth_columns'])
+    return _compile_ctr2tcon_table(ctr_model_key, node_depth_columns_key)
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_ctr2tcon_table(ctr_model_key: tuple, node_depth_columns_key: tuple) -> Ctr2tconTable:
+    """Evaluate conductivity once per metre, then average it over the depth ranges of each node depth key.
+
+    Exact conductivities sum the per-metre Decimal values over each range, in the same order as evaluating ctr2tcon
+    range by range. Float conductivities difference a cumulative sum of the per-metre values instead.
+    """
+    model_kind, model_params = ctr_model_key
+    tcon_func = _get_tcon_func({'model_kind': model_kind, 'model_params': dict(model_params)})
+    node_ranges_by_depth = _get_node_ranges_by_depth([list(column) for column in node_depth_columns_key])
+    rounded_ranges_by_depth = {
+        depth: [(round(lower), round(upper)) for lower, upper in node_ranges]
+        for depth, node_ranges in node_ranges_by_depth.items()
+    }
+
+    first_metre = min(lower for ranges in rounded_ranges_by_depth.values() for lower, _ in ranges)
+    last_metre = max(upper for ranges in rounded_ranges_by_depth.values() for _, upper in ranges)
+    tcon_by_metre = [
+        tcon_func(d) if d != 0 else Decimal(0)
+        for d in range(first_metre, last_metre + 1, TCON_SPACING_M)
+    ]
+    cumulative_tcon = np.concatenate(([0.], np.cumsum(np.array(tcon_by_metre, dtype=float))))
+
+    tcons, float_tcons = [], []
+    for ranges in rounded_ranges_by_depth.values():
+        weight_total = sum(upper - lower for lower, upper in ranges)
+        weighted_tcon_total = sum(
+            sum(tcon for d, tcon in zip(range(lower, upper + 1), tcon_by_metre[lower - first_metre:]) if d != 0)
+            for lower, upper in ranges
+        )
+        float_weighted_tcon_total = sum(
+            cumulative_tcon[upper - first_metre + 1] - cumulative_tcon[lower - first_metre]
+            for lower, upper in ranges
+        )
+        tcons.append(weighted_tcon_total / weight_total)
+        float_tcons.append(float_weighted_tcon_total / weight_total)
+
+    node_depths = np.array([float(depth) for depth in rounded_ranges_by_depth], dtype=float)
+    order = np.argsort(node_depths, kind='stable')
+    return Ctr2tconTable(
+        node_depths=node_depths[order],
+        ranks=order,
+        tcons=np.array(tcons, dtype=object)[order],
+        float_tcons=np.array(float_tcons, dtype=float)[order],
+    )
 
 
 def _get_node_ranges_by_depth(node_depth_columns: list[list[Decimal]]) -> dict[Decimal, tuple[Decimal]]:
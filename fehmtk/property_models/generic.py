@@ -1,17 +1,34 @@
 from decimal import Decimal
-from typing import Callable, Union
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
 
 from ..config import ModelConfig
 from ..fehm_objects import Vector
+from .expression import COORDINATE_VARIABLES, PROPERTY_VARIABLES, RESERVED_PARAMS, compile_expression
+
+VECTOR_PROPERTY_KINDS = ('conductivity', 'permeability')
 
 
 def get_generic_model(model_kind) -> Callable:
     return get_generic_models_by_kind()[model_kind]
 
 
+def get_generic_array_model(model_kind) -> Callable:
+    return get_generic_array_models_by_kind()[model_kind]
+
+
 def get_generic_models_by_kind() -> dict:
     return {
         'constant': constant,
+        'expression': expression,
+    }
+
+
+def get_generic_array_models_by_kind() -> dict:
+    return {
+        'constant': constant_array,
+        'expression': expression_array,
     }
 
 
@@ -28,7 +45,134 @@ def constant(
     params = model_config_by_property_kind[property_kind].params
     constant = params['constant']
 
-    if property_kind in ('conductivity', 'permeability'):
+    if property_kind in VECTOR_PROPERTY_KINDS:
         return Vector(x=constant, y=constant, z=constant)
 
     return constant
+
+
+def constant_array(
+    depths: np.ndarray,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+) -> np.ndarray:
+    """Array version of constant, returning an (n, 3) array for Vector valued properties."""
+    constant = cast_like(model_config_by_property_kind[property_kind].params['constant'], depths)
+
+    if property_kind in VECTOR_PROPERTY_KINDS:
+        return np.full((len(depths), 3), constant, dtype=depths.dtype)
+
+    return np.full(len(depths), constant, dtype=depths.dtype)
+
+
+def expression(
+    depth: Decimal,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+    dependencies: Optional[dict] = None,
+) -> Union[Decimal, Vector]:
+    """Property set by a formula given in the config, e.g. "a * exp(b * depth)". If the property is Vector valued, it is
+    also isotropic.
+
+    The formula may use depth, porosity (calculated separately with its own property model), node coordinates x, y
+    and z, numeric literals, and any other params by name. It may combine them with + - * / ** and the functions exp,
+    log (natural), log10, sqrt, abs, min and max (elementwise, of two arguments).
+
+    Required params:
+    expression  (string)
+    """
+    dependencies = {kind: np.array([value], dtype=object) for kind, value in (dependencies or {}).items()}
+    depths = np.array([depth], dtype=object)
+    value = expression_array(depths, model_config_by_property_kind, property_kind, dependencies)
+    if property_kind in VECTOR_PROPERTY_KINDS:
+        return Vector(*value[0])
+    return value[0]
+
+
+def expression_array(
+    depths: np.ndarray,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+    dependencies: Optional[dict] = None,
+) -> np.ndarray:
+    """Array version of expression, returning an (n, 3) array for Vector valued properties."""
+    params = model_config_by_property_kind[property_kind].params
+    compiled_expression = compile_expression(params['expression'])
+
+    variables = {'depth': depths}
+    for name in compiled_expression.names - {'depth'}:
+        if name in PROPERTY_VARIABLES + COORDINATE_VARIABLES:
+            if dependencies is None or name not in dependencies:
+                raise KeyError(f'Expression for {property_kind} uses {name}, which was not provided')
+            variables[name] = dependencies[name] if depths.dtype == object else np.asarray(dependencies[name], float)
+        elif name in params and name not in RESERVED_PARAMS:
+            variables[name] = cast_like(params[name], depths)
+        else:
+            raise KeyError(f'Expression for {property_kind} uses {name}, which is not a variable or param')
+
+    values = compiled_expression(variables, depths)
+    if property_kind in VECTOR_PROPERTY_KINDS:
+        return np.column_stack((values, values, values))
+    return values
+
+
+def cast_like(value: Any, depths: np.ndarray) -> Any:
+    """Cast a Decimal parameter to float for evaluation on float depths. Exact (object) depth arrays keep Decimals.
+    >>> cast_like(Decimal('0.5'), np.array([1., 2.]))
+    0.5
+    >>> cast_like(Decimal('0.5'), np.array([Decimal(1), Decimal(2)], dtype=object))
+    Decimal('0.5')
+    """
+    if depths.dtype == object or not isinstance(value, Decimal):
+        return value
+    return float(value)
+
+
+def cast_params_like(params: dict[str, Any], depths: np.ndarray) -> dict[str, Any]:
+    return {key: cast_like(value, depths) for key, value in params.items()}
+
+
+def vectorize_scalar_model(scalar_model: Callable) -> Callable:
+    """Wrap a scalar (Decimal) property model in the array protocol, evaluating it once per unique depth."""
+    def array_model(
+        depths: np.ndarray,
+        model_config_by_property_kind: dict[str, ModelConfig],
+        property_kind: str,
+        dependencies: Optional[dict] = None,
+    ) -> np.ndarray:
+        unique_depths, first_indexes, inverse = np.unique(depths, return_index=True, return_inverse=True)
+        if dependencies:
+            values = [
+                scalar_model(
+                    _to_decimal(depth),
+                    model_config_by_property_kind,
+                    property_kind,
+                    {kind: _to_decimal(dependency_values[i]) for kind, dependency_values in dependencies.items()},
+                )
+                for depth, i in zip(unique_depths, first_indexes)
+            ]
+        else:
+            values = [
+                scalar_model(_to_decimal(depth), model_config_by_property_kind, property_kind)
+                for depth in unique_depths
+            ]
+        values = [value.value if isinstance(value, Vector) else value for value in values]
+        unique_values = np.array(values, dtype=object)
+        if depths.dtype != object:
+            unique_values = unique_values.astype(float)
+        return unique_values[inverse]
+
+    array_model.__doc__ = f'Array version of {scalar_model.__name__}, evaluated once per unique depth.'
+    return array_model
+
+
+def _to_decimal(value: Union[float, Decimal]) -> Decimal:
+    """
+    >>> _to_decimal(0.1)
+    Decimal('0.1')
+    >>> _to_decimal(Decimal('0.10'))
+    Decimal('0.10')
+    """
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(repr(float(value)))
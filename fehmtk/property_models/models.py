@@ -1,20 +1,76 @@
-from typing import Callable
+import functools
+from typing import Callable, Optional
 
-from .compressibility import get_compressibility_models_by_kind
-from .conductivity import get_conductivity_models_by_kind
-from .generic import get_generic_models_by_kind
-from .permeability import get_permeability_models_by_kind
-from .porosity import get_porosity_models_by_kind
+from .compressibility import get_compressibility_array_models_by_kind, get_compressibility_models_by_kind
+from .conductivity import get_conductivity_array_models_by_kind, get_conductivity_models_by_kind
+from .expression import get_expression_dependencies
+from .generic import get_generic_array_models_by_kind, get_generic_models_by_kind, vectorize_scalar_model
+from .permeability import get_permeability_array_models_by_kind, get_permeability_models_by_kind
+from .porosity import get_porosity_array_models_by_kind, get_porosity_models_by_kind
 
+DEPENDENCIES_BY_PROPERTY_AND_MODEL_KIND = {
+    'permeability': {
+        'void_ratio_exponential': ('porosity',),
+        'void_ratio_exponential_anisotropic': ('porosity',),
+    },
+    'conductivity': {
+        'porosity_weighted': ('porosity',),
+        'porosity_weighted_anisotropic': ('porosity',),
+    },
+    'compressibility': {
+        'overburden': ('porosity', 'grain_density'),
+    },
+}
 
-def get_rock_property_model(property_kind, model_kind) -> dict[str, Callable]:
-    property_model_lookup = _get_model_lookup_by_property_kind()[property_kind]
-    generic_model_lookup = get_generic_models_by_kind()
 
-    try:
+@functools.cache
+def get_rock_property_model(property_kind, model_kind, vectorized: bool = False) -> Callable:
+    """Look up a rock property model by property and model kind.
+
+    Scalar models take a single Decimal depth and serve as the reference implementation. Vectorized models take a
+    NumPy depth array and return an array, (n, 3) for Vector valued properties. Models without an array version are
+    wrapped to evaluate the scalar model once per unique depth.
+
+    Vectorized models are only fast on float64 arrays. On object arrays of Decimals (exact numeric_mode) NumPy still
+    applies Decimal arithmetic element by element, so they match the scalar models exactly but are not a performance
+    path: use fast numeric_mode for large grids.
+
+    Lookups are cached, so a model is resolved once per property and model kind.
+    """
+    if not vectorized:
+        property_model_lookup = _get_model_lookup_by_property_kind()[property_kind]
+        generic_model_lookup = get_generic_models_by_kind()
+    else:
+        property_model_lookup = _get_array_model_lookup_by_property_kind()[property_kind]
+        generic_model_lookup = get_generic_array_models_by_kind()
+
+    if model_kind in property_model_lookup:
         return property_model_lookup[model_kind]
-    except KeyError:
+    if model_kind in generic_model_lookup or not vectorized:
         return generic_model_lookup[model_kind]
+    return vectorize_scalar_model(get_rock_property_model(property_kind, model_kind))
+
+
+def get_rock_property_model_dependencies(
+    property_kind: str,
+    model_kind: str,
+    params: Optional[dict] = None,
+) -> tuple[str]:
+    """Property kinds (or node coordinates x, y and z) a model depends on, to be evaluated first and passed in as
+    `dependencies`. Expression models depend on the variables their expression (in params) uses.
+    >>> get_rock_property_model_dependencies('permeability', 'void_ratio_exponential')
+    ('porosity',)
+    >>> get_rock_property_model_dependencies('permeability', 'constant')
+    ()
+    >>> get_rock_property_model_dependencies('permeability', 'expression', {'expression': 'a * porosity ** 3 * x'})
+    ('porosity', 'x')
+    """
+    if model_kind == 'expression':
+        dependencies = get_expression_dependencies(params)
+        if property_kind in dependencies:
+            raise ValueError(f'Expression for {property_kind} cannot depend on {property_kind}')
+        return dependencies
+    return DEPENDENCIES_BY_PROPERTY_AND_MODEL_KIND.get(property_kind, {}).get(model_kind, ())
 
 
 def _get_model_lookup_by_property_kind() -> dict:
@@ -26,3 +82,14 @@ def _get_model_lookup_by_property_kind() -> dict:
         'permeability': get_permeability_models_by_kind(),
         'compressibility': get_compressibility_models_by_kind(),
     }
+
+
+def _get_array_model_lookup_by_property_kind() -> dict:
+    return {
+        'grain_density': {},
+        'specific_heat': {},
+        'porosity': get_porosity_array_models_by_kind(),
+        'conductivity': get_conductivity_array_models_by_kind(),
+        'permeability': get_permeability_array_models_by_kind(),
+        'compressibility': get_compressibility_array_models_by_kind(),
+    }
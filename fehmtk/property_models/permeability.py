@@ -1,9 +1,12 @@
 from decimal import Decimal
+from typing import Optional
+
+import numpy as np
 
 from ..config import ModelConfig
 from ..fehm_objects import Vector
-from .generic import constant
-from .porosity import get_porosity_model
+from .generic import cast_params_like, constant, constant_array
+from .porosity import evaluate_porosity, evaluate_porosity_array
 
 
 def get_permeability_models_by_kind() -> dict:
@@ -14,10 +17,19 @@ def get_permeability_models_by_kind() -> dict:
     }
 
 
+def get_permeability_array_models_by_kind() -> dict:
+    return {
+        'void_ratio_exponential': void_ratio_exponential_array,
+        'void_ratio_exponential_anisotropic': void_ratio_exponential_anisotropic_array,
+        'constant_anisotropic': constant_anisotropic_array,
+    }
+
+
 def void_ratio_exponential(
     depth: Decimal,
     model_config_by_property_kind: dict[str, ModelConfig],
     property_kind: str,
+    dependencies: Optional[dict] = None,
 ) -> Vector:
     """Permeability following an exponential function of void ratio:
     A * e^(B * v)
@@ -30,8 +42,7 @@ def void_ratio_exponential(
     """
     params = model_config_by_property_kind[property_kind].params
 
-    porosity_model = get_porosity_model(model_config_by_property_kind['porosity'].kind)
-    porosity = porosity_model(depth, model_config_by_property_kind, 'porosity')
+    porosity = evaluate_porosity(depth, model_config_by_property_kind, dependencies)
 
     void_ratio = porosity / (1 - porosity)
     permeability = params['A'] * (params['B'] * void_ratio).exp()  # A * e^(B * v)
@@ -42,6 +53,7 @@ def void_ratio_exponential_anisotropic(
     depth: Decimal,
     model_config_by_property_kind: dict[str, ModelConfig],
     property_kind: str,
+    dependencies: Optional[dict] = None,
 ) -> Vector:
     """Permeability set by _void_ratio_exponential function, with anisotropic scaling applied after.
     [x_scale * value, y_scale * value, z_scale * value]
@@ -53,7 +65,7 @@ def void_ratio_exponential_anisotropic(
     y_scale   (numeric)
     z_scale   (numeric)
     """
-    value = void_ratio_exponential(depth, model_config_by_property_kind, property_kind)
+    value = void_ratio_exponential(depth, model_config_by_property_kind, property_kind, dependencies)
     params = model_config_by_property_kind[property_kind].params
     x_scale, y_scale, z_scale = params['x_scale'], params['y_scale'], params['z_scale']
     return Vector(x=value.x * x_scale, y=value.y * y_scale, z=value.z * z_scale)
@@ -77,3 +89,42 @@ def constant_anisotropic(
     params = model_config_by_property_kind[property_kind].params
     x_scale, y_scale, z_scale = params['x_scale'], params['y_scale'], params['z_scale']
     return Vector(x=value.x * x_scale, y=value.y * y_scale, z=value.z * z_scale)
+
+
+def void_ratio_exponential_array(
+    depths: np.ndarray,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+    dependencies: Optional[dict] = None,
+) -> np.ndarray:
+    """Array version of void_ratio_exponential, returning an (n, 3) array."""
+    params = cast_params_like(model_config_by_property_kind[property_kind].params, depths)
+
+    porosity = evaluate_porosity_array(depths, model_config_by_property_kind, dependencies)
+
+    void_ratio = porosity / (1 - porosity)
+    permeability = params['A'] * np.exp(params['B'] * void_ratio)  # A * e^(B * v)
+    return np.column_stack((permeability, permeability, permeability))
+
+
+def void_ratio_exponential_anisotropic_array(
+    depths: np.ndarray,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+    dependencies: Optional[dict] = None,
+) -> np.ndarray:
+    """Array version of void_ratio_exponential_anisotropic, returning an (n, 3) array."""
+    value = void_ratio_exponential_array(depths, model_config_by_property_kind, property_kind, dependencies)
+    params = cast_params_like(model_config_by_property_kind[property_kind].params, depths)
+    return value * np.array([params['x_scale'], params['y_scale'], params['z_scale']], dtype=depths.dtype)
+
+
+def constant_anisotropic_array(
+    depths: np.ndarray,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+) -> np.ndarray:
+    """Array version of constant_anisotropic, returning an (n, 3) array."""
+    value = constant_array(depths, model_config_by_property_kind, property_kind)
+    params = cast_params_like(model_config_by_property_kind[property_kind].params, depths)
+    return value * np.array([params['x_scale'], params['y_scale'], params['z_scale']], dtype=depths.dtype)
@@ -1,10 +1,14 @@
 from decimal import Decimal
-from typing import Callable
+import functools
+from typing import Callable, Optional
+
+import numpy as np
 
 from ..config import ModelConfig
-from .generic import get_generic_models_by_kind
+from .generic import cast_params_like, get_generic_array_models_by_kind, get_generic_models_by_kind
 
 
+@functools.cache
 def get_porosity_model(model_kind: str) -> Callable:
     porosity_models_by_kind = get_porosity_models_by_kind()
     generic_models_by_kind = get_generic_models_by_kind()
@@ -14,6 +18,40 @@ def get_porosity_model(model_kind: str) -> Callable:
         return generic_models_by_kind[model_kind]
 
 
+@functools.cache
+def get_porosity_array_model(model_kind: str) -> Callable:
+    porosity_models_by_kind = get_porosity_array_models_by_kind()
+    generic_models_by_kind = get_generic_array_models_by_kind()
+    try:
+        return porosity_models_by_kind[model_kind]
+    except KeyError:
+        return generic_models_by_kind[model_kind]
+
+
+def evaluate_porosity(
+    depth: Decimal,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    dependencies: Optional[dict] = None,
+) -> Decimal:
+    """Porosity at depth, taken from already evaluated dependencies when available."""
+    if dependencies is not None and 'porosity' in dependencies:
+        return dependencies['porosity']
+    porosity_model = get_porosity_model(model_config_by_property_kind['porosity'].kind)
+    return porosity_model(depth, model_config_by_property_kind, 'porosity')
+
+
+def evaluate_porosity_array(
+    depths: np.ndarray,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    dependencies: Optional[dict] = None,
+) -> np.ndarray:
+    """Array version of evaluate_porosity."""
+    if dependencies is not None and 'porosity' in dependencies:
+        return dependencies['porosity']
+    porosity_model = get_porosity_array_model(model_config_by_property_kind['porosity'].kind)
+    return porosity_model(depths, model_config_by_property_kind, 'porosity')
+
+
 def get_porosity_models_by_kind() -> dict:
     return {
         'depth_exponential': depth_exponential,
@@ -21,6 +59,13 @@ def get_porosity_models_by_kind() -> dict:
     }
 
 
+def get_porosity_array_models_by_kind() -> dict:
+    return {
+        'depth_exponential': depth_exponential_array,
+        'depth_power_law_with_maximum': depth_power_law_with_maximum_array,
+    }
+
+
 def depth_exponential(
         depth: Decimal,
         model_config_by_property_kind: dict[str, ModelConfig],
@@ -60,3 +105,30 @@ def depth_power_law_with_maximum(
         return max_porosity
 
     return min(porosity_a * depth ** porosity_b, max_porosity)
+
+
+def depth_exponential_array(
+    depths: np.ndarray,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+) -> np.ndarray:
+    """Array version of depth_exponential."""
+    params = cast_params_like(model_config_by_property_kind[property_kind].params, depths)
+    return params['porosity_a'] * np.exp(params['porosity_b'] * depths)
+
+
+def depth_power_law_with_maximum_array(
+    depths: np.ndarray,
+    model_config_by_property_kind: dict[str, ModelConfig],
+    property_kind: str,
+) -> np.ndarray:
+    """Array version of depth_power_law_with_maximum."""
+    params = cast_params_like(model_config_by_property_kind[property_kind].params, depths)
+    porosity_a, porosity_b = params['porosity_a'], params['porosity_b']
+
+    max_porosity = porosity_a * 50 ** porosity_b
+    porosity = np.full(len(depths), max_porosity, dtype=depths.dtype)
+    is_nonzero = depths != 0
+    power_law_porosity = porosity_a * depths[is_nonzero] ** porosity_b
+    porosity[is_nonzero] = np.where(max_porosity < power_law_porosity, max_porosity, power_law_porosity)
+    return porosity
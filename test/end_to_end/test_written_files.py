@@ -3,17 +3,30 @@ import os
 from pathlib import Path
 import shutil
 
+import numpy as np
+import pandas as pd
 from numpy.testing import assert_array_almost_equal
 import pytest
 
 from fehmtk.config import RunConfig
-from fehmtk.file_interface import read_pressure, write_restart
+from fehmtk.file_interface import (
+    read_avs,
+    read_avs_columns,
+    read_compact_node_array,
+    read_grid,
+    read_pressure,
+    read_zones,
+    write_restart,
+    write_zones,
+)
 from fehmtk.preprocessors import (
+    compare_numeric_modes,
     generate_flow_boundaries,
     generate_heat_flux_boundaries,
     generate_hydrostatic_pressure,
     generate_rock_properties,
 )
+from fehmtk.preprocessors import rock_properties
 from fehmtk.file_manipulation import (
     append_zones,
     create_restart_from_avs,
@@ -21,8 +34,11 @@ from fehmtk.file_manipulation import (
     write_modified_fehm_input_file,
 )
 from fehmtk.postprocessors import (
+    compare_many_runs,
     compare_runs,
+    summarize_boundary_output,
     summarize_run,
+    summarize_velocities,
 )
 
 logger = logging.getLogger(__name__)
@@ -55,6 +71,178 @@ def test_compare(tmp_path: Path, end_to_end_fixture_dir: Path):
     assert output_file.read_text() == fixture_file.read_text()
 
 
+def test_compare_zone_missing_from_other_grid(tmp_path: Path, end_to_end_fixture_dir: Path):
+    model_dir = end_to_end_fixture_dir / 'flat_box' / 'p12'
+    other_dir = tmp_path / 'flat_box' / 'cond'
+    shutil.copytree(end_to_end_fixture_dir / 'flat_box' / 'cond', other_dir)
+    (tmp_path / 'nist120-1800.out').symlink_to((end_to_end_fixture_dir / 'nist120-1800.out').resolve())
+    outside_zones = read_zones(other_dir / 'cond_outside.zone')
+    write_zones([zone for zone in outside_zones if zone.name != 'bottom'], other_dir / 'cond_outside.zone')
+    output_file = tmp_path / 'compare.csv'
+
+    with pytest.warns(UserWarning, match='Outside zone not present in other grid: 2'):
+        compare_runs(model_dir / 'config.yaml', other_dir / 'config.yaml', output_file)
+
+    fixture_file = model_dir / 'compare_fixture.csv'
+    assert output_file.read_text() == fixture_file.read_text()
+
+
+def test_compare_different_grids(tmp_path: Path, end_to_end_fixture_dir: Path):
+    with pytest.raises(ValueError, match='differing number of nodes'):
+        compare_runs(
+            end_to_end_fixture_dir / 'flat_box' / 'p12' / 'config.yaml',
+            end_to_end_fixture_dir / 'outcrop_2d' / 'p13' / 'config.yaml',
+            tmp_path / 'compare.csv',
+        )
+
+
+def test_run_summary_zones(tmp_path: Path, end_to_end_fixture_dir: Path):
+    model_dir = end_to_end_fixture_dir / 'flat_box' / 'p12'
+    summarize_run(model_dir / 'config.yaml', tmp_path / 'summary.csv', material_zones=[4], outside_zones=['bottom'])
+    summarize_run(model_dir / 'config.yaml', tmp_path / 'summary.npz', material_zones=[4], outside_zones=['bottom'])
+
+    summary = pd.read_csv(tmp_path / 'summary.csv')
+    assert len(summary) == 13  # 9 nodes in material zone 4, 4 in bottom
+    assert summary['node'].is_monotonic_increasing
+    assert all(('4' in zones) != ('2' in outside_zones) for zones, outside_zones in zip(
+        summary['material_zones'],
+        summary['outside_zones'],
+    ))
+
+    with np.load(tmp_path / 'summary.npz') as columnar:
+        np.testing.assert_array_equal(columnar['node'], summary['node'])
+        for column in ('x', 'z', 'depth', 'temperature', 'pressure', 'saturation'):
+            np.testing.assert_allclose(columnar[column], summary[column], rtol=1e-12)
+        assert columnar['material_zone_4'].sum() == 9
+        assert columnar['outside_zone_2'].sum() == 4
+        np.testing.assert_array_equal(columnar['material_zone_4'], summary['material_zones'].str.contains('4'))
+
+
+@pytest.mark.parametrize('n_workers', (1, 2))
+def test_compare_many(tmp_path: Path, end_to_end_fixture_dir: Path, n_workers: int):
+    model_dir = end_to_end_fixture_dir / 'flat_box' / 'p12'
+    other_dir = end_to_end_fixture_dir / 'flat_box' / 'cond'
+
+    comparison = compare_many_runs(
+        [model_dir / 'config.yaml', other_dir / 'config.yaml'],
+        tmp_path / 'compare_many.csv',
+        pairwise=True,
+        n_workers=n_workers,
+    )
+
+    assert comparison['zone'].tolist() == ['1', '2', '3', '4', '5', 'total'] * 2
+    assert set(comparison['run']) == {'cond'}
+    by_zone = comparison[comparison['field'] == 'temperature'].set_index('zone')
+    assert by_zone['n_nodes']['total'] == 194
+    assert by_zone['max_abs_difference']['total'] == by_zone['max_abs_difference'].max()
+    assert (by_zone['rms_difference'] <= by_zone['max_abs_difference']).all()
+
+    total = by_zone.loc['total']
+    compare_runs(model_dir / 'config.yaml', other_dir / 'config.yaml', tmp_path / 'compare.csv', nodes=[total.max_node])
+    at_max = pd.read_csv(tmp_path / 'compare.csv').iloc[0]
+    assert at_max['temperature'] == pytest.approx(total['max_difference'], rel=1e-12)
+    assert (at_max['x'], at_max['y'], at_max['z']) == (total['max_x'], total['max_y'], total['max_z'])
+
+
+def test_compare_many_different_grids(tmp_path: Path, end_to_end_fixture_dir: Path):
+    with pytest.raises(ValueError, match='differ'):
+        compare_many_runs(
+            [
+                end_to_end_fixture_dir / 'flat_box' / 'p12' / 'config.yaml',
+                end_to_end_fixture_dir / 'outcrop_2d' / 'p13' / 'config.yaml',
+            ],
+            tmp_path / 'compare_many.csv',
+            n_workers=1,
+        )
+
+
+@pytest.mark.parametrize(
+    'mesh_name, model_name', (
+        ('flat_box', 'p12'),
+        ('outcrop_2d', 'p13'),
+    ),
+)
+def test_boundary_output_matches_heat_flux(
+    tmp_path: Path,
+    end_to_end_fixture_dir: Path,
+    mesh_name: str,
+    model_name: str,
+):
+    model_dir = end_to_end_fixture_dir / mesh_name / model_name
+    config = RunConfig.from_yaml(model_dir / 'config.yaml')
+    grid = read_grid(config.files_config.grid)
+
+    summary = summarize_boundary_output(model_dir / 'config.yaml', tmp_path / 'boundary_output.csv')
+
+    assert (tmp_path / 'boundary_output.csv').exists()
+    assert summary['zone'].iloc[-1] == 'total'
+    assert summary['fluid_out_kg_per_s'].isna().all()  # restart files hold no sources
+
+    # At steady state, heat conducted up from the base matches the heat flux boundary condition
+    heat_flux_MW = np.nansum(read_compact_node_array(config.files_config.heat_flux, grid.n_nodes)[:, 0])
+    bottom = summary.set_index('zone').loc['bottom']
+    assert bottom['heat_out_MW'] == pytest.approx(heat_flux_MW, rel=0.01)
+    assert bottom['heat_flux_mW_per_m2'] == pytest.approx(1e9 * bottom['heat_out_MW'] / bottom['area_m2'])
+
+
+@pytest.mark.parametrize(
+    'mesh_name, model_name', (
+        ('flat_box', 'p12'),
+        ('flat_box', 'cond'),  # AVS files with Fortran-style exponents (no E)
+        ('outcrop_2d', 'cond'),
+    ),
+)
+def test_boundary_output_avs_snapshots(tmp_path: Path, end_to_end_fixture_dir: Path, mesh_name: str, model_name: str):
+    model_dir = end_to_end_fixture_dir / mesh_name / model_name
+    state_files = [model_dir / f'{model_name}.00010_sca_node.avs', model_dir / f'{model_name}.00011_sca_node.avs']
+    config = RunConfig.from_yaml(model_dir / 'config.yaml')
+    grid = read_grid(config.files_config.grid, outside_zone_file=config.files_config.outside_zone)
+    top_indexes = grid.get_node_numbers_in_outside_zone('top') - 1
+
+    summary = summarize_boundary_output(
+        model_dir / 'config.yaml',
+        tmp_path / 'boundary_output.csv',
+        state_files=state_files,
+        zones=['top', 2],
+    )
+
+    assert summary['zone'].tolist() == ['top', '2', 'total'] * 2
+    top = summary[summary['zone'] == 'top']
+    for state_file, fluid_in in zip(state_files, top['fluid_in_kg_per_s']):
+        source = np.array(read_avs(state_file).source, dtype=float)[top_indexes]
+        assert fluid_in == pytest.approx(-source[source < 0].sum())
+    assert (top['fluid_out_kg_per_s'] == 0).all()
+
+
+@pytest.mark.parametrize(
+    'mesh_name, model_name, zones', (
+        ('flat_box', 'p12', ['1', '2', '3', '4', '5']),
+        ('flat_box', 'cond', ['1', '2', '3', 'top', 'bottom']),  # AVS files with Fortran-style exponents (no E)
+        ('outcrop_2d', 'cond', ['1', '2', '3', '4', 'top', 'bottom']),
+    ),
+)
+def test_velocities(tmp_path: Path, end_to_end_fixture_dir: Path, mesh_name: str, model_name: str, zones: list[str]):
+    model_dir = end_to_end_fixture_dir / mesh_name / model_name
+    config = RunConfig.from_yaml(model_dir / 'config.yaml')
+    grid = read_grid(config.files_config.grid)
+
+    summary = summarize_velocities(model_dir / 'config.yaml', tmp_path / 'velocity.csv')
+
+    assert (tmp_path / 'velocity.csv').exists()
+    assert summary['state_file'].nunique() == 11
+    last = summary[summary['state_file'] == f'{model_name}.00011_vec_node.avs'].set_index('zone')
+    assert last.index.tolist() == zones + ['total']
+
+    flux = read_avs_columns(model_dir / f'{model_name}.00011_vec_node.avs')['volume_flux']
+    porosity = read_compact_node_array(config.files_config.rock_properties, n_nodes=grid.n_nodes)[:, 2]
+    speed = np.linalg.norm(flux, axis=1) / porosity * 365.25 * 24 * 3600
+    assert last.loc['total', 'max_speed_m_per_yr'] == pytest.approx(speed.max())
+    assert speed[last.loc['total', 'max_speed_node'] - 1] == pytest.approx(speed.max())
+    assert last['max_speed_m_per_yr'].max() == last.loc['total', 'max_speed_m_per_yr']
+    for zone, statistics in last.iterrows():
+        assert statistics['p50_speed_m_per_yr'] <= statistics['p90_speed_m_per_yr'] <= statistics['max_speed_m_per_yr']
+
+
 def test_compare_self(tmp_path: Path, end_to_end_fixture_dir: Path):
     model_dir = end_to_end_fixture_dir / 'outcrop_2d' / 'p13'
     output_file = tmp_path / 'compare_self.csv'
@@ -92,8 +280,31 @@ def test_heat_flux_against_fixture(tmp_path: Path, end_to_end_fixture_dir: Path,
     assert output_file.read_text() == fixture_file.read_text()
 
 
+@pytest.mark.parametrize('mesh_name, plot_max_points', (
+    ('flat_box', None),
+    ('outcrop_2d', None),
+    ('warped_box', None),
+    ('warped_box', 3),
+))
+def test_heat_flux_plot_file(tmp_path: Path, end_to_end_fixture_dir: Path, mesh_name: str, plot_max_points: int):
+    model_dir = end_to_end_fixture_dir / mesh_name / 'cond'
+    config_file, (output_file,) = _setup_temporary_model_run(model_dir, tmp_path, output_keys=['heat_flux'])
+    plot_file = tmp_path / 'heat_flux.png'
+
+    generate_heat_flux_boundaries(config_file, plot_file=plot_file, plot_max_points=plot_max_points)
+
+    assert output_file.read_text() == (model_dir / 'cond.hflx').read_text()
+    assert plot_file.read_bytes().startswith(b'\x89PNG')
+
+
+@pytest.mark.parametrize('depth_evaluation', ('nodes', 'unique'))
 @pytest.mark.parametrize('mesh_name', ('flat_box', 'outcrop_2d', 'warped_box'))
-def test_rock_properties_against_fixture(tmp_path: Path, end_to_end_fixture_dir: Path, mesh_name: str):
+def test_rock_properties_against_fixture(
+    tmp_path: Path,
+    end_to_end_fixture_dir: Path,
+    mesh_name: str,
+    depth_evaluation: str,
+):
     model_dir = end_to_end_fixture_dir / mesh_name / 'cond'
     config_file, output_files = _setup_temporary_model_run(
         model_dir,
@@ -101,13 +312,121 @@ def test_rock_properties_against_fixture(tmp_path: Path, end_to_end_fixture_dir:
         output_keys=['conductivity', 'permeability', 'pore_pressure', 'rock_properties'],
     )
 
-    generate_rock_properties(config_file)
+    generate_rock_properties(config_file, depth_evaluation=depth_evaluation)
 
     for output_file in output_files:
         fixture_file = model_dir / output_file.name
         assert output_file.read_text() == fixture_file.read_text()
 
 
+@pytest.mark.parametrize('mesh_name', ('flat_box', 'outcrop_2d', 'warped_box'))
+def test_rock_properties_fast_numeric_mode(tmp_path: Path, end_to_end_fixture_dir: Path, mesh_name: str):
+    model_dir = end_to_end_fixture_dir / mesh_name / 'cond'
+    config_file, output_files = _setup_temporary_model_run(
+        model_dir,
+        tmp_path,
+        output_keys=['conductivity', 'permeability', 'pore_pressure', 'rock_properties'],
+    )
+
+    generate_rock_properties(config_file, numeric_mode='fast')
+
+    for output_file in output_files:  # floats are written without the trailing zeros of Decimals, e.g. 1.2 vs 1.20000
+        fixture_file = model_dir / output_file.name
+        output_tokens, fixture_tokens = output_file.read_text().split(), fixture_file.read_text().split()
+        assert [t for t in output_tokens if not _is_number(t)] == [t for t in fixture_tokens if not _is_number(t)]
+        np.testing.assert_allclose(
+            [float(t) for t in output_tokens if _is_number(t)],
+            [float(t) for t in fixture_tokens if _is_number(t)],
+            rtol=1e-6,
+        )
+
+    differences = compare_numeric_modes(config_file)
+    assert differences.keys() == set(rock_properties.PROPERTY_KINDS)
+    assert max(differences.values()) < 1e-12
+
+
+@pytest.mark.parametrize('reference, numeric_mode, executor', (
+    (False, 'exact', 'ProcessPoolExecutor'),  # Decimal object arrays hold the GIL
+    (True, 'exact', 'ProcessPoolExecutor'),
+    (False, 'fast', 'ThreadPoolExecutor'),
+))
+def test_rock_properties_parallel_matches_serial(
+    end_to_end_fixture_dir: Path,
+    caplog,
+    reference: bool,
+    numeric_mode: str,
+    executor: str,
+):
+    config = RunConfig.from_yaml(
+        end_to_end_fixture_dir / 'outcrop_2d' / 'cond' / 'config.yaml',
+        rock_properties_numeric_mode=numeric_mode,
+    )
+    grid = read_grid(
+        config.files_config.grid,
+        outside_zone_file=config.files_config.outside_zone,
+        material_zone_file=config.files_config.material_zone,
+        read_elements=False,
+    )
+
+    serial = rock_properties.compute_rock_properties(
+        grid,
+        config.rock_properties_config,
+        reference=reference,
+        numeric_mode=numeric_mode,
+    )
+    with caplog.at_level(logging.INFO):
+        parallel = rock_properties.compute_rock_properties(
+            grid,
+            config.rock_properties_config,
+            reference=reference,
+            n_workers=2,
+            numeric_mode=numeric_mode,
+        )
+    assert f'with 2 workers ({executor})' in caplog.text
+    for property_kind, store in serial.items():
+        assert parallel[property_kind].values.tolist() == store.values.tolist()
+
+
+def test_rock_properties_incremental(tmp_path: Path, end_to_end_fixture_dir: Path, monkeypatch, caplog):
+    model_dir = end_to_end_fixture_dir / 'outcrop_2d' / 'cond'
+    config_file, output_files = _setup_temporary_model_run(
+        model_dir,
+        tmp_path,
+        output_keys=['conductivity', 'permeability', 'pore_pressure', 'rock_properties'],
+    )
+
+    generate_rock_properties(config_file, incremental=True)
+    for output_file in output_files:
+        assert output_file.read_text() == (model_dir / output_file.name).read_text()
+
+    written_files = []
+
+    def write_compact_node_array(node_numbers, values, output_file, **kwargs):
+        written_files.append(output_file.name)
+        original_write_compact_node_array(node_numbers, values, output_file, **kwargs)
+
+    original_write_compact_node_array = rock_properties.write_compact_node_array
+    monkeypatch.setattr(rock_properties, 'write_compact_node_array', write_compact_node_array)
+
+    with caplog.at_level(logging.INFO):
+        generate_rock_properties(config_file, incremental=True)
+    assert written_files == []
+    assert f'skipping (ppor): {tmp_path / "model_dir" / "cond.ppor"}\n' in caplog.text
+
+    config_file.write_text(config_file.read_text().replace('A: 3.66e-18', 'A: 4.0e-18'))
+    generate_rock_properties(config_file, incremental=True)
+    assert written_files == ['cond.perm']
+    incremental_permeability = (tmp_path / 'model_dir' / 'cond.perm').read_text()
+
+    generate_rock_properties(config_file)
+    assert incremental_permeability == (tmp_path / 'model_dir' / 'cond.perm').read_text()
+    assert incremental_permeability != (model_dir / 'cond.perm').read_text()
+
+    written_files.clear()
+    generate_rock_properties(config_file, incremental=True, numeric_mode='fast')  # Decimal values are not reused
+    assert sorted(written_files) == sorted(output_file.name for output_file in output_files)
+
+
 @pytest.mark.parametrize('mesh_name', ('flat_box', 'outcrop_2d', 'warped_box'))
 def test_append_zones_against_fixture(tmp_path: Path, end_to_end_fixture_dir: Path, mesh_name: str):
     model_dir = end_to_end_fixture_dir / mesh_name / 'cond'
@@ -263,6 +582,26 @@ def test_generate_hydrostatic_pressure(tmp_path: Path, end_to_end_fixture_dir: P
     assert_array_almost_equal(fixture_pressure, output_pressure, 1)
 
 
+@pytest.mark.parametrize('mesh_name', ('flat_box', 'outcrop_2d'))
+def test_generate_hydrostatic_pressure_streaming(tmp_path: Path, end_to_end_fixture_dir: Path, mesh_name: str):
+    model_dir = end_to_end_fixture_dir / mesh_name / 'cond'
+    output_file = tmp_path / 'test.iap'
+    streamed_file = tmp_path / 'streamed.iap'
+
+    generate_hydrostatic_pressure(model_dir / 'config.yaml', output_file=output_file)
+    generate_hydrostatic_pressure(model_dir / 'config.yaml', output_file=streamed_file, chunk_size=10)
+
+    assert output_file.read_text() == streamed_file.read_text()
+
+
+def _is_number(token: str) -> bool:
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
+
+
 def _setup_temporary_model_run(run_dir: Path, tmp_path: Path, output_keys: list[str] = None) -> tuple[Path]:
     tmp_model_dir = tmp_path / 'model_dir'
     shutil.copytree(run_dir, tmp_model_dir)
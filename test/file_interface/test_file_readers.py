@@ -1,14 +1,22 @@
 from decimal import Decimal
+import shutil
 
+import numpy as np
 import pytest
 
 from fehmtk.fehm_objects import Element, RestartMetadata, State, Vector, Zone
 from fehmtk.file_interface import (
+    iterate_fehm_coordinates,
+    iterate_restart_block,
     read_avs,
+    read_avs_columns,
+    read_compact_node_array,
     read_fehm,
+    read_nist_density_table,
     read_nist_lookup_table,
     read_pressure,
     read_restart,
+    read_storage_coefficients,
     read_volume_from_storage,
     read_zones,
 )
@@ -32,6 +40,15 @@ def test_read_fehm_pyramid(fixture_dir):
             assert len(element.nodes) == element.connectivity
 
 
+def test_iterate_fehm_coordinates_pyramid(fixture_dir):
+    coordinates_by_number, _ = read_fehm(fixture_dir / 'simple_pyramid.fehm', read_elements=False)
+    assert [
+        (number, x, y, z) for number, x, y, z in iterate_fehm_coordinates(fixture_dir / 'simple_pyramid.fehm')
+    ] == [
+        (number, *(float(c) for c in coordinates.value)) for number, coordinates in coordinates_by_number.items()
+    ]
+
+
 def test_read_outside_zone_pyramid(fixture_dir):
     outside_zones = read_zones(fixture_dir / 'simple_pyramid_outside.zone')
     assert outside_zones == (
@@ -153,6 +170,18 @@ def test_read_simple_restart_fehm_format(fixture_dir):
     )
 
 
+@pytest.mark.parametrize('block_name', ('temperature', 'pressure'))
+def test_iterate_restart_block(fixture_dir, block_name):
+    state, _ = read_restart(fixture_dir / 'simple_restart_fehm_format.fin')
+    values = list(iterate_restart_block(fixture_dir / 'simple_restart_fehm_format.fin', block_name))
+    assert values == [float(v) for v in getattr(state, block_name)]
+
+
+def test_iterate_restart_block_missing_raises(fixture_dir):
+    with pytest.raises(KeyError):
+        list(iterate_restart_block(fixture_dir / 'simple_restart_fehm_format.fin', 'porosity'))
+
+
 def test_read_porosity_restart(fixture_dir):
     state, metadata = read_restart(fixture_dir / 'simple_restart_with_porosity.fin')
     assert metadata == RestartMetadata(
@@ -248,6 +277,38 @@ def test_read_nist_lookup(fixture_dir):
     }
 
 
+def test_read_nist_density_table_cached_beside_link_target(fixture_dir, tmp_path):
+    shared_file = tmp_path / 'shared' / 'nist.in'
+    shared_file.parent.mkdir()
+    shutil.copy(fixture_dir / 'nist_lookup_sample.in', shared_file)
+    linked_file = tmp_path / 'run.wpi'
+    linked_file.symlink_to(shared_file)
+
+    table = read_nist_density_table(linked_file)
+    np.testing.assert_array_equal(table.pressures_MPa, [20, 22])
+    np.testing.assert_array_equal(table.temperatures_degC, [0, 2, 4, 6])
+    np.testing.assert_array_equal(table.density_kg_m3, [
+        [0.100974E+04, 0.100970E+04, 0.100960E+04, 0.100946E+04],
+        [0.101071E+04, 0.101065E+04, 0.101055E+04, 0.101039E+04],
+    ])
+    assert (shared_file.parent / 'nist.in.density_cache.npy').exists()
+
+    cached_table = read_nist_density_table(linked_file)
+    assert isinstance(cached_table.density_kg_m3, np.memmap)
+    np.testing.assert_array_equal(cached_table.density_kg_m3, table.density_kg_m3)
+
+    shared_file.write_text(shared_file.read_text().replace('0.100974E+04', '0.100975E+04'))
+    rebuilt_table = read_nist_density_table(linked_file)
+    assert rebuilt_table.density_kg_m3[0, 0] == 0.100975E+04
+
+
+def test_read_nist_density_table_irregular_raises(fixture_dir, tmp_path):
+    nist_file = tmp_path / 'nist.in'
+    nist_file.write_text(''.join((fixture_dir / 'nist_lookup_sample.in').read_text().splitlines(True)[:-1]))
+    with pytest.raises(ValueError):
+        read_nist_density_table(nist_file)
+
+
 def test_read_storage_volume_square(fixture_dir):
     volume = read_volume_from_storage(fixture_dir / 'square.stor')
     assert volume == (
@@ -268,3 +329,40 @@ def test_read_storage_volume_pyramid(fixture_dir):
         Decimal('2.343750000000E+04'),
         Decimal('4.687500000001E+04'),
     )
+
+
+def test_read_storage_coefficients_flat_box(fixture_dir):
+    storage_file = fixture_dir.parent / 'end_to_end' / 'fixtures' / 'flat_box' / 'p12' / 'p12.stor'
+    storage_coefficients = read_storage_coefficients(storage_file)
+    geometric_coefficients = storage_coefficients.geometric_coefficients
+
+    np.testing.assert_array_equal(
+        storage_coefficients.volumes,
+        np.array(read_volume_from_storage(storage_file), dtype=float),
+    )
+    assert geometric_coefficients.shape == (194, 194)
+    assert geometric_coefficients.diagonal().sum() == 0
+    assert abs(geometric_coefficients - geometric_coefficients.T).max() == 0
+    assert geometric_coefficients.min() >= 0
+    np.testing.assert_allclose(geometric_coefficients[0].data, [47.96966912, 47.96966912, 303.87109375, 4.06066176])
+
+
+def test_read_compact_node_array_vector(fixture_dir):
+    conductivity_file = fixture_dir.parent / 'end_to_end' / 'fixtures' / 'flat_box' / 'p12' / 'p12.cond'
+    conductivity = read_compact_node_array(conductivity_file, n_nodes=194)
+    assert conductivity.shape == (194, 3)
+    np.testing.assert_array_equal(conductivity[[0, 8, 9, 193]], [[1.572] * 3, [1.572] * 3, [1.377] * 3, [1.93102] * 3])
+
+
+def test_read_avs_columns_matches_read_avs(fixture_dir):
+    columns = read_avs_columns(fixture_dir / 'simple_sca_node.avs')
+    state = read_avs(fixture_dir / 'simple_sca_node.avs')
+    assert set(columns) == {'temperature', 'pressure', 'source', 'mass_flux'}
+    for field, values in columns.items():
+        np.testing.assert_array_equal(values, np.array(getattr(state, field), dtype=float))
+
+
+def test_read_avs_columns_vector(fixture_dir):
+    columns = read_avs_columns(fixture_dir / 'simple_vec_node.avs')
+    assert list(columns) == ['volume_flux']
+    np.testing.assert_array_equal(columns['volume_flux'], np.zeros((8, 3)))
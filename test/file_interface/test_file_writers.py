@@ -1,5 +1,38 @@
+from decimal import Decimal
+
+import numpy as np
+
 from fehmtk.config import FilesConfig
-from fehmtk.file_interface import write_files_index
+from fehmtk.file_interface import write_compact_node_array, write_compact_node_data, write_files_index
+
+
+def test_write_compact_node_array(tmp_path):
+    node_numbers = np.array([5, 1, 2, 3, 7, 6])
+    values = np.array([
+        [Decimal('-0.5'), '0.'],
+        [Decimal('-0.5'), '0.'],
+        [Decimal('-0.5'), '0.'],
+        [Decimal('2E-7'), '0.'],
+        [Decimal('-0.5'), '0.'],
+        [Decimal('-0.5'), '0.'],
+    ], dtype=object)
+
+    write_compact_node_array(node_numbers, values, tmp_path / 'array.txt', header='hflx\n', footer='0\n')
+    write_compact_node_data(
+        {node_number: tuple(row) for node_number, row in zip(node_numbers.tolist(), values)},
+        tmp_path / 'dict.txt',
+        header='hflx\n',
+        footer='0\n',
+    )
+
+    assert (tmp_path / 'array.txt').read_text() == (
+        'hflx\n'
+        '      1       2 1           -0.5 0.\n'
+        '      3       3 1           2E-7 0.\n'
+        '      5       7 1           -0.5 0.\n'
+        '0\n'
+    )
+    assert (tmp_path / 'dict.txt').read_text() == (tmp_path / 'array.txt').read_text()
 
 
 def test_create_files_index(tmp_path):
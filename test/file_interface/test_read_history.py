@@ -1,9 +1,16 @@
 from decimal import Decimal
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from fehmtk.file_interface.history import read_history, read_history_times
+from fehmtk.file_interface.history import (
+    HistoryTail,
+    iterate_history,
+    read_history,
+    read_history_header,
+    read_history_times,
+)
 
 
 def test_read_history_all(fixture_dir):
@@ -91,3 +98,74 @@ def test_read_history_times_incomplete(fixture_dir):
         Decimal('6.10510000000000089E-004'),
         Decimal('7.71561000000000143E-004'),
     )
+
+
+@pytest.mark.parametrize('read_nodes, read_fields', (
+    (None, None),
+    ([662], ['temperature(deg C)', 'total pressure(Mpa)']),
+))
+def test_iterate_history_matches_read_history(fixture_dir, read_nodes, read_fields):
+    history = read_history(fixture_dir / 'simple_run.hist', read_nodes=read_nodes, read_fields=read_fields)
+    timesteps = list(iterate_history(fixture_dir / 'simple_run.hist', read_nodes=read_nodes, read_fields=read_fields))
+
+    assert len(timesteps) == history.time_days.nunique()
+    values = np.concatenate([timestep.values for timestep in timesteps])
+    np.testing.assert_array_equal(values, history.drop(columns=['time_days', 'node']).to_numpy(dtype=float))
+    times = np.repeat([timestep.time_days for timestep in timesteps], len(timesteps[0].values))
+    np.testing.assert_array_equal(times, history.time_days.to_numpy(dtype=float))
+
+
+@pytest.mark.parametrize('fixture_name, n_timesteps', (
+    ('simple_run_incomplete.hist', 7),
+    ('simple_run_no_nodes.hist', 605),
+))
+def test_iterate_history_incomplete_and_no_nodes(fixture_dir, fixture_name, n_timesteps):
+    header = read_history_header(fixture_dir / fixture_name)
+    timesteps = list(iterate_history(fixture_dir / fixture_name))
+    assert len(timesteps) == n_timesteps
+    assert timesteps[-1].values.shape == (len(header.nodes), len(header.fields))
+
+
+def test_iterate_history_partially_written_timestep(fixture_dir, tmp_path):
+    lines = (fixture_dir / 'simple_run.hist').read_text().splitlines(True)
+    history_file = tmp_path / 'partial.hist'
+    for n_lines, n_timesteps in ((14, 0), (15, 1), (16, 1), (17, 1), (18, 2)):
+        history_file.write_text(''.join(lines[:n_lines - 1]) + lines[n_lines - 1][:20])
+        assert len(list(iterate_history(history_file))) == n_timesteps
+
+
+@pytest.mark.parametrize('read_nodes, read_fields', (
+    (None, None),
+    ([662], ['temperature(deg C)']),
+))
+def test_history_tail_matches_iterate_history(fixture_dir, tmp_path, read_nodes, read_fields):
+    content = (fixture_dir / 'simple_run.hist').read_bytes()
+    expected = list(iterate_history(fixture_dir / 'simple_run.hist', read_nodes=read_nodes, read_fields=read_fields))
+    history_file = tmp_path / 'run.hist'
+    history_file.write_bytes(b'')
+    tail = HistoryTail(history_file, read_nodes=read_nodes, read_fields=read_fields)
+
+    timesteps = []
+    for end in (50, 700, 701, 1000, 20000, 20000, 90001, len(content)):  # cut mid-header, mid-line and at line ends
+        history_file.write_bytes(content[:end])
+        timesteps.extend(tail.read_new_timesteps())
+        assert tail.offset <= end
+
+    assert tail.finished
+    assert tail.header == read_history_header(fixture_dir / 'simple_run.hist')
+    assert [timestep.time_days for timestep in timesteps] == [timestep.time_days for timestep in expected]
+    for timestep, expected_timestep in zip(timesteps, expected):
+        np.testing.assert_array_equal(timestep.values, expected_timestep.values)
+
+
+def test_history_tail_restarts_when_truncated(fixture_dir, tmp_path):
+    content = (fixture_dir / 'simple_run.hist').read_bytes()
+    history_file = tmp_path / 'run.hist'
+    history_file.write_bytes(content)
+    tail = HistoryTail(history_file)
+    assert len(tail.read_new_timesteps()) == 605
+    assert tail.read_new_timesteps() == []
+
+    history_file.write_bytes((fixture_dir / 'simple_run_incomplete.hist').read_bytes())
+    assert len(tail.read_new_timesteps()) == 7
+    assert not tail.finished
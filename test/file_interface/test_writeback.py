@@ -5,6 +5,7 @@ from fehmtk.file_interface import (
     read_restart,
     read_zones,
     write_pressure,
+    write_pressure_chunks,
     write_restart,
     write_zones,
 )
@@ -69,3 +70,15 @@ def test_writeback_pressure(fixture_dir, tmp_path):
     write_pressure(pressure_by_node, output_file=output_file)
 
     assert initial_file.read_text() == output_file.read_text()
+
+
+@pytest.mark.parametrize('chunk_size', (1, 2, 5, 10))
+def test_writeback_pressure_chunks(fixture_dir, tmp_path, chunk_size):
+    initial_file = fixture_dir / 'square.iap'
+    output_file = tmp_path / 'out.iap'
+
+    pressure = read_pressure(initial_file)
+    chunks = (pressure[i:i + chunk_size] for i in range(0, len(pressure), chunk_size))
+    write_pressure_chunks(chunks, output_file=output_file, n_nodes=len(pressure))
+
+    assert initial_file.read_text() == output_file.read_text()
@@ -0,0 +1,109 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from fehmtk.config import ModelConfig
+from fehmtk.fehm_objects import Vector
+from fehmtk.property_models import get_rock_property_model
+
+POROSITY_CONFIG = ModelConfig(
+    'depth_power_law_with_maximum',
+    {'porosity_a': Decimal('0.84'), 'porosity_b': Decimal('-0.25')},
+)
+DEPTHS = [Decimal(v) for v in ('0', '0.5', '10', '20', '250.25', '999', '1500')]
+
+
+@pytest.mark.parametrize(
+    'property_kind, model_config',
+    (
+        ('porosity', ModelConfig('depth_exponential', {
+            'porosity_a': Decimal('0.84'), 'porosity_b': Decimal('-0.001'),
+        })),
+        ('porosity', POROSITY_CONFIG),
+        ('grain_density', ModelConfig('constant', {'constant': Decimal('2700')})),
+        ('permeability', ModelConfig('void_ratio_exponential', {'A': Decimal('1E-17'), 'B': Decimal('5.0')})),
+        ('permeability', ModelConfig('void_ratio_exponential_anisotropic', {
+            'A': Decimal('1E-17'), 'B': Decimal('5.0'),
+            'x_scale': Decimal('2'), 'y_scale': 1, 'z_scale': Decimal('0.5'),
+        })),
+        ('permeability', ModelConfig('constant_anisotropic', {
+            'constant': Decimal('1E-15'), 'x_scale': Decimal('2'), 'y_scale': 1, 'z_scale': Decimal('0.5'),
+        })),
+        ('conductivity', ModelConfig('porosity_weighted', {
+            'water_conductivity': Decimal('0.6'), 'rock_conductivity': Decimal('2.5'),
+        })),
+        ('conductivity', ModelConfig('porosity_weighted_anisotropic', {
+            'water_conductivity': Decimal('0.6'), 'rock_conductivity': Decimal('2.5'),
+            'x_scale': Decimal('2'), 'y_scale': 1, 'z_scale': Decimal('0.5'),
+        })),
+        ('conductivity', ModelConfig('ctr2tcon', {
+            'ctr_model': {'model_kind': 'polynomial', 'model_params': {'x^1': 0.5, 'x^2': 1e-5}},
+            'node_depth_columns': [[Decimal(0), Decimal(500), Decimal(1500)], [Decimal(0), Decimal(1000)]],
+        })),
+        ('compressibility', ModelConfig('overburden', {
+            'a': Decimal('0.09'), 'grav': Decimal('9.81'),
+            'rhow': Decimal('1000.0'), 'min_overburden': Decimal('25.0'),
+        })),
+        ('compressibility', ModelConfig('overburden', {
+            'a': Decimal('0.09'), 'grav': Decimal('9.81'),
+            'rhow': Decimal('1000.0'), 'min_overburden': Decimal('25.0'), 'interpolate_depth': True,
+        })),
+    ),
+)
+def test_array_model_matches_scalar_reference(property_kind, model_config):
+    model_config_by_property_kind = {
+        'porosity': POROSITY_CONFIG,
+        'grain_density': ModelConfig('constant', {'constant': Decimal('2700')}),
+        property_kind: model_config,
+    }
+    scalar_model = get_rock_property_model(property_kind, model_config.kind)
+    array_model = get_rock_property_model(property_kind, model_config.kind, vectorized=True)
+
+    expected = [scalar_model(depth, model_config_by_property_kind, property_kind) for depth in DEPTHS]
+    expected = np.array([value.value if isinstance(value, Vector) else value for value in expected], dtype=object)
+
+    exact = array_model(np.array(DEPTHS, dtype=object), model_config_by_property_kind, property_kind)
+    assert exact.tolist() == expected.tolist()
+
+    fast = array_model(np.array(DEPTHS, dtype=float), model_config_by_property_kind, property_kind)
+    assert fast.dtype == float
+    np.testing.assert_allclose(fast, expected.astype(float), rtol=1e-12)
+
+
+@pytest.mark.parametrize('property_kind, model_config', (
+    ('permeability', ModelConfig('void_ratio_exponential', {'A': Decimal('1E-17'), 'B': Decimal('5.0')})),
+    ('conductivity', ModelConfig('porosity_weighted', {
+        'water_conductivity': Decimal('0.6'), 'rock_conductivity': Decimal('2.5'),
+    })),
+    ('compressibility', ModelConfig('overburden', {
+        'a': Decimal('0.09'), 'grav': Decimal('9.81'),
+        'rhow': Decimal('1000.0'), 'min_overburden': Decimal('25.0'),
+    })),
+))
+def test_models_use_porosity_dependency(property_kind, model_config):
+    model_config_by_property_kind = {
+        'porosity': POROSITY_CONFIG,
+        'grain_density': ModelConfig('constant', {'constant': Decimal('2700')}),
+        property_kind: model_config,
+    }
+    porosity_model = get_rock_property_model('porosity', POROSITY_CONFIG.kind, vectorized=True)
+    depths = np.array(DEPTHS, dtype=object)
+    porosity = porosity_model(depths, model_config_by_property_kind, 'porosity')
+
+    for vectorized in (False, True):
+        model = get_rock_property_model(property_kind, model_config.kind, vectorized=vectorized)
+        if vectorized:
+            expected = model(depths, model_config_by_property_kind, property_kind)
+            actual = model(depths, model_config_by_property_kind, property_kind, {'porosity': porosity})
+            assert actual.tolist() == expected.tolist()
+        else:
+            for depth, depth_porosity in zip(DEPTHS, porosity):
+                expected = model(depth, model_config_by_property_kind, property_kind)
+                actual = model(depth, model_config_by_property_kind, property_kind, {'porosity': depth_porosity})
+                assert actual == expected
+
+    # A supplied porosity is used in place of the porosity model
+    model = get_rock_property_model(property_kind, model_config.kind, vectorized=True)
+    shifted = model(depths, model_config_by_property_kind, property_kind, {'porosity': porosity / 2})
+    assert shifted.tolist() != model(depths, model_config_by_property_kind, property_kind).tolist()
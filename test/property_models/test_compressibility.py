@@ -53,3 +53,45 @@ def test_overburden(depth, params, expected):
         property_kind='compressibility',
     )
     assert value == expected
+
+
+OVERBURDEN_PARAMS = {
+    'a': Decimal('0.09'),
+    'grav': Decimal('9.81'),
+    'rhow': Decimal('1000.0'),
+    'min_overburden': Decimal('25.0'),
+}
+
+
+def _get_overburden_config(**extra_params) -> dict[str, ModelConfig]:
+    return {
+        'compressibility': ModelConfig('overburden', {**OVERBURDEN_PARAMS, **extra_params}),
+        'porosity': ModelConfig('depth_exponential', {'porosity_a': Decimal('0.6'), 'porosity_b': Decimal('-0.001')}),
+        'grain_density': ModelConfig('constant', {'constant': Decimal('2700.0')}),
+    }
+
+
+def test_overburden_extends_column_past_initial_depth():
+    model_config_by_property_kind = _get_overburden_config()
+    overburden = Overburden()
+    overburden(Decimal(10), model_config_by_property_kind, 'compressibility')  # column precomputed to 1000 m
+    extended = overburden(Decimal('1000.5'), model_config_by_property_kind, 'compressibility')
+
+    fresh = Overburden()(Decimal('1000.5'), model_config_by_property_kind, 'compressibility')
+    assert extended == fresh
+
+
+@pytest.mark.parametrize('depth, lower, upper', (
+    (Decimal('20.25'), Decimal(20), Decimal(21)),
+    (Decimal('0.5'), Decimal(0), Decimal(1)),
+))
+def test_overburden_interpolate_depth(depth, lower, upper):
+    overburden = Overburden()
+    model_config_by_property_kind = _get_overburden_config(interpolate_depth=True)
+    value, lower_value, upper_value = (
+        overburden(d, model_config_by_property_kind, 'compressibility') for d in (depth, lower, upper)
+    )
+    assert min(lower_value, upper_value) < value < max(lower_value, upper_value)
+
+    ceil_value = Overburden()(depth, _get_overburden_config(), 'compressibility')
+    assert ceil_value != value
@@ -1,8 +1,17 @@
+from decimal import Decimal
+
+import numpy as np
 import pytest
 
 from fehmtk.fehm_objects import Vector
 from fehmtk.config import ModelConfig
-from fehmtk.property_models.conductivity import constant_anisotropic, porosity_weighted, porosity_weighted_anisotropic
+from fehmtk.property_models.conductivity import (
+    constant_anisotropic,
+    ctr2tcon,
+    ctr2tcon_array,
+    porosity_weighted,
+    porosity_weighted_anisotropic,
+)
 
 
 @pytest.mark.parametrize(
@@ -84,3 +93,29 @@ def test_porosity_weighted_anisotropic(depth, params, expected):
         property_kind='conductivity',
     )
     assert value == expected
+
+
+CTR2TCON_CONFIG = ModelConfig('ctr2tcon', {
+    'ctr_model': {'model_kind': 'polynomial', 'model_params': {'x^1': 0.5, 'x^2': 1e-5}},
+    'node_depth_columns': [[0, 50, 100, 160], [0, 80], [10, 35]],
+})
+
+
+@pytest.mark.parametrize(
+    'depth, expected',
+    (
+        (Decimal('0'), Decimal('1.997289264211906005461292971')),
+        (Decimal('-5'), Decimal('1.997289264211906005461292971')),
+        (Decimal('10.5'), Decimal('2.078129869980542020706726208')),
+        (Decimal('30'), Decimal('2.035928846686727926048217958')),  # equidistant from 10 and 50, 50 seen first
+        (Decimal('50'), Decimal('2.035928846686727926048217958')),
+        (Decimal('75'), Decimal('2.014065281521547427747857194')),  # equidistant from 50 and 100, 100 seen first
+        (Decimal('1000'), Decimal('2.014065281521547427747857194')),
+    ),
+)
+def test_ctr2tcon(depth, expected):
+    model_config_by_property_kind = {'conductivity': CTR2TCON_CONFIG}
+    assert ctr2tcon(depth, model_config_by_property_kind, 'conductivity') == Vector(expected, expected, expected)
+
+    values = ctr2tcon_array(np.array([float(depth)]), model_config_by_property_kind, 'conductivity')
+    np.testing.assert_allclose(values, [[float(expected)] * 3], rtol=1e-12)
@@ -0,0 +1,84 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from fehmtk.config import ModelConfig
+from fehmtk.fehm_objects import Vector
+from fehmtk.property_models import get_rock_property_model, get_rock_property_model_dependencies
+from fehmtk.property_models.expression import compile_expression
+
+DEPTHS = [Decimal(v) for v in ('0', '0.5', '10', '250.25', '1500')]
+
+
+@pytest.mark.parametrize('source', (
+    'depth.real',
+    'depth[0]',
+    'depth > 10',
+    'lambda: 1',
+    'open("config.yaml")',
+    'exp(depth, 2)',
+    'exp(x=depth)',
+    '"depth"',
+    'a if depth else b',
+    'depth +',
+))
+def test_compile_expression_rejects(source):
+    with pytest.raises(ValueError):
+        compile_expression(source)
+
+
+def test_compile_expression_reuses_common_subexpressions():
+    compiled = compile_expression('exp(-depth / L) * a + exp(-depth / L) * b')
+    n_exp = sum(1 for instruction in compiled.instructions if instruction.value == 'exp')
+    assert n_exp == 1
+
+
+def test_expression_matches_builtin_model():
+    params = {'porosity_a': Decimal('0.84'), 'porosity_b': Decimal('-0.001')}
+    model_config_by_property_kind = {
+        'porosity': ModelConfig('expression', {'expression': 'porosity_a * exp(porosity_b * depth)', **params}),
+        'grain_density': ModelConfig('depth_exponential', params),
+    }
+    builtin_model = get_rock_property_model('porosity', 'depth_exponential', vectorized=True)
+    expression_model = get_rock_property_model('porosity', 'expression', vectorized=True)
+
+    for dtype in (object, float):
+        depths = np.array(DEPTHS, dtype=dtype)
+        expected = builtin_model(depths, model_config_by_property_kind, 'grain_density')
+        actual = expression_model(depths, model_config_by_property_kind, 'porosity')
+        assert actual.dtype == expected.dtype
+        assert actual.tolist() == expected.tolist()
+
+
+def test_expression_dependencies_and_vector_values():
+    model_config = ModelConfig('expression', {
+        'expression': 'A * exp(B * porosity / (1 - porosity)) * (1 + 0 * x)',
+        'A': Decimal('1E-17'),
+        'B': Decimal('5.0'),
+    })
+    assert get_rock_property_model_dependencies('permeability', model_config.kind, model_config.params) == (
+        'porosity',
+        'x',
+    )
+    model_config_by_property_kind = {'permeability': model_config}
+
+    scalar_model = get_rock_property_model('permeability', 'expression')
+    value = scalar_model(
+        Decimal(10),
+        model_config_by_property_kind,
+        'permeability',
+        dependencies={'porosity': Decimal('0.5'), 'x': Decimal(3)},
+    )
+    expected = Decimal('1E-17') * Decimal(5).exp()
+    assert value == Vector(expected, expected, expected)
+
+    with pytest.raises(KeyError):
+        scalar_model(Decimal(10), model_config_by_property_kind, 'permeability', dependencies={'x': Decimal(3)})
+
+
+def test_expression_unknown_param():
+    model_config_by_property_kind = {'porosity': ModelConfig('expression', {'expression': 'a * depth'})}
+    array_model = get_rock_property_model('porosity', 'expression', vectorized=True)
+    with pytest.raises(KeyError):
+        array_model(np.array([1.]), model_config_by_property_kind, 'porosity')
@@ -1,9 +1,22 @@
+from decimal import Decimal
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from fehmtk.config import BoundaryConfig, FlowConfig, ModelConfig
-from fehmtk.preprocessors.boundaries import _validate_config, warn_if_file_not_referenced
+from fehmtk.fehm_objects import Grid, Node, Vector
+from fehmtk.file_interface import read_grid
+from fehmtk.preprocessors import boundaries
+from fehmtk.preprocessors.boundaries import _gather_node_numbers, _validate_config, warn_if_file_not_referenced
+from fehmtk.preprocessors.boundary_models import get_boundary_model, validate_boundary_model
+
+CRUSTAL_AGE_PARAMS = {
+    'coefficient_MW': Decimal('0.5'),
+    'boundary_distance_to_ridge_m': Decimal('1000'),
+    'spread_rate_mm_per_year': Decimal('30'),
+    'crustal_age_sign': '+',
+}
 
 
 @pytest.fixture
@@ -64,3 +77,97 @@ def test_validate_no_zones(valid_model_config):
     ])
     with pytest.raises(ValueError):
         _validate_config(config)
+
+
+@pytest.mark.parametrize('boundary_kind, model_config', (
+    ('heat_flux', ModelConfig('crustal_age', CRUSTAL_AGE_PARAMS | {'crustal_age_sign': 2})),
+    ('heat_flux', ModelConfig('crustal_age', CRUSTAL_AGE_PARAMS | {'crustal_age_dimension': 'w'})),
+    ('heat_flux', ModelConfig('nonsense', {})),
+    ('nonsense', ModelConfig('open_flow', {})),
+))
+def test_validate_boundary_model_invalid(boundary_kind, model_config):
+    with pytest.raises((ValueError, NotImplementedError)):
+        validate_boundary_model(boundary_kind, model_config)
+
+
+def test_crustal_age_heatflux():
+    coordinates = np.array([[Decimal(0), 0, 0], [Decimal(3000), 0, 0]], dtype=object)
+    outside_areas = np.array([[0, 0, Decimal(2)], [0, 0, Decimal(-2)]], dtype=object)
+    model = get_boundary_model('heat_flux', 'crustal_age')
+
+    heatflux = model(coordinates, outside_areas, None, CRUSTAL_AGE_PARAMS)
+    age_ma = [1 / Decimal(30000) * Decimal(1000), 1 / Decimal(30000) * Decimal(4000)]
+    assert heatflux.tolist() == [-2 * (Decimal('0.5') / age.sqrt()) for age in age_ma]
+
+
+def test_open_flow():
+    volumes = np.array([Decimal(10), Decimal(20)], dtype=object)
+    model = get_boundary_model('flow', 'open_flow')
+
+    flow = model(None, None, volumes, {'input_fluid_temp_degC': 2, 'aiped_to_volume_ratio': Decimal('1E-8')})
+    assert flow.tolist() == [['0', -2, Decimal('1E-7')], ['0', -2, Decimal('2E-7')]]
+
+
+@pytest.mark.parametrize('outside_zones, material_zones, expected', (
+    (['bottom'], [], [1, 2]),
+    (['back_n', 'front_s'], [], [1, 2, 3, 4]),
+    (['back_n'], [1, 3], [1, 2, 3, 4]),
+    ([], [2, 2], [5]),
+    ([], [], []),
+))
+def test_gather_node_numbers(fixture_dir, outside_zones, material_zones, expected):
+    grid = read_grid(
+        fixture_dir / 'square.fehm',
+        material_zone_file=fixture_dir / 'square_material.zone',
+        outside_zone_file=fixture_dir / 'square_outside.zone',
+    )
+    node_numbers = _gather_node_numbers(grid, outside_zones, material_zones)
+    assert node_numbers.dtype == int
+    assert node_numbers.tolist() == expected
+
+
+def test_generate_boundary_data_later_configs_take_precedence(fixture_dir):
+    grid = read_grid(
+        fixture_dir / 'square.fehm',
+        material_zone_file=fixture_dir / 'square_material.zone',
+        outside_zone_file=fixture_dir / 'square_outside.zone',
+        area_file=fixture_dir / 'square.area',
+    )
+    boundary_configs = [
+        BoundaryConfig(
+            boundary_model=ModelConfig('constant_MW_per_m2', {'constant': Decimal(constant)}),
+            outside_zones=outside_zones,
+            material_zones=[],
+        )
+        for constant, outside_zones in (('1', ['bottom', 'top']), ('2', ['back_n']))
+    ]
+
+    node_numbers, heatflux = boundaries.generate_boundary_data(
+        grid,
+        boundary_configs=boundary_configs,
+        boundary_kind='heat_flux',
+    )
+
+    assert node_numbers.tolist() == [1, 2, 3, 4]
+    areas_z = [abs(grid.node(node_number).outside_area.z) for node_number in node_numbers.tolist()]
+    assert heatflux.tolist() == [-area * constant for area, constant in zip(areas_z, (1, 2, 2, 1))]
+
+
+@pytest.mark.parametrize('voronoi_max_points', (100, 10))
+def test_plot_heatflux_to_file(tmp_path: Path, monkeypatch, voronoi_max_points: int):
+    monkeypatch.setattr(boundaries, 'VORONOI_MAX_POINTS', voronoi_max_points)
+    nodes_by_number = {
+        i * 5 + j + 1: Node(
+            i * 5 + j + 1,
+            coordinates=Vector(Decimal(i * 1000), Decimal(j * 1000), Decimal(0)),
+            outside_area=Vector(Decimal(0), Decimal(0), Decimal(-1E6)),
+        )
+        for i in range(5) for j in range(5)
+    }
+    node_numbers = np.array(list(nodes_by_number))
+    heatflux = np.array([Decimal('-0.2') - number / Decimal(1000) for number in nodes_by_number], dtype=object)
+    output_file = tmp_path / 'heat_flux.png'
+
+    node_arrays = boundaries.BoundaryNodeArrays.from_grid(Grid(nodes_by_number, {}))
+    boundaries.plot_heatflux(node_numbers, heatflux, node_arrays, output_file=output_file)
+    assert output_file.read_bytes().startswith(b'\x89PNG')
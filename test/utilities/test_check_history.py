@@ -0,0 +1,91 @@
+import logging
+from pathlib import Path
+import time
+
+from matplotlib import pyplot as plt
+import numpy as np
+import pytest
+
+from fehmtk.file_interface import HistoryTail, read_history
+from fehmtk.postprocessors.check_history import LiveHistoryPlot, downsample_history, follow_history, plot_history
+
+
+@pytest.mark.parametrize('plot', (False, True))
+def test_follow_history_finished_run(fixture_dir: Path, caplog, plot):
+    with caplog.at_level(logging.INFO):
+        tail = follow_history(
+            fixture_dir / 'simple_run.hist',
+            fields=['temperature(deg C)', 'total pressure(Mpa)'],
+            poll_seconds=0,
+            plot=plot,
+        )
+    plt.close('all')
+
+    assert tail.finished
+    assert 'Read 605 new timesteps' in caplog.text
+    assert 'Run finished' in caplog.text
+
+
+def test_follow_history_growing_file(fixture_dir: Path, tmp_path: Path, monkeypatch):
+    lines = (fixture_dir / 'simple_run.hist').read_text().splitlines(True)
+    history_file = tmp_path / 'run.hist'
+    history_file.write_text(''.join(lines[:20]))
+
+    def append_timestep(seconds):
+        with open(history_file, 'a') as f:
+            f.writelines(lines[20:23])
+
+    monkeypatch.setattr(time, 'sleep', append_timestep)
+    tail = follow_history(history_file, nodes=[662], poll_seconds=1, plot=False, max_polls=3)
+
+    assert not tail.finished
+    assert tail.offset == len(''.join(lines[:20] + 2 * lines[20:23]).encode())
+
+
+def test_live_history_plot_downsampled(fixture_dir: Path):
+    fields = ['temperature(deg C)', 'total pressure(Mpa)']
+    tail = HistoryTail(fixture_dir / 'simple_run.hist', read_fields=fields)
+    timesteps = tail.read_new_timesteps()
+    live_plot = LiveHistoryPlot(tail.header, None, fields, downsample='lttb', max_points=40)
+    for start in range(0, len(timesteps), 100):
+        live_plot.update(timesteps[start:start + 100])
+    lines = [line for ax in live_plot.axs for line in ax.lines]
+    plt.close('all')
+
+    assert live_plot.n_timesteps == len(timesteps)
+    np.testing.assert_array_equal(live_plot.values, np.stack([timestep.values for timestep in timesteps]))
+    np.testing.assert_array_equal(live_plot.times_years, [timestep.time_days / 365 for timestep in timesteps])
+    assert all(len(line.get_xdata()) <= 40 for line in lines)
+    assert all(line.get_xdata()[-1] == live_plot.times_years[-1] for line in lines)
+
+
+@pytest.mark.parametrize('method', ('lttb', 'minmax'))
+def test_downsample_history(fixture_dir: Path, method):
+    history = read_history(fixture_dir / 'simple_run.hist', read_fields=['temperature(deg C)']).astype(float)
+    downsampled = downsample_history(history, 'time_days', 'temperature(deg C)', method=method, max_points=50)
+
+    assert list(downsampled.node.unique()) == list(history.node.unique())
+    for node, node_history in history.groupby('node'):
+        node_downsampled = downsampled[downsampled.node == node]
+        assert len(node_downsampled) <= 50
+        assert node_downsampled.time_days.is_monotonic_increasing
+        assert node_downsampled.time_days.iloc[[0, -1]].tolist() == node_history.time_days.iloc[[0, -1]].tolist()
+        if method == 'minmax':  # the envelope is kept
+            assert node_downsampled['temperature(deg C)'].max() == node_history['temperature(deg C)'].max()
+            assert node_downsampled['temperature(deg C)'].min() == node_history['temperature(deg C)'].min()
+
+        merged = node_downsampled.merge(node_history, on='time_days', suffixes=('', '_full'))
+        np.testing.assert_array_equal(merged['temperature(deg C)'], merged['temperature(deg C)_full'])
+
+
+def test_plot_history_downsampled(fixture_dir: Path, monkeypatch):
+    history = read_history(fixture_dir / 'simple_run.hist')
+    fields = ['temperature(deg C)', 'total pressure(Mpa)']
+    monkeypatch.setattr(plt, 'show', lambda: None)
+    plot_history(history, fields, downsample='lttb', max_points=40)
+
+    values_axes, rates_axes = (plt.figure(number).axes for number in plt.get_fignums())
+    plt.close('all')
+    for ax in values_axes + rates_axes:
+        assert ax.lines
+        assert all(len(line.get_xdata()) <= 40 for line in ax.lines)
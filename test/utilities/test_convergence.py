@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+import shutil
+
+import numpy as np
+import pytest
+
+from fehmtk.file_interface import iterate_history
+from fehmtk.postprocessors.convergence import (
+    ConvergenceReport,
+    check_convergence,
+    get_convergence_report,
+    update_convergence_report,
+)
+
+
+@pytest.mark.parametrize('thresholds, converged', (
+    (None, False),
+    ({'temperature(deg C)': 1, 'total pressure(Mpa)': 1}, True),
+))
+def test_get_convergence_report(fixture_dir: Path, thresholds, converged):
+    report = get_convergence_report(fixture_dir / 'simple_run.hist', thresholds=thresholds, window_years=5000)
+
+    assert report.n_timesteps == 605
+    assert report.time_years == pytest.approx(100000)
+    assert report.window_span_years >= 5000
+    assert report.rates_per_kyr.shape == (2, 2)
+    assert report.converged == converged
+    if converged:
+        assert 5000 <= report.converged_since_years < report.time_years
+
+
+def test_convergence_rates_match_window(fixture_dir: Path):
+    timesteps = list(iterate_history(fixture_dir / 'simple_run.hist', read_fields=['temperature(deg C)']))
+    report = get_convergence_report(fixture_dir / 'simple_run.hist', fields=['temperature(deg C)'], window_years=5000)
+
+    times_years = np.array([timestep.time_days for timestep in timesteps]) / 365
+    start = np.flatnonzero(times_years <= times_years[-1] - 5000)[-1]
+    expected = 1000 * (timesteps[-1].values - timesteps[start].values) / (times_years[-1] - times_years[start])
+    np.testing.assert_allclose(report.rates_per_kyr, expected)
+    assert len(report.window) == len(timesteps) - start
+
+
+def test_convergence_report_incremental_matches_full(fixture_dir: Path):
+    history_file = fixture_dir / 'simple_run.hist'
+    full_report = get_convergence_report(history_file, window_years=2000)
+
+    report = ConvergenceReport(
+        nodes=full_report.nodes,
+        fields=full_report.fields,
+        thresholds_per_kyr=full_report.thresholds_per_kyr,
+        window_years=2000,
+    )
+    timesteps = list(iterate_history(history_file, read_fields=full_report.fields))
+    for chunk in (timesteps[:100], timesteps[100:101], timesteps[101:]):
+        update_convergence_report(report, chunk)
+
+    assert report.to_dict() == full_report.to_dict()
+
+
+def test_convergence_short_history_not_converged(fixture_dir: Path):
+    report = get_convergence_report(fixture_dir / 'simple_run_incomplete.hist')
+    assert report.n_timesteps == 7
+    assert report.rates_per_kyr is None
+    assert not report.converged
+    assert report.to_dict()['max_rates_per_kyr'] is None
+
+
+@pytest.mark.parametrize('kwargs', (
+    {'fields': ['saturation(kg/kg)']},  # no threshold
+    {'fields': ['not a field(m)'], 'thresholds': {'not a field(m)': 1}},
+    {'window_years': 0},
+    {'nodes': [1]},
+))
+def test_get_convergence_report_invalid(fixture_dir: Path, kwargs):
+    with pytest.raises((KeyError, ValueError)):
+        get_convergence_report(fixture_dir / 'simple_run.hist', **kwargs)
+
+
+@pytest.mark.parametrize('thresholds, exit_code', (
+    (None, 1),
+    ([('temperature(deg C)', 1.), ('total pressure(Mpa)', 1.)], 0),
+))
+def test_check_convergence_exit_code(tmp_path: Path, fixture_dir: Path, thresholds, exit_code):
+    shutil.copy(fixture_dir / 'simple_run.hist', tmp_path / 'p12.hist')
+    config_file = tmp_path / 'config.yaml'
+    shutil.copy(fixture_dir.parent / 'end_to_end' / 'fixtures' / 'flat_box' / 'p12' / 'config.yaml', config_file)
+
+    with pytest.raises(SystemExit) as exc_info:
+        check_convergence(config_file, thresholds=thresholds, window_years=5000, report_file=tmp_path / 'report.json')
+
+    assert exc_info.value.code == exit_code
+    report = json.loads((tmp_path / 'report.json').read_text())
+    assert report['converged'] == (exit_code == 0)
+    assert set(report['max_rates_per_kyr']) == {'temperature(deg C)', 'total pressure(Mpa)'}
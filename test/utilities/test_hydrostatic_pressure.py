@@ -1,7 +1,19 @@
+from decimal import Decimal
+
 import numpy as np
 import pytest
 
-from fehmtk.preprocessors.hydrostatic_pressure import build_z_column_around_reference
+from fehmtk.config import ModelConfig
+from fehmtk.file_interface import get_file_checksum
+from fehmtk.preprocessors.adaptive_sampling import sample_columns_adaptively
+from fehmtk.preprocessors.hydrostat_cache import HydrostatColumnCache, load_column_cache
+from fehmtk.preprocessors.hydrostatic_pressure import (
+    CONVERGENCE_TOLERANCE_MPA,
+    _read_density_lookup,
+    _validate_interpolation_model,
+    build_z_column_around_reference,
+    calculate_hydrostatic_pressure_for_column,
+)
 
 
 @pytest.mark.parametrize('reference_z, z_interval_m, z_targets, expected', (
@@ -30,3 +42,126 @@ def test_build_z_column_around_reference_reference(reference_z, z_interval_m, z_
         }
     )
     np.testing.assert_array_equal(z_column, expected)
+
+
+def test_sample_columns_adaptively_linear_field_not_refined():
+    z_targets = np.linspace(0, 100, 11)
+    horizontal = np.array([[0., 0.], [10., 0.], [0., 10.], [10., 10.], [3., 7.]])
+
+    lookup = sample_columns_adaptively(
+        horizontal_coordinates=horizontal,
+        z_targets=z_targets,
+        solve_column=lambda xy: 2 * xy[0] + 3 * xy[1] + z_targets,
+        initial_samples=3,
+        tolerance=1e-6,
+        max_refinement_level=4,
+    )
+
+    assert lookup.n_leaves == 4
+    assert lookup.n_columns == 9 + 4  # initial grid plus one center check per cell
+    points = np.array([[3., 7., 15.], [10., 10., 100.], [0., 0., 0.]])
+    np.testing.assert_allclose(lookup(points), 2 * points[:, 0] + 3 * points[:, 1] + points[:, 2])
+
+
+def test_sample_columns_adaptively_refines_steep_gradient():
+    z_targets = np.linspace(0, 10, 5)
+    horizontal = np.linspace(0, 100, 201)[:, np.newaxis]
+
+    def solve_column(x):
+        return np.tanh((x[0] - 40) / 2) + z_targets
+
+    lookup = sample_columns_adaptively(
+        horizontal_coordinates=horizontal,
+        z_targets=z_targets,
+        solve_column=solve_column,
+        initial_samples=3,
+        tolerance=0.01,
+        max_refinement_level=8,
+    )
+
+    assert lookup.n_columns < 2 * 2 ** 8 + 1  # fewer solves than a regular grid at the finest spacing
+    points = np.column_stack((horizontal[:, 0], np.full(len(horizontal), 5.)))
+    expected = np.tanh((points[:, 0] - 40) / 2) + 5
+    assert np.abs(lookup(points) - expected).max() < 0.05
+
+
+@pytest.mark.parametrize('params', (
+    {'z_samples': 10},
+    {'z_samples': 10, 'tolerance_MPa': 0},
+    {'z_samples': 1, 'tolerance_MPa': 0.1},
+    {'z_samples': 10, 'tolerance_MPa': 0.1, 'initial_samples': 1},
+))
+def test_validate_adaptive_interpolation_model_invalid(params):
+    with pytest.raises(ValueError):
+        _validate_interpolation_model(ModelConfig('adaptive', params), node_coordinates=np.zeros((4, 2)))
+
+
+def _test_density_lookup(PT: np.ndarray) -> np.ndarray:
+    return 1000 * (1 + 4.6e-4 * PT[:, 0]) * (1 - 2e-4 * PT[:, 1])
+
+
+def _load_test_column_cache(cache_file, water_properties_checksum: str = 'test') -> HydrostatColumnCache:
+    return load_column_cache(
+        cache_file,
+        {'reference_z': Decimal(0), 'reference_pressure_MPa': Decimal(0.1), 'z_interval_m': Decimal(5)},
+        water_properties_checksum=water_properties_checksum,
+        density_interpolation='test',
+    )
+
+
+def _solve_test_column(
+    column_cache: HydrostatColumnCache,
+    temperature_offset: float = 0,
+    density_lookup_MPa_degC=_test_density_lookup,
+) -> np.ndarray:
+    return calculate_hydrostatic_pressure_for_column(
+        target_xy=np.array([5.]),
+        z_targets=np.array([-300., -100.]),
+        params={'reference_z': Decimal(0), 'reference_pressure_MPa': Decimal(0.1), 'z_interval_m': Decimal(5)},
+        density_lookup_MPa_degC=density_lookup_MPa_degC,
+        temperature_lookup=lambda coordinates: 4 - 0.05 * coordinates[:, -1] + temperature_offset,
+        n_iterations=5,
+        column_cache=column_cache,
+    )
+
+
+def test_column_cache_reuses_and_warm_starts(tmp_path):
+    cache_file = tmp_path / 'test.iap.hydrostat_cache.npz'
+    cold_pressures = _solve_test_column(column_cache=None)
+
+    first_cache = _load_test_column_cache(cache_file)
+    np.testing.assert_array_equal(_solve_test_column(first_cache), cold_pressures)
+    assert (first_cache.n_reused, first_cache.n_warm_started, first_cache.n_cold_started) == (0, 0, 1)
+    first_cache.to_file(cache_file)
+
+    second_cache = _load_test_column_cache(cache_file)
+    np.testing.assert_array_equal(_solve_test_column(second_cache), cold_pressures)
+    assert (second_cache.n_reused, second_cache.n_warm_started, second_cache.n_cold_started) == (1, 0, 0)
+
+    third_cache = _load_test_column_cache(cache_file)
+    warm_pressures = _solve_test_column(third_cache, temperature_offset=10)
+    cold_changed_pressures = _solve_test_column(column_cache=None, temperature_offset=10)
+    np.testing.assert_allclose(warm_pressures, cold_changed_pressures, rtol=0, atol=CONVERGENCE_TOLERANCE_MPA)
+    assert (third_cache.n_reused, third_cache.n_warm_started, third_cache.n_cold_started) == (0, 1, 0)
+
+
+def test_column_cache_invalidated_by_water_properties(tmp_path):
+    def write_water_properties(scale: float):
+        pressures, temperatures = np.meshgrid(np.arange(0., 11.), np.arange(0., 55., 5.), indexing='ij')
+        densities = scale * _test_density_lookup(np.column_stack((pressures.ravel(), temperatures.ravel())))
+        np.savetxt(water_properties_file, np.column_stack((pressures.ravel(), temperatures.ravel(), densities)))
+
+    water_properties_file = tmp_path / 'water.out'
+    cache_file = tmp_path / 'test.iap.hydrostat_cache.npz'
+    write_water_properties(scale=1)
+    first_cache = _load_test_column_cache(cache_file, get_file_checksum(water_properties_file))
+    _solve_test_column(first_cache, density_lookup_MPa_degC=_read_density_lookup(water_properties_file))
+    first_cache.to_file(cache_file)
+
+    write_water_properties(scale=1.01)
+    second_cache = _load_test_column_cache(cache_file, get_file_checksum(water_properties_file))
+    pressures = _solve_test_column(second_cache, density_lookup_MPa_degC=_read_density_lookup(water_properties_file))
+    cold_pressures = _solve_test_column(None, density_lookup_MPa_degC=_read_density_lookup(water_properties_file))
+
+    assert (second_cache.n_reused, second_cache.n_warm_started, second_cache.n_cold_started) == (0, 1, 0)
+    np.testing.assert_allclose(pressures, cold_pressures, rtol=0, atol=CONVERGENCE_TOLERANCE_MPA)
@@ -0,0 +1,103 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from fehmtk.config import ModelConfig, RockPropertiesConfig
+from fehmtk.preprocessors.rock_properties import (
+    PropertyStore,
+    _compute_rock_properties_for_zone_vectorized,
+    _validate_all_nodes_covered,
+    _validate_overburden_column_models,
+)
+
+FAST_MODEL_CONFIG_BY_PROPERTY_KIND = {
+    'porosity': ModelConfig('depth_exponential', {'porosity_a': 0.84, 'porosity_b': -0.001}),
+    'grain_density': ModelConfig('constant', {'constant': 2700.}),
+    'specific_heat': ModelConfig('constant', {'constant': 800.}),
+    'permeability': ModelConfig('void_ratio_exponential', {'A': 1e-17, 'B': 1.68}),
+    'conductivity': ModelConfig('porosity_weighted', {'water_conductivity': 0.6, 'rock_conductivity': 2.5}),
+    'compressibility': ModelConfig('overburden', {'a': 0.09, 'grav': 9.81, 'rhow': 1000., 'min_overburden': 25.}),
+}
+
+
+def test_property_store_later_assignment_takes_precedence():
+    store = PropertyStore.empty(n_nodes=5, vector_valued=False)
+    store.assign([1, 2, 3], np.array([Decimal(1), Decimal(1), Decimal(1)], dtype=object))
+    store.assign([3, 4], np.array([Decimal(2), Decimal(2)], dtype=object))
+
+    np.testing.assert_array_equal(store.get_missing_nodes(), [5])
+    assert store.to_dict() == {1: Decimal(1), 2: Decimal(1), 3: Decimal(2), 4: Decimal(2), 5: None}
+
+
+def test_property_store_vector_valued():
+    store = PropertyStore.empty(n_nodes=2, vector_valued=True)
+    store.assign([2, 1], np.array([[1, 2, 3], [4, 5, 6]], dtype=object))
+    assert store.to_dict()[1].tolist() == [4, 5, 6]
+
+
+def test_validate_all_nodes_covered():
+    store = PropertyStore.empty(n_nodes=3, vector_valued=False)
+    store.assign([1, 3], np.array([Decimal(1), Decimal(1)], dtype=object))
+    with pytest.raises(ValueError, match=r'porosity missing values for nodes: \[2\]'):
+        _validate_all_nodes_covered({'porosity': store})
+
+
+@pytest.mark.parametrize('property_kind, expression, valid', (
+    ('porosity', '0.84 * exp(-0.001 * depth)', True),
+    ('porosity', '0.5 + 0 * x', False),
+    ('grain_density', '2700 + z', False),
+    ('grain_density', '2700 * (1 - porosity)', False),
+))
+def test_validate_overburden_column_models(property_kind, expression, valid):
+    model_config_by_property_kind = FAST_MODEL_CONFIG_BY_PROPERTY_KIND | {
+        property_kind: ModelConfig('expression', {'expression': expression}),
+    }
+    config = RockPropertiesConfig.from_dict({
+        'zone_assignment_order': [1],
+        **{
+            f'{kind}_configs': [{
+                'property_model': {'kind': model_config.kind, 'params': model_config.params},
+                'zones': [1],
+            }]
+            for kind, model_config in model_config_by_property_kind.items()
+        },
+    })
+    if valid:
+        _validate_overburden_column_models(config)
+    else:
+        with pytest.raises(ValueError, match=f'{property_kind} model in zone 1 depends on'):
+            _validate_overburden_column_models(config)
+
+
+@pytest.mark.parametrize('depth_evaluation, tolerance', (('unique', 0), ('table', 1e-6)))
+def test_zone_depth_evaluation_matches_nodes(depth_evaluation, tolerance):
+    depths = np.random.default_rng(0).uniform(0, 1500, 5000).round(1)  # fewer distinct depths than nodes
+    coordinates = [(0., 0., -depth) for depth in depths]
+
+    expected = _compute_rock_properties_for_zone_vectorized(FAST_MODEL_CONFIG_BY_PROPERTY_KIND, depths, coordinates)
+    actual = _compute_rock_properties_for_zone_vectorized(
+        FAST_MODEL_CONFIG_BY_PROPERTY_KIND,
+        depths,
+        coordinates,
+        depth_evaluation=depth_evaluation,
+        depth_table_tolerance=tolerance,
+    )
+    for property_kind, values in expected.items():
+        np.testing.assert_allclose(actual[property_kind], values, rtol=tolerance, atol=0)
+
+
+def test_zone_depth_evaluation_uses_nodes_for_coordinate_models():
+    model_config_by_property_kind = FAST_MODEL_CONFIG_BY_PROPERTY_KIND | {
+        'specific_heat': ModelConfig('expression', {'expression': '800 + x'}),
+    }
+    depths = np.zeros(3)
+    coordinates = [(0., 0., 0.), (1., 0., 0.), (2., 0., 0.)]
+    for depth_evaluation in ('nodes', 'unique'):
+        values = _compute_rock_properties_for_zone_vectorized(
+            model_config_by_property_kind,
+            depths,
+            coordinates,
+            depth_evaluation=depth_evaluation,
+        )
+        assert values['specific_heat'].tolist() == [800., 801., 802.]